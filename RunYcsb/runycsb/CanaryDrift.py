@@ -0,0 +1,123 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to detect
+host drift from the baseline canary cells that the fabfile runs at
+regular intervals, and to normalise other cells' throughput against
+the canary baseline.
+'''
+
+class CanaryDrift(object):
+    '''
+    Canaries are the same cell run repeatedly, so any change in their
+    throughput over the series is attributed to the host.  The baseline
+    at a given sequence position is interpolated linearly between the
+    canaries that ran before and after it.
+    '''
+    __slots__ = ('canaries',)
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self):
+        # Phase name -> list of (sequence, throughput) sorted by sequence.
+        self.canaries = {'load': [], 'run': []}
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, element):
+        '''Record the results of a collated canary element.'''
+        sequence = int(element.cellMeta['sequence'])
+        for phase, ycsb in (('load', element.ycsbLoad), ('run', element.ycsbRun)):
+            if ycsb:
+                self.canaries[phase].append((sequence, ycsb.throughput))
+                self.canaries[phase].sort()
+
+    # --------------------------------------------------------
+    # hasCanaries
+    # --------------------------------------------------------
+    def hasCanaries(self, phase):
+        return len(self.canaries[phase]) > 0
+
+    # --------------------------------------------------------
+    # getDrift
+    # --------------------------------------------------------
+    def getDrift(self, phase):
+        '''
+        Return (mean, relative range, relative trend) of the phase's
+        canary throughput, where the range is (max - min) / mean and the
+        trend is (last - first) / first.  None is returned when there
+        are no canaries.
+        '''
+        throughputs = [tp for seq, tp in self.canaries[phase]]
+        if not throughputs:
+            return None
+        avg = float(sum(throughputs)) / len(throughputs)
+        if avg == 0 or throughputs[0] == 0:
+            return avg, 0.0, 0.0
+        return avg, (max(throughputs) - min(throughputs)) / avg, \
+               float(throughputs[-1] - throughputs[0]) / throughputs[0]
+
+    # --------------------------------------------------------
+    # baselineAt
+    # --------------------------------------------------------
+    def baselineAt(self, phase, sequence):
+        '''
+        Interpolate the canary throughput at a sequence position.
+        Positions outside the canaries take the nearest canary's value.
+        '''
+        points = self.canaries[phase]
+        if sequence <= points[0][0]:
+            return float(points[0][1])
+        for i in range(1, len(points)):
+            s2, t2 = points[i]
+            if sequence <= s2:
+                s1, t1 = points[i-1]
+                return t1 + (t2 - t1) * float(sequence - s1) / (s2 - s1)
+        return float(points[-1][1])
+
+    # --------------------------------------------------------
+    # normalize
+    # --------------------------------------------------------
+    def normalize(self, phase, throughputs, sequences):
+        '''
+        Scale each throughput by the mean canary throughput divided by
+        the canary baseline at its sequence position, so normalised
+        values remain in ops/sec.  Throughputs without a known position
+        (from series run before sequences were recorded) are returned
+        unchanged.
+        '''
+        reference = self.getDrift(phase)[0]
+        normalized = []
+        for throughput, sequence in zip(throughputs, sequences):
+            baseline = self.baselineAt(phase, sequence) if sequence >= 0 else 0
+            if baseline > 0:
+                normalized.append(int(throughput * reference / baseline))
+            else:
+                normalized.append(throughput)
+        return normalized
+
+    # --------------------------------------------------------
+    # getReport
+    # --------------------------------------------------------
+    def getReport(self, threshold):
+        '''
+        Return the lines of the drift report, flagging phases whose
+        canary range exceeds the threshold.
+        '''
+        lines = ['------ canary drift']
+        for phase in ('load', 'run'):
+            drift = self.getDrift(phase)
+            if not drift:
+                continue
+            avg, spread, trend = drift
+            lines.append(phase.capitalize() + " canaries (seq:ops/s): " +
+                         ", ".join(str(seq) + ":" + str(tp) for seq, tp in self.canaries[phase]))
+            line = phase.capitalize() + " canary average: " + str(int(avg)) + ", range: %.1f%%, trend: %+.1f%%" % \
+                   (spread * 100, trend * 100)
+            if spread > threshold:
+                line += "  ** DRIFT exceeds %.1f%%" % (threshold * 100)
+            lines.append(line)
+        lines.append("")
+        return lines
@@ -172,7 +172,7 @@ class CollateElement:
                         self.ycsbLoad = collateYcsb
                     else:
                         self.ycsbRun = collateYcsb
-                    self.LOG.debug(vars(collateYcsb))
+                    self.LOG.debug(collateYcsb)
                     collateYcsb = None
 
     # --------------------------------------------------------
@@ -6,14 +6,20 @@ as a container for the results of mongod and YCSB executions.
 
 @author: rich
 '''
-import logging
+import os, json, logging
+from collections import OrderedDict
 from CollateYcsb import CollateYcsb
 
-class CollateElement:
+class CollateElement(object):
     '''
     This class recognizes the mongod syncDelay option introduced in 2.8.0 rc5.
     Use CollateElement-280rc4.py for previous 2.8.0 release candidates. 
     '''
+    # Elements are created for every log file, so they don't carry
+    # a per-instance dictionary.
+    __slots__ = ('mongoLogFileName', 'storageEngine', 'isJournaling', 'syncdelay', 
+                 'ycsbLogFileName', 'ycsbLoad', 'ycsbRun', 'targetRuns', 'cellMeta', 'manifest')
+    
     # --------------------------------------------------------
     # Constants
     # --------------------------------------------------------
@@ -26,6 +32,40 @@ class CollateElement:
     SEARCH_RUNTIME = "[OVERALL], RunTime(ms), "
     SEARCH_OPS = "[OVERALL], Operations, "
     SEARCH_THROUGHPUT = "[OVERALL], Throughput(ops/sec), "
+    SEARCH_TYPE_OPS = "], Operations, "
+    SEARCH_AVG_LATENCY = "], AverageLatency(us), "
+    SEARCH_STATUS = " sec: "
+    
+    # Cell metadata lines written by the fabfile ahead of the ycsb 
+    # output.  Each line looks like "RunYcsb meta: <name>=<value>".
+    SEARCH_META = "RunYcsb meta: "
+    
+    # Metadata name of the ycsb -target rate of the run phase that
+    # follows, written ahead of each step of a target rate ladder.
+    TARGET_META = "target"
+    
+    # Metadata name prefix of named matrix axis values.
+    AXIS_META_PREFIX = "axis."
+    
+    # Metadata name prefix of the properties a generated workload sets.
+    WORKLOAD_META_PREFIX = "workload."
+    
+    # When a phase runs several ycsb clients, client n > 1 logs to
+    # the cell's ycsb log name with ".client<n>" ahead of ".log".
+    CLIENT_LOG_INFIX = ".client"
+    
+    # The fabfile writes a JSON manifest of each cell's parameters to
+    # the cell's mongod log name with a manifest- prefix and a .json 
+    # extension.  The version is bumped when fields change meaning.
+    MANIFEST_PREFIX = "manifest-"
+    MANIFEST_EXTENSION = ".json"
+    MANIFEST_VERSION = 1
+    
+    # When a profiler is attached to mongod for the run phase, its
+    # output is written to the cell's mongod log name with a profile-
+    # prefix and the profiler's extension in place of ".log".
+    PROFILE_PREFIX = "profile-"
+    PROFILE_EXTENSIONS = {'perf': ".perf.data", 'pidstat': ".pidstat.log", 'command': ".prof"}
                 
     # --------------------------------------------------------
     # Class Variables
@@ -35,9 +75,6 @@ class CollateElement:
     LOG.setLevel(logging.INFO)
     LOG.addHandler(logging.StreamHandler())
     
-    # Input parm
-    mongoLogFileName = None
-    
     # --------------------------------------------------------
     # Constructor
     # --------------------------------------------------------
@@ -57,8 +94,71 @@ class CollateElement:
         self.syncdelay = None
     
         # YCSB results gleaned from ycsb log file.
+        self.ycsbLogFileName = None
         self.ycsbLoad = None
         self.ycsbRun = None
+        
+        # The (target rate, run results) of the steps of a target rate
+        # ladder in the order they ran.
+        self.targetRuns = []
+        
+        # Cell metadata gleaned from ycsb log file in the order written.
+        self.cellMeta = OrderedDict()
+        
+        # Cell parameters read from the cell's manifest, if it has one.
+        self.manifest = None
+
+    # --------------------------------------------------------
+    # readManifest
+    # --------------------------------------------------------
+    def readManifest(self):
+        '''
+        Read the mongod options and ycsb parameters from the manifest
+        the fabfile wrote for this element's cell, which spares parsing
+        them out of the logs.  False is returned when there is no 
+        manifest, as for series run before manifests were written.
+        '''
+        manifestFileName = self._getManifestFileName()
+        if not os.path.isfile(manifestFileName):
+            return False
+        with open(manifestFileName, 'r') as f:
+            self.manifest = json.load(f, object_pairs_hook=OrderedDict)
+        if self.manifest.get('version', 0) > self.MANIFEST_VERSION:
+            msg = "Unsupported manifest version " + str(self.manifest['version']) + " in " + manifestFileName + "."
+            raise Exception(msg)
+        
+        # Journaling and syncdelay are only distinguished for wiredTiger,
+        # as when they are read from the mongod options record.
+        self.storageEngine = self.manifest['storage_engine']
+        if self.storageEngine == self.STORAGE_ENGINE_WIREDTIGER:
+            self.isJournaling = self.manifest['journal']
+            self.syncdelay = self.manifest['syncdelay']
+        return True
+
+    # --------------------------------------------------------
+    # checkManifest
+    # --------------------------------------------------------
+    def checkManifest(self):
+        '''
+        Warn when the mongod options read from this element's manifest
+        disagree with the options record of its mongod log.  The
+        manifest's values are kept either way, and a mongod log that 
+        can't be parsed only warns.
+        '''
+        manifestOptions = (self.storageEngine, self.isJournaling, self.syncdelay)
+        self.storageEngine, self.isJournaling, self.syncdelay = None, True, None
+        try:
+            self.readMongoOptions()
+            logOptions = (self.storageEngine, self.isJournaling, self.syncdelay)
+        except Exception as e:
+            logOptions = None
+            self.LOG.warning("Cannot check the manifest of " + self.mongoLogFileName + ": " + str(e))
+        if logOptions and logOptions[0] is None:
+            self.LOG.warning("Cannot check the manifest of " + self.mongoLogFileName + ": no options record.")
+        elif logOptions and logOptions != manifestOptions:
+            self.LOG.warning("The manifest of " + self.mongoLogFileName + " has mongod options (engine, journal, " +
+                             "syncdelay) " + str(manifestOptions) + " but the mongod log has " + str(logOptions) + ".")
+        self.storageEngine, self.isJournaling, self.syncdelay = manifestOptions
 
     # --------------------------------------------------------
     # readMongoOptions
@@ -135,48 +235,151 @@ class CollateElement:
     def readYcsbOptions(self):
         '''
         Read the YCSB execution options from the ycsb log file
-        that corresponds to the mongo log file set in this object. 
+        that corresponds to the mongo log file set in this object,
+        and from the logs of its other clients when the cell's phases
+        ran several ycsb clients.
         '''
         
         # Get the ycsb log file for this mongod execution.
         ycsbLogFileName = self._getYcsbLogFileName()
+        self.ycsbLogFileName = ycsbLogFileName
+        self.ycsbLoad, self.ycsbRun, self.targetRuns = self._readYcsbLog(ycsbLogFileName)
+        
+        # Fold in the results of any additional clients.  A phase only
+        # counts as complete when every one of its clients completed.
+        # Target rate steps are matched up by step number and rate, since
+        # every client log records every step whether it completed or not.
+        clients = int(self.cellMeta.get('clients', 1))
+        targetSteps = self.targetRuns
+        for client in range(2, clients + 1):
+            clientLogFileName = ycsbLogFileName[:-len('.log')] + self.CLIENT_LOG_INFIX + str(client) + '.log'
+            clientLoad, clientRun, clientTargetSteps = self._readYcsbLog(clientLogFileName)
+            self.ycsbLoad = self._mergeClient(self.ycsbLoad, clientLoad, clientLogFileName)
+            self.ycsbRun = self._mergeClient(self.ycsbRun, clientRun, clientLogFileName)
+            for step, ycsb in targetSteps.items():
+                if ycsb:
+                    targetSteps[step] = self._mergeClient(ycsb, clientTargetSteps.get(step), clientLogFileName)
+        self.targetRuns = [(target, ycsb) for (number, target), ycsb in targetSteps.items() if ycsb]
+
+    # --------------------------------------------------------
+    # _readYcsbLog
+    # --------------------------------------------------------
+    def _readYcsbLog(self, ycsbLogFileName):
+        '''
+        Read one ycsb log file and return its (load, run, target steps)
+        results as readYcsbLines does.
+        '''
         self.LOG.debug("Reading " + ycsbLogFileName)
+        with open(ycsbLogFileName, 'r') as f:
+            return self.readYcsbLines(f, ycsbLogFileName)
+
+    # --------------------------------------------------------
+    # readYcsbLines
+    # --------------------------------------------------------
+    def readYcsbLines(self, lines, ycsbLogFileName):
+        '''
+        Read the lines of a ycsb log file and return its (load, run, 
+        target steps) results.  Load and run are None when the phase 
+        didn't complete, and target steps is an OrderedDict that maps
+        the (step number, target rate) of each target rate step started
+        to its run results, or to None when it didn't complete.  Step
+        numbers count target metadata lines from 1.  Cell metadata
+        lines are recorded in this element.
+        '''
+        ycsbLoad = None
+        ycsbRun = None
         
-        # We are only concerned with 4 types of log file lines.
+        # We are mainly concerned with 4 types of log file lines.
         # We iterate through the log file looking for these 4
         # line types, one set for load and one set for run.
         # We only record the ycsb results if we find the last
         # line, which contains the throughput information.
         #
+        # The per operation type counts and latencies that ycsb
+        # prints after the throughput line are added to the most
+        # recently recorded results.  Status lines written while
+        # a phase runs are recorded as throughput samples.
+        #
         # Note that only the last instance of the load or run
         # results are recorded.  This behavior allows for 
         # manual restarts to log to an existing file since the
         # latest load or run results will always be appended to 
         # the end of the file.
-        with open(ycsbLogFileName, 'r') as f:
-            collateYcsb = None
-            for line in f:
-                if line.find(self.SEARCH_CMDLINE) > -1:
-                    collateYcsb = CollateYcsb(ycsbLogFileName)
-                    collateYcsb.parseCmdLine(line)
-                elif line.find(self.SEARCH_RUNTIME) > -1:
-                    collateYcsb.parseRuntime(line)
-                elif line.find(self.SEARCH_OPS) > -1:
-                    collateYcsb.parseOps(line)
-                elif line.find(self.SEARCH_THROUGHPUT) > -1:
-                    collateYcsb.parseThroughput(line)
-                    
-                    # Save the completed result information
-                    # in the appropriate instance field.
-                    if collateYcsb.load:
-                        self.ycsbLoad = collateYcsb
-                    else:
-                        self.ycsbRun = collateYcsb
-                    self.LOG.debug(vars(collateYcsb))
-                    collateYcsb = None
+        #
+        # Run phases that follow a target metadata line are steps of a
+        # target rate ladder, which are kept apart from the cell's
+        # unthrottled run phase.
+        targetSteps = OrderedDict()
+        target = None
+        collateYcsb = None
+        collateTarget = None
+        lastYcsb = None
+        for line in lines:
+            if line.startswith(self.SEARCH_META):
+                name, value = line[len(self.SEARCH_META):].rstrip('\r\n').split('=', 1)
+                if name == self.TARGET_META:
+                    target = (len(targetSteps) + 1, float(value))
+                    targetSteps[target] = None
+                else:
+                    self.cellMeta[name] = value
+            elif line.find(self.SEARCH_CMDLINE) > -1:
+                collateYcsb = CollateYcsb(ycsbLogFileName)
+                collateYcsb.parseCmdLine(line)
+                if collateYcsb.load:
+                    target = None
+                collateTarget = target
+                lastYcsb = None
+            elif collateYcsb and line.find(self.SEARCH_STATUS) > -1:
+                collateYcsb.parseStatus(line)
+            elif line.find(self.SEARCH_RUNTIME) > -1:
+                collateYcsb.parseRuntime(line)
+            elif line.find(self.SEARCH_OPS) > -1:
+                collateYcsb.parseOps(line)
+            elif line.find(self.SEARCH_THROUGHPUT) > -1:
+                collateYcsb.parseThroughput(line)
+                
+                # Save the completed result information
+                # as the appropriate phase.
+                if collateYcsb.load:
+                    ycsbLoad = collateYcsb
+                elif collateTarget is not None:
+                    targetSteps[collateTarget] = collateYcsb
+                else:
+                    ycsbRun = collateYcsb
+                self.LOG.debug(collateYcsb)
+                lastYcsb = collateYcsb
+                collateYcsb = None
+            elif lastYcsb and line.find(self.SEARCH_TYPE_OPS) > -1:
+                lastYcsb.parseTypeOps(line)
+            elif lastYcsb and line.find(self.SEARCH_AVG_LATENCY) > -1:
+                lastYcsb.parseLatency(line)
+            elif lastYcsb and line.startswith('['):
+                lastYcsb.parseHistogram(line)
+        return ycsbLoad, ycsbRun, targetSteps
 
     # --------------------------------------------------------
-    # _getYcsbLogFileName
+    # _mergeClient
+    # --------------------------------------------------------
+    def _mergeClient(self, ycsb, clientYcsb, clientLogFileName):
+        '''
+        Merge a client's phase results into the results of the 
+        previous clients, returning None if either is missing.
+        '''
+        if ycsb and not clientYcsb:
+            self.LOG.warning("Incomplete " + ("load" if ycsb.load else "run") + " phase in " + clientLogFileName + ".")
+        if not (ycsb and clientYcsb):
+            return None
+        ycsb.merge(clientYcsb)
+        return ycsb
+
+    # --------------------------------------------------------
+    # __repr__
+    # --------------------------------------------------------
+    def __repr__(self):
+        return repr(dict((name, getattr(self, name)) for name in self.__slots__))
+
+    # --------------------------------------------------------
+    # getKey
     # --------------------------------------------------------
     def getKey(self):
         '''
@@ -187,21 +390,105 @@ class CollateElement:
         
         # The key will determine sort order in the final output,
         # so the order in which values are composed is significant.
+        # Cells with a manifest take their ycsb parameters from it.
+        if self.manifest:
+            properties = self.manifest['ycsb_properties']
+            workload = self.manifest['workload']
+            recordCount = properties['recordcount']
+            opCount = properties['operationcount']
+            threadCount = properties['threadcount']
+        else:
+            workload = self.cellMeta.get('workload', self.ycsbLoad.workloadFile)
+            recordCount = self.ycsbLoad.recordCount
+            opCount = self.ycsbLoad.opCount
+            threadCount = self.ycsbLoad.threadCount
         key = self.storageEngine
-        key += "|" + self.ycsbLoad.workloadFile
+        key += "|" + workload
+        
+        # Generated workloads are told apart by the properties they set
+        # rather than by the name of their per-cell workload file.
+        for name, value in self.cellMeta.items():
+            if name.startswith(self.WORKLOAD_META_PREFIX):
+                key += "|" + name[len(self.WORKLOAD_META_PREFIX):] + "=" + value
         if not self.isJournaling:
             key += "|nojournal"
-        if self.storageEngine is self.STORAGE_ENGINE_WIREDTIGER:
+        if self.storageEngine == self.STORAGE_ENGINE_WIREDTIGER:
             if self.syncdelay:
                 key += "|sync=" + self.syncdelay
                 
         # We use the load count parameters which are always the
         # same as the run count parameters.
-        key += "|recs=" + str(self.ycsbLoad.recordCount)
-        key += "|ops=" + str(self.ycsbLoad.opCount)
+        key += "|recs=" + str(recordCount)
+        key += "|ops=" + str(opCount)
+        key += "|threads=" + str(threadCount)
+        
+        # Cells driven by a load generator other than ycsb are kept
+        # apart from ycsb cells.
+        if self.cellMeta.get('load_generator'):
+            key += "|loadgen=" + self.cellMeta['load_generator']
+            
+        # Cells whose phases were fanned out over several ycsb
+        # clients are kept apart from single client cells.
+        if int(self.cellMeta.get('clients', 1)) > 1:
+            key += "|clients=" + self.cellMeta['clients']
+        
+        # Cells run under a named cpu/numa placement are kept apart
+        # from each other and from unconstrained cells.  Cells pinned
+        # by top level settings, which have no name, are told apart
+        # by their mongo and ycsb command prefixes.
+        if self.cellMeta.get('placement'):
+            key += "|placement=" + self.cellMeta['placement']
+        elif self.cellMeta.get('mongo_placement') or self.cellMeta.get('ycsb_placement'):
+            prefixes = [program + ":" + '_'.join(self.cellMeta[program + '_placement'].split())
+                        for program in ('mongo', 'ycsb') if self.cellMeta.get(program + '_placement')]
+            key += "|placement=" + ";".join(prefixes)
+
+        # Cells run against a named topology are kept apart from each
+        # other and from cells run against a plain standalone mongod.
+        if self.cellMeta.get('topology'):
+            key += "|topology=" + self.cellMeta['topology']
+
+        # Cells run with a cache mode other than none are kept apart
+        # from each other and from untreated cells.
+        if self.cellMeta.get('cache_mode'):
+            key += "|cachemode=" + self.cellMeta['cache_mode']
+            
+        # Soak cells run for a wall time rather than an operation count.
+        if self.cellMeta.get('soak_secs'):
+            key += "|soak=" + self.cellMeta['soak_secs'] + "s"
+            
+        # Named axis values follow in matrix order.
+        for name, value in self.cellMeta.items():
+            if name.startswith(self.AXIS_META_PREFIX):
+                key += "|" + name[len(self.AXIS_META_PREFIX):] + "=" + value
                 
         return key                
         
+    # --------------------------------------------------------
+    # _getManifestFileName
+    # --------------------------------------------------------
+    def _getManifestFileName(self):
+        '''
+        Get the manifest file name that corresponds to this
+        instance's mongod log file name.
+        '''
+        directory, name = os.path.split(self.mongoLogFileName)
+        name = name.replace("mongod-", self.MANIFEST_PREFIX, 1)[:-len('.log')] + self.MANIFEST_EXTENSION
+        return os.path.join(directory, name)
+        
+    # --------------------------------------------------------
+    # getProfileFileNames
+    # --------------------------------------------------------
+    def getProfileFileNames(self):
+        '''
+        Get the names of the profiler output files of this instance's
+        cell that exist, sorted, which is empty when no profiler ran.
+        '''
+        directory, name = os.path.split(self.mongoLogFileName)
+        name = name.replace("mongod-", self.PROFILE_PREFIX, 1)[:-len('.log')]
+        fileNames = [os.path.join(directory, name + extension) for extension in self.PROFILE_EXTENSIONS.values()]
+        return sorted(f for f in fileNames if os.path.isfile(f))
+        
     # --------------------------------------------------------
     # _getYcsbLogFileName
     # --------------------------------------------------------
@@ -8,10 +8,23 @@ collate the result of a batch execution.
 '''
 
 import os, logging, glob
+from datetime import datetime
 
+from CanaryDrift import CanaryDrift
 from CollateElement import CollateElement
+from HostEfficiency import HostEfficiency
+from HostInventory import HostInventory
+from LatencyCurve import LatencyCurve
+from OutlierFilter import OutlierFilter
+from PhaseTimer import PhaseTimer
+from ResultAggregate import ResultAggregate
+from ResultIndex import ResultIndex
+from ResultRepository import ResultRepository
+from ScalingModel import ScalingModel
+from ScalingReport import ScalingReport
 from SeriesEnv import SeriesEnv
-from mystats import stddev
+from SoakAnalysis import SoakAnalysis
+from StorageFootprint import StorageFootprint
 
 class CollateResults:
     '''
@@ -25,6 +38,10 @@ class CollateResults:
     YCSB_LOG_PREFIX  = "ycsb-"
     CSV_FILENAME = "RunYcsb.csv"
     
+    # Reported in place of the log name of a flagged run whose log
+    # can't be looked up, as for series run before sequence numbers.
+    UNKNOWN_LOG_NAME = "unknown log"
+    
     # --------------------------------------------------------
     # Class Variables
     # --------------------------------------------------------
@@ -44,8 +61,45 @@ class CollateResults:
         else: 
             self.seriesEnv = SeriesEnv()
             
-        # Initialize the result dictionary.
+        # Initialize the result dictionary, which maps each key to
+        # the ResultAggregate of all elements with that key.
         self.resultDict = {}
+        
+        # The (mongod log file, reason) of cells that were aborted while running.
+        self.failedList = []
+        
+        # Baseline canary results used to detect host drift.
+        self.canaryDrift = CanaryDrift()
+        
+        # Storage footprint and write amplification per key.
+        self.storageFootprint = StorageFootprint()
+        
+        # Throughput degradation of soak cells per key.
+        self.soakAnalysis = SoakAnalysis(self.seriesEnv.seriesConfig['soak_drop_percent'])
+        
+        # Latency versus offered load of target rate ladders per key.
+        self.latencyCurve = LatencyCurve(self.seriesEnv.seriesConfig['sla_percentile'],
+                                         self.seriesEnv.seriesConfig['sla_latency_us'])
+        
+        # The hardware of the series' hosts, when the fabfile captured it,
+        # and throughput per core and per GB of memory per key.
+        self.hostInventory = None
+        inventoryFile = os.path.join(self.seriesEnv.logpath, HostInventory.INVENTORY_FILENAME)
+        if os.path.isfile(inventoryFile):
+            self.hostInventory = HostInventory.read(inventoryFile)
+        self.hostEfficiency = HostEfficiency(self.hostInventory)
+        
+        # Run throughput against record count per engine/parms/workload.
+        self.scalingModel = ScalingModel(self.seriesEnv.seriesConfig['scaling_predict_recordcounts'])
+        
+        # Flags runs whose throughput is an outlier for their key.
+        self.outlierFilter = OutlierFilter(self.seriesEnv.seriesConfig['outlier_method'],
+                                           self.seriesEnv.seriesConfig['outlier_threshold'])
+        
+        # Optionally collect scaling curves.
+        self.scalingReport = None
+        if self.seriesEnv.seriesConfig['scaling_report']:
+            self.scalingReport = ScalingReport()
             
         # Collate the mongod and ycsb log file information.
         self.collate()
@@ -64,27 +118,80 @@ class CollateResults:
         mongoLogPaths = glob.glob(mongoLogFilter)
         mongoLogPaths.sort() 
         
-        # Main read loop.
+        # Optionally add the series' runs to the result index and the
+        # shared result repository too, as a list of (store, series id).
+        stores = []
+        config = self.seriesEnv.seriesConfig
+        seriesName = config['series_name']
+        collated = datetime.now().isoformat()
+        if config['result_index']:
+            resultIndex = ResultIndex(os.path.join(self.seriesEnv.logpath, config['result_index']))
+            stores.append((resultIndex, resultIndex.beginSeries(seriesName, os.path.abspath(self.seriesEnv.logpath), 
+                                                                collated)))
+        try:
+            if config['result_repository']:
+                repository = ResultRepository(os.path.join(self.seriesEnv.logpath, config['result_repository']))
+                stores.append((repository, repository.beginSeries(seriesName, os.path.abspath(self.seriesEnv.logpath), 
+                                                                  collated)))
+            self._collateLogs(mongoLogPaths, stores)
+            for store, seriesId in stores:
+                store.commit()
+        finally:
+            for store, seriesId in stores:
+                store.close()
+                
+    # --------------------------------------------------------
+    # _collateLogs
+    # --------------------------------------------------------
+    def _collateLogs(self, mongoLogPaths, stores):
+        # Main read loop.  Each element is folded into the aggregate
+        # for its key and then dropped.
         print("Number of mongo log files found: " + str(len(mongoLogPaths)))
         for mongoLog in mongoLogPaths:
             
-            # Get the mongod settings.
+            # Get the mongod settings from the cell's manifest, or from
+            # the mongod log when the cell predates manifests.
             element = CollateElement(mongoLog)
-            element.readMongoOptions()
+            if not element.readManifest():
+                element.readMongoOptions()
+            elif self.seriesEnv.seriesConfig['manifest_check']:
+                element.checkManifest()
                 
             # Get the ycsb settings.
             element.readYcsbOptions()
             
             # Tracing.
-            self.LOG.debug(vars(element))
+            self.LOG.debug(element)
+            
+            # Cells aborted by the orchestrator have incomplete results
+            # and are only listed at the end of the report.
+            if element.cellMeta.get('failed'):
+                self.failedList.append((mongoLog, element.cellMeta['failed']))
+                continue
+            
+            # Canary cells repeat a baseline cell throughout the series
+            # and are kept apart from the results they are compared to.
+            if element.cellMeta.get('canary'):
+                self.canaryDrift.add(element)
+                continue
             
             # Add the collation results to the result dictionary.
-            dictList = self.resultDict.get(element.getKey())
-            if dictList:
-                dictList.append(element)
-            else:
-                dictList = [element]
-                self.resultDict[element.getKey()] = dictList
+            key = element.getKey()
+            aggregate = self.resultDict.get(key)
+            if not aggregate:
+                aggregate = ResultAggregate(key)
+                self.resultDict[key] = aggregate
+            aggregate.add(element)
+            self.storageFootprint.add(key, element)
+            self.soakAnalysis.add(key, element)
+            self.latencyCurve.add(key, element)
+            self.scalingModel.add(key, element)
+            self.hostEfficiency.add(key, element)
+            hostsHardware = self.hostEfficiency.getHostsHardware(element)
+            for store, seriesId in stores:
+                store.add(seriesId, key, element, hostsHardware)
+            if self.scalingReport:
+                self.scalingReport.addElement(key, element)
         
     # --------------------------------------------------------
     # report
@@ -95,86 +202,317 @@ class CollateResults:
         keyList.sort()
         self.LOG.debug("Number of result elements: " + str(len(keyList)))
         
-        # Initialize CSV variables
-        csvList = []
+        # Initialize CSV variables.  Records are written as each key
+        # is reported rather than accumulated.
+        csvFile = None
         csvDelimiter = self.seriesEnv.seriesConfig['csv_delimiter']
+        if self.seriesEnv.seriesConfig['csv_file']:
+            csvFile = open(os.path.join(self.seriesEnv.logpath, self.CSV_FILENAME), 'w')
         
-        # Write results for each key.
-        for key in keyList:
-            # Initialize loop vars.
-            firstTime = True
-            loadAvg = 0
-            runAvg  = 0
-            loadList = []
-            runList  = []
-            loadStdev = 0
-            runStdev  = 0
-            loadCnt = 0
-            runCnt  = 0
-            loadString = "Load (ops/s): "
-            runString  = "Run  (ops/s): "
-            
-            # Create load and run throughput lists.
-            elements = self.resultDict[key]
-            for element in elements:
-                if element.ycsbLoad:
-                    loadList.append(element.ycsbLoad.throughput)
-                    loadAvg += element.ycsbLoad.throughput
-                    loadCnt += 1
-                    if firstTime:
-                        loadString += str(element.ycsbLoad.throughput)
-                    else:
-                        loadString += ", " + str(element.ycsbLoad.throughput)
-                if element.ycsbRun:
-                    runList.append(element.ycsbRun.throughput)
-                    runAvg += element.ycsbRun.throughput
-                    runCnt += 1
-                    if firstTime:
-                        runString += str(element.ycsbRun.throughput)
-                    else:
-                        runString += ", " + str(element.ycsbRun.throughput)
-                firstTime = False    
+        # Report canary drift ahead of the results it affects.
+        config = self.seriesEnv.seriesConfig
+        if config['report'] and (self.canaryDrift.hasCanaries('load') or self.canaryDrift.hasCanaries('run')):
+            print('\n'.join(self.canaryDrift.getReport(config['canary_drift_threshold'])))
+        
+        # Describe the hosts, warning when keys ran on different hardware
+        # so that their raw throughputs aren't compared.
+        seriesHardware = self.hostEfficiency.getSeriesHardware()
+        if config['report'] and self.hostInventory:
+            print('\n'.join(self.hostInventory.getReport()))
+            if len(seriesHardware) > 1:
+                print("Hardware mismatch: cells ran on " + str(len(seriesHardware)) + 
+                      " different hardware, compare their per core and per GB throughput")
+                for hardware, keys in seriesHardware.items():
+                    print("  " + hardware + ": " + str(len(keys)) + " keys")
+            print('')
+        
+        # Write results for each key.  Log names are only looked up
+        # for the runs that are flagged as outliers.
+        logNames = self._getOutlierLogNames(keyList)
+        try:
+            for key in keyList:
+                aggregate = self.resultDict[key]
+                loadStats, loadOther, loadOutliers = self._getPhaseStats(aggregate, aggregate.loadThroughputs, 
+                                                                         aggregate.loadSequences, logNames)
+                runStats, runOther, runOutliers = self._getPhaseStats(aggregate, aggregate.runThroughputs, 
+                                                                      aggregate.runSequences, logNames)
+                loadAvg, loadCnt, loadStdev = loadStats
+                runAvg, runCnt, runStdev = runStats
+                otherName = 'filtered' if config['outlier_primary'] == 'raw' else 'raw'
+                flagged = [('load', loadOther, loadOutliers), ('run', runOther, runOutliers)]
+                
+                # Optionally normalise throughput against the canary baseline.
+                normalized = []
+                if config['canary_normalize']:
+                    for phase, throughputs, sequences in (
+                            ('load', aggregate.loadThroughputs, aggregate.loadSequences),
+                            ('run', aggregate.runThroughputs, aggregate.runSequences)):
+                        if self.canaryDrift.hasCanaries(phase) and throughputs:
+                            values = self.canaryDrift.normalize(phase, throughputs, sequences)
+                            normalized.append((phase, values, aggregate.getStats(values)))
+                storage = self.storageFootprint.getStats(key)
+                efficiency = self.hostEfficiency.getStats(key)
+                hardware = self.hostEfficiency.getHardware(key)
+                soak = self.soakAnalysis.getStats(key)
+                curve = self.latencyCurve.getCurve(key)
+                maxSustainable = self.latencyCurve.getMaxSustainable(key)
+                slaName = "p" + self._numberLabel(config['sla_percentile'])
+                percentiles = config['latency_percentiles']
+                latencies = []
+                for phase, histograms in (('load', aggregate.loadHistograms), ('run', aggregate.runHistograms)):
+                    for opType, count, values in aggregate.getLatencyStats(histograms, percentiles):
+                        latencies.append((phase, opType, count, values))
+                
+                # Conditionally print the current key's output.
+                if self.seriesEnv.seriesConfig['report']:
+                    print('\n'.join([
+                        '------ ' + key,
+                        "Load (ops/s): " + ", ".join(map(str, aggregate.loadThroughputs)),
+                        "Load average: " + str(loadAvg),
+                        "Load stdev: " + str(loadStdev),
+                        "Run  (ops/s): " + ", ".join(map(str, aggregate.runThroughputs)),
+                        "Run average : " + str(runAvg),
+                        "Run stdev: " + str(runStdev),
+                        ""]))
+                    if self.outlierFilter.isEnabled():
+                        for phase, (otherAvg, otherCnt, otherStdev), outliers in flagged:
+                            print(phase.capitalize() + " " + otherName + " average: " + str(otherAvg) + 
+                                  " (stdev " + str(otherStdev) + ", " + str(otherCnt) + " runs)")
+                            for throughput, logName in outliers:
+                                print(phase.capitalize() + " outlier: " + str(throughput) + " ops/s in " + logName)
+                        print("")
+                    if aggregate.runProfiles:
+                        for profileName, throughput in aggregate.runProfiles:
+                            print("Run profile: " + profileName + " (" + str(throughput) + " ops/s)")
+                        print("")
+                    for phase, values, (normAvg, normCnt, normStdev) in normalized:
+                        print('\n'.join([
+                            phase.capitalize() + " normalized (ops/s): " + ", ".join(map(str, values)),
+                            phase.capitalize() + " normalized average: " + str(normAvg),
+                            phase.capitalize() + " normalized stdev: " + str(normStdev),
+                            ""]))
+                    for phase, opType, count, values in latencies:
+                        print(phase.capitalize() + " " + opType + " latency (us): " + 
+                              ", ".join("p" + self._numberLabel(p) + " " + str(v) for p, v in zip(percentiles, values)) + 
+                              " (" + str(count) + " ops)")
+                    if latencies:
+                        print("")
+                    if storage:
+                        for name, metricAvg, metricCnt, metricStdev in storage:
+                            print("Storage " + name + ": " + metricAvg + " (stdev " + metricStdev + ")")
+                        print("")
+                    if efficiency:
+                        for name, metricAvg, metricCnt, metricStdev in efficiency:
+                            print("Efficiency " + name + ": " + str(metricAvg) + " (stdev " + str(metricStdev) + ")")
+                        if len(hardware) > 1:
+                            print("Hardware mismatch: runs of this key ran on " + str(len(hardware)) + 
+                                  " different hardware")
+                        for description, cells in hardware:
+                            print("Hardware: " + description + " (" + str(cells) + " cells)")
+                        print("")
+                    if soak:
+                        for name, metricAvg, metricCnt, metricStdev in soak:
+                            print("Soak " + name + ": " + metricAvg + " (stdev " + metricStdev + ")")
+                        print("")
+                    if curve:
+                        for target, throughput, runs, latency, ops in curve:
+                            print("Target " + self._numberLabel(target) + " ops/s: achieved " + str(throughput) + 
+                                  " ops/s, " + slaName + 
+                                  " " + str(latency) + " us (" + str(runs) + " runs)")
+                        if maxSustainable is not None:
+                            print("Max sustainable throughput (" + slaName + " <= " + 
+                                  self._numberLabel(config['sla_latency_us']) + " us): " + str(maxSustainable) + " ops/s")
+                        print("")
+        
+                # Conditionally write csv file records.  
+                # Note that RFC 4180 specifies DOS-style line end and
+                # two double quotes in a string to signify a double 
+                # quote character.  If strings are double quoted then
+                # internal delimiter characters won't be interpreted as
+                # delimiters.
+                if csvFile:
+                    formattedKey = '"' + key.replace('"', '""') + '"'
+                    csvFile.write(csvDelimiter.join([formattedKey, '"load"', str(loadAvg), 
+                                                     str(loadCnt), str(loadStdev)]) + "\r\n")
+                    csvFile.write(csvDelimiter.join([formattedKey, '"run"', str(runAvg), 
+                                                     str(runCnt), str(runStdev)]) + "\r\n")
+                    if self.outlierFilter.isEnabled():
+                        for phase, (otherAvg, otherCnt, otherStdev), outliers in flagged:
+                            csvFile.write(csvDelimiter.join([formattedKey, '"' + phase + '-' + otherName + '"', 
+                                                             str(otherAvg), str(otherCnt), str(otherStdev)]) + "\r\n")
+                            for throughput, logName in outliers:
+                                csvFile.write(csvDelimiter.join([formattedKey, '"' + phase + '-outlier:' + 
+                                                                 logName.replace('"', '""') + '"', 
+                                                                 str(throughput), "1", ""]) + "\r\n")
+                    for profileName, throughput in aggregate.runProfiles:
+                        csvFile.write(csvDelimiter.join([formattedKey, '"run-profile:' + 
+                                                         profileName.replace('"', '""') + '"', 
+                                                         str(throughput), "1", ""]) + "\r\n")
+                    for phase, values, (normAvg, normCnt, normStdev) in normalized:
+                        csvFile.write(csvDelimiter.join([formattedKey, '"' + phase + '-normalized"', str(normAvg), 
+                                                         str(normCnt), str(normStdev)]) + "\r\n")
+                    for phase, opType, count, values in latencies:
+                        for p, v in zip(percentiles, values):
+                            csvFile.write(csvDelimiter.join([formattedKey, '"' + phase + "-" + opType + "-p" + 
+                                                             self._numberLabel(p) + '"', str(v), str(count), 
+                                                             ""]) + "\r\n")
+                    for name, metricAvg, metricCnt, metricStdev in storage:
+                        csvFile.write(csvDelimiter.join([formattedKey, '"' + name + '"', metricAvg, 
+                                                         str(metricCnt), metricStdev]) + "\r\n")
+                    for name, metricAvg, metricCnt, metricStdev in efficiency:
+                        csvFile.write(csvDelimiter.join([formattedKey, '"' + name + '"', str(metricAvg), 
+                                                         str(metricCnt), str(metricStdev)]) + "\r\n")
+                    for description, cells in hardware:
+                        csvFile.write(csvDelimiter.join([formattedKey, '"hardware:' + description.replace('"', '""') + 
+                                                         '"', str(cells), str(cells), ""]) + "\r\n")
+                    for name, metricAvg, metricCnt, metricStdev in soak:
+                        csvFile.write(csvDelimiter.join([formattedKey, '"soak-' + name + '"', metricAvg, 
+                                                         str(metricCnt), metricStdev]) + "\r\n")
+                    for target, throughput, runs, latency, ops in curve:
+                        targetName = '"target-' + self._numberLabel(target)
+                        csvFile.write(csvDelimiter.join([formattedKey, targetName + '-throughput"', 
+                                                         str(throughput), str(runs), ""]) + "\r\n")
+                        csvFile.write(csvDelimiter.join([formattedKey, targetName + '-' + slaName + '"', 
+                                                         str(latency), str(ops), ""]) + "\r\n")
+                    if maxSustainable is not None:
+                        csvFile.write(csvDelimiter.join([formattedKey, '"max-sustainable"', str(maxSustainable), 
+                                                         str(len(curve)), ""]) + "\r\n")
             
-            # Calculate throughput averages.
-            loadAvg = loadAvg // loadCnt
-            runAvg  = runAvg  // runCnt
+            # Write the scaling model of each group of keys that differ
+            # only in record count.
+            for group in self.scalingModel.getGroups():
+                model = self.scalingModel.getModel(group)
+                if model:
+                    self._reportScalingModel(group, model, csvFile, csvDelimiter)
+        finally:
+            if csvFile:
+                csvFile.close()
+                
+        # List the failed cells so that their absence is noticed.
+        if self.seriesEnv.seriesConfig['report'] and self.failedList:
+            print('------ failed cells')
+            for mongoLog, reason in self.failedList:
+                print(mongoLog + ": " + reason)
+            print('')
+        
+        # Break the series' wall time down by orchestrator phase.
+        timingFile = os.path.join(self.seriesEnv.logpath, PhaseTimer.TIMING_FILENAME)
+        if self.seriesEnv.seriesConfig['report'] and os.path.isfile(timingFile):
+            print('\n'.join(PhaseTimer.read(timingFile).getReport()))
+            print('')
+        
+        # Optionally write the scaling report.
+        if self.scalingReport:
+            self.scalingReport.write(os.path.join(self.seriesEnv.logpath, ScalingReport.HTML_FILENAME))
             
-            # Calculate throughput standard deviations.
-            loadStdev = int(stddev(loadList))
-            runStdev  = int(stddev(runList))
+    # --------------------------------------------------------
+    # _reportScalingModel
+    # --------------------------------------------------------
+    def _reportScalingModel(self, group, model, csvFile, csvDelimiter):
+        '''
+        Print and write the scaling model of a group.  Slopes are the
+        change in run throughput per doubling of the record count.
+        '''
+        coefficients = model['coefficients']
+        slope = int(coefficients[1])
+        values = [('scaling-r2', "%.3f" % model['r2']), ('scaling-slope', str(slope))]
+        if model['rse_pct'] is not None:
+            values.append(('scaling-rse-pct', "%.1f" % model['rse_pct']))
+        if model['knee']:
+            values.append(('scaling-knee-recs', str(model['knee'])))
+            values.append(('scaling-knee-slope', str(int(coefficients[1] + coefficients[2]))))
+        for recs, value, low, high in model['predictions']:
+            values.append(('scaling-predict-' + str(recs), str(int(value))))
+            if low is not None:
+                values.append(('scaling-predict-' + str(recs) + '-low', str(int(low))))
+                values.append(('scaling-predict-' + str(recs) + '-high', str(int(high))))
+        
+        if self.seriesEnv.seriesConfig['report']:
+            fit = "R^2 %.3f" % model['r2']
+            if model['rse_pct'] is not None:
+                fit += ", residual stdev %.1f%%" % model['rse_pct']
+            lines = ['------ scaling model ' + group,
+                     "Record counts: " + ", ".join(map(str, model['sizes'])) + " (" + str(model['runs']) + " runs)",
+                     "Run ops/s per doubling of records: " + str(slope) + " (" + fit + ")"]
+            if model['knee']:
+                knee = "Knee at " + str(model['knee']) + " recs"
+                if model['knee_bytes'] is not None:
+                    knee += " (dbpath " + str(int(model['knee_bytes'])) + " bytes)"
+                lines.append(knee + ": " + str(int(coefficients[1] + coefficients[2])) + 
+                             " run ops/s per doubling beyond it")
+            else:
+                lines.append("Knee: none detected")
+            for recs, value, low, high in model['predictions']:
+                line = "Predicted run at " + str(recs) + " recs: " + str(int(value)) + " ops/s"
+                if low is not None:
+                    line += " (95% interval " + str(int(low)) + " to " + str(int(high)) + ")"
+                lines.append(line)
+            print('\n'.join(lines + [""]))
+        
+        if csvFile:
+            formattedGroup = '"' + group.replace('"', '""') + '"'
+            for name, value in values:
+                csvFile.write(csvDelimiter.join([formattedGroup, '"' + name + '"', value, 
+                                                 str(model['runs']), ""]) + "\r\n")
+                
+    # --------------------------------------------------------
+    # _getPhaseStats
+    # --------------------------------------------------------
+    def _getPhaseStats(self, aggregate, throughputs, sequences, logNames):
+        '''
+        Return the primary (average, count, stdev) of a phase's 
+        throughputs, the other of the raw and outlier-excluded figures
+        and a list of (throughput, ycsb log name) of the flagged runs,
+        whose log names are looked up by sequence number in logNames.
+        '''
+        raw = aggregate.getStats(throughputs)
+        outliers = self.outlierFilter.getOutliers(throughputs)
+        filtered = self.outlierFilter.getStats(throughputs, outliers) if outliers else raw
+        flagged = [(throughputs[i], logNames.get(sequences[i], self.UNKNOWN_LOG_NAME)) for i in outliers]
+        if self.seriesEnv.seriesConfig['outlier_primary'] == 'filtered':
+            return filtered, raw, flagged
+        return raw, filtered, flagged
             
-            # Conditionally print the current element's output.
-            if self.seriesEnv.seriesConfig['report']:
-                output = '------ ' + key + "\n"
-                output += loadString + "\n"
-                output += "Load average: " + str(loadAvg) + "\n"
-                output += "Load stdev: " + str(loadStdev) + "\n"
-                output += runString + "\n"
-                output += "Run average : " + str(runAvg) + "\n"
-                output += "Run stdev: " + str(runStdev) + "\n"
-                print(output)
-    
-            # Conditionally accumulate csv file records.  
-            # Note that RFC 4180 specifies DOS-style line end and
-            # two double quotes in a string to signify a double 
-            # quote character.  If strings are double quoted then
-            # internal delimiter characters won't be interpreted as
-            # delimiters.
-            if self.seriesEnv.seriesConfig['csv_file']:
-                formattedKey = '"' + key.replace('"', '""') + '"'
-                loadRec = formattedKey + csvDelimiter + '"load"' + csvDelimiter + str(loadAvg) + \
-                            csvDelimiter + str(loadCnt) + csvDelimiter + str(loadStdev)
-                runRec = formattedKey + csvDelimiter + '"run"' + csvDelimiter + str(runAvg) + \
-                            csvDelimiter + str(runCnt) + csvDelimiter + str(runStdev)
-                csvList.append(loadRec + "\r\n")
-                csvList.append(runRec + "\r\n")
-         
-        # Optionally write csv file. 
-        if self.seriesEnv.seriesConfig['csv_file']:
-            csvFile = os.path.join(self.seriesEnv.logpath, self.CSV_FILENAME)
-            with open(csvFile, 'w') as f:
-                for rec in csvList:
-                    f.write(rec)
+    # --------------------------------------------------------
+    # _getOutlierLogNames
+    # --------------------------------------------------------
+    def _getOutlierLogNames(self, keyList):
+        '''
+        Return a dictionary of sequence number -> ycsb log name of the
+        runs of the keys that are flagged as outliers, found by reading
+        the sequence metadata lines of the series' ycsb logs, which is
+        only done when some run is flagged.  Runs without a sequence
+        number can't be looked up.
+        '''
+        wanted = set()
+        for key in keyList:
+            aggregate = self.resultDict[key]
+            for throughputs, sequences in ((aggregate.loadThroughputs, aggregate.loadSequences),
+                                           (aggregate.runThroughputs, aggregate.runSequences)):
+                wanted.update(sequences[i] for i in self.outlierFilter.getOutliers(throughputs))
+        wanted.discard(-1)
+        logNames = {}
+        if not wanted:
+            return logNames
+        sequenceMeta = CollateElement.SEARCH_META + "sequence="
+        for ycsbLog in sorted(glob.glob(os.path.join(self.seriesEnv.logpath, self.YCSB_LOG_PREFIX + "*.log"))):
+            logName = os.path.basename(ycsbLog)
+            if CollateElement.CLIENT_LOG_INFIX in logName:
+                continue
+            with open(ycsbLog, 'r') as f:
+                for line in f:
+                    if line.startswith(sequenceMeta) and int(line[len(sequenceMeta):]) in wanted:
+                        logNames[int(line[len(sequenceMeta):])] = logName
+            if len(logNames) == len(wanted):
+                break
+        return logNames
+
+    # --------------------------------------------------------
+    # _numberLabel
+    # --------------------------------------------------------
+    def _numberLabel(self, number):
+        '''Return a percentile or rate as written in labels: 99, 99.9 or 2500.'''
+        return ("%f" % number).rstrip('0').rstrip('.')
             
 # -------------------------------------------------------- 
 # Main
@@ -6,16 +6,37 @@ as a container for the results of individual YCSB executions.
 
 @author: rich
 '''
+import re
+from array import array
+from LatencyHistogram import LatencyHistogram
 
-class CollateYcsb:
+class CollateYcsb(object):
+    
+    # Instances are created for every ycsb phase, so they don't
+    # carry a per-instance dictionary.
+    __slots__ = ('ycsbLogFileName', 'workloadFile', 'recordCount', 'opCount', 'runtimeMs', 
+                 'totalOps', 'throughput', 'threadCount', 'load', 'typeOps', 'typeLatencyUs', 
+                 'typeHistograms', 'sampleSecs', 'sampleThroughputs')
     
     # --------------------------------------------------------
     # Constants
     # --------------------------------------------------------
     SEARCH_RECORD_COUNT = "recordcount="
     SEARCH_OP_COUNT = "operationcount="
+    SEARCH_THREAD_COUNT = "threadcount="
     SEARCH_LOAD = " -load"
     SEARCH_WORKLOAD_FILE = " -P "
+    SEARCH_HISTOGRAM = "], LatencyHistogram(us), "
+    SEARCH_MAX_LATENCY = "], MaxLatency(us), "
+    
+    # The histogram measurement of ycsb prints one line per 1ms bucket
+    # followed by an overflow bucket, such as "[READ], 3, 1022" and 
+    # "[READ], >1000, 0".
+    BUCKET_PATTERN = re.compile(r'^\[([^\]]+)\], (>?)(\d+), (\d+)\s*$')
+    
+    # The status lines ycsb writes every 10 seconds when run with -s,
+    # in the formats YcsbMonitor describes.
+    STATUS_PATTERN = re.compile(r'(\d+) sec: (\d+) operations;(?: ([\d.]+) current ops/sec;)?')
     
     # --------------------------------------------------------
     # Constructor
@@ -33,8 +54,27 @@ class CollateYcsb:
         self.runtimeMs = -1
         self.totalOps = -1
         self.throughput = -1
+        self.threadCount = -1
         self.load = False
         
+        # Per operation type (READ, UPDATE, INSERT, ...) counts and
+        # average latencies in microseconds.
+        self.typeOps = {}
+        self.typeLatencyUs = {}
+        
+        # Per operation type latency distributions, when the log has them.
+        self.typeHistograms = {}
+        
+        # Elapsed seconds and current throughput of each status line.
+        self.sampleSecs = array('l')
+        self.sampleThroughputs = array('d')
+        
+    # --------------------------------------------------------
+    # __repr__
+    # --------------------------------------------------------
+    def __repr__(self):
+        return repr(dict((name, getattr(self, name)) for name in self.__slots__))
+        
     # --------------------------------------------------------
     # parseCmdLine
     # --------------------------------------------------------
@@ -53,6 +93,13 @@ class CollateYcsb:
             self.opCount = self.opCount.split(None, 1)[0] 
             self.opCount = int(float(self.opCount))
             
+        # Find the thread count and split on whitespace.
+        threadCountIndex = line.find(self.SEARCH_THREAD_COUNT)
+        if threadCountIndex > -1:
+            self.threadCount = line[threadCountIndex+len(self.SEARCH_THREAD_COUNT):]
+            self.threadCount = self.threadCount.split(None, 1)[0]
+            self.threadCount = int(float(self.threadCount))
+            
         # Get the last segment of workloadFile pathname.
         workloadIndex = line.find(self.SEARCH_WORKLOAD_FILE)
         if workloadIndex > -1:
@@ -91,3 +138,115 @@ class CollateYcsb:
     def parseThroughput(self, line):
         self.throughput = line.rsplit(None, 1)[1]
         self.throughput = int(float(self.throughput))
+        
+    # --------------------------------------------------------
+    # parseStatus
+    # --------------------------------------------------------
+    def parseStatus(self, line):
+        '''
+        Record the elapsed time and current throughput of a status
+        line.  Lines without a current throughput, such as the one
+        ycsb writes at 0 sec, are ignored.
+        '''
+        match = self.STATUS_PATTERN.search(line)
+        if match and match.group(3):
+            self.sampleSecs.append(int(match.group(1)))
+            self.sampleThroughputs.append(float(match.group(3)))
+        
+    # --------------------------------------------------------
+    # parseTypeOps
+    # --------------------------------------------------------
+    def parseTypeOps(self, line):
+        '''Parse a line like "[READ], Operations, 5000".'''
+        opType = line[line.find('[')+1:line.find(']')]
+        self.typeOps[opType] = int(float(line.rsplit(None, 1)[1]))
+        
+    # --------------------------------------------------------
+    # parseLatency
+    # --------------------------------------------------------
+    def parseLatency(self, line):
+        '''Parse a line like "[READ], AverageLatency(us), 512.3".'''
+        opType = line[line.find('[')+1:line.find(']')]
+        self.typeLatencyUs[opType] = float(line.rsplit(None, 1)[1])
+        
+    # --------------------------------------------------------
+    # parseHistogram
+    # --------------------------------------------------------
+    def parseHistogram(self, line):
+        '''
+        Parse a line of latency distribution output, which is either
+        a LatencyHistogram line written by LoadGenerator or one of the
+        1ms bucket lines of ycsb's histogram measurement.  Bucket counts
+        are recorded at the middle of their bucket, and overflow counts
+        at the operation type's maximum latency.  Other lines are ignored.
+        '''
+        opType = line[line.find('[')+1:line.find(']')]
+        if line.find(self.SEARCH_HISTOGRAM) > -1:
+            self.typeHistograms[opType] = LatencyHistogram.fromString(
+                line[line.find(self.SEARCH_HISTOGRAM)+len(self.SEARCH_HISTOGRAM):])
+            return
+        if line.find(self.SEARCH_MAX_LATENCY) > -1:
+            self.typeHistograms.setdefault(opType, LatencyHistogram()).maxUs = int(float(line.rsplit(None, 1)[1]))
+            return
+        match = self.BUCKET_PATTERN.match(line)
+        if match:
+            histogram = self.typeHistograms.setdefault(opType, LatencyHistogram())
+            overflow, bucketMs, count = match.group(2), int(match.group(3)), int(match.group(4))
+            if overflow:
+                histogram.record(max(histogram.maxUs, bucketMs * 1000), count)
+            else:
+                histogram.record(bucketMs * 1000 + 500, count)
+        
+    # --------------------------------------------------------
+    # getAverageLatency
+    # --------------------------------------------------------
+    def getAverageLatency(self):
+        '''
+        Return the average latency in microseconds over all operation
+        types weighted by their operation counts, or None if the log 
+        contained no latency information.
+        '''
+        totalOps = 0
+        totalUs = 0.0
+        for opType, latency in self.typeLatencyUs.items():
+            ops = self.typeOps.get(opType, 0)
+            totalOps += ops
+            totalUs += ops * latency
+        if totalOps == 0:
+            return None
+        return totalUs / totalOps
+        
+    # --------------------------------------------------------
+    # merge
+    # --------------------------------------------------------
+    def merge(self, other):
+        '''
+        Fold the results of another ycsb client that ran the same
+        phase concurrently into this one.  Counts and throughputs are
+        summed, the runtime is the longest client's and per type 
+        latencies are averaged weighted by operation counts.  Status
+        samples are summed by position over the samples both clients 
+        wrote, since the clients were started together.
+        '''
+        self.runtimeMs = max(self.runtimeMs, other.runtimeMs)
+        self.totalOps += other.totalOps
+        self.throughput += other.throughput
+        self.opCount += other.opCount
+        self.threadCount += other.threadCount
+        for opType, ops in other.typeOps.items():
+            mine = self.typeOps.get(opType, 0)
+            if opType in other.typeLatencyUs:
+                if mine + ops > 0:
+                    self.typeLatencyUs[opType] = (self.typeLatencyUs.get(opType, 0.0) * mine + 
+                                                  other.typeLatencyUs[opType] * ops) / (mine + ops)
+            self.typeOps[opType] = mine + ops
+        count = min(len(self.sampleSecs), len(other.sampleSecs))
+        del self.sampleSecs[count:]
+        del self.sampleThroughputs[count:]
+        for i in range(count):
+            self.sampleThroughputs[i] += other.sampleThroughputs[i]
+        for opType, histogram in other.typeHistograms.items():
+            if opType in self.typeHistograms:
+                self.typeHistograms[opType].merge(histogram)
+            else:
+                self.typeHistograms[opType] = histogram
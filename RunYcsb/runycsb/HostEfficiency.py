@@ -0,0 +1,106 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to normalise
+the throughput of each key by the cores and memory of the hosts its
+cells ran on, and to flag keys and series whose results come from
+different hardware, using the host inventory the fabfile captures when
+a series starts.
+'''
+from array import array
+from collections import OrderedDict
+from HostInventory import HostInventory
+from mystats import stddev
+
+class HostEfficiency(object):
+    '''
+    A cell's hardware is that of the hosts of its data bearing mongods,
+    taken from the cell's manifest, with cores and memory summed over
+    them.  Manifests written before data hosts were recorded fall back
+    to every host of the cell's topology.  Cells without a manifest or
+    whose hosts aren't in the inventory aren't normalised.
+    '''
+    __slots__ = ('inventory', 'metrics', 'hardware')
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    PHASES = ('load', 'run')
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, inventory=None):
+        '''Without an inventory no element is normalised.'''
+        self.inventory = inventory
+
+        # key -> OrderedDict of metric name -> array of values.
+        self.metrics = {}
+
+        # key -> OrderedDict of hardware -> number of cells.
+        self.hardware = {}
+
+    # --------------------------------------------------------
+    # getHostsHardware
+    # --------------------------------------------------------
+    def getHostsHardware(self, element):
+        '''
+        Return the (hardware, cpu count, memory bytes) of the hosts a
+        collated element ran on, or None when they aren't known.
+        '''
+        manifest = element.manifest
+        if not (self.inventory and manifest):
+            return None
+        hosts = manifest.get('data_hosts') or manifest.get('hosts') or [manifest.get('host')]
+        return self.inventory.getHostsHardware([h for h in hosts if h])
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, key, element):
+        '''Fold the normalised throughput of a collated element into its key.'''
+        hostsHardware = self.getHostsHardware(element)
+        if not hostsHardware:
+            return
+        hardware, cores, memBytes = hostsHardware
+        counts = self.hardware.setdefault(key, OrderedDict())
+        counts[hardware] = counts.get(hardware, 0) + 1
+        metrics = self.metrics.setdefault(key, OrderedDict())
+        gigabytes = float(memBytes) / HostInventory.BYTES_PER_GB
+        for phase, ycsb in zip(self.PHASES, (element.ycsbLoad, element.ycsbRun)):
+            if ycsb:
+                metrics.setdefault(phase + '_ops_per_core', array('d')).append(float(ycsb.throughput) / cores)
+                metrics.setdefault(phase + '_ops_per_gb', array('d')).append(ycsb.throughput / gigabytes)
+
+    # --------------------------------------------------------
+    # getStats
+    # --------------------------------------------------------
+    def getStats(self, key):
+        '''
+        Return a list of (metric, average, count, stdev) for a key,
+        with values truncated to integers as in the collation report.
+        '''
+        return [(name, int(sum(values) / len(values)), len(values), int(stddev(values)))
+                for name, values in self.metrics.get(key, {}).items()]
+
+    # --------------------------------------------------------
+    # getHardware
+    # --------------------------------------------------------
+    def getHardware(self, key):
+        '''Return the list of (hardware, cells) a key's cells ran on.'''
+        return self.hardware.get(key, OrderedDict()).items()
+
+    # --------------------------------------------------------
+    # getSeriesHardware
+    # --------------------------------------------------------
+    def getSeriesHardware(self):
+        '''
+        Return an OrderedDict of each hardware the series' cells ran on
+        to the sorted keys that ran on it.  More than one entry means
+        that comparing keys may compare different hardware.
+        '''
+        series = OrderedDict()
+        for key in sorted(self.hardware):
+            for hardware in self.hardware[key]:
+                series.setdefault(hardware, []).append(key)
+        return series
@@ -0,0 +1,181 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's fabfile script to capture the
+hardware and software inventory of every host of a series when it
+starts, and by the CollateResults script to describe the hardware that
+each cell ran on, so that results from different machines can be
+normalised and told apart.
+'''
+import json
+from collections import OrderedDict
+
+class HostInventory(object):
+    '''
+    The inventory file holds one JSON object with these entries:
+
+      captured     when the inventory was captured
+      controller   host that runs the orchestrator and ycsb
+      hosts        host -> OrderedDict of the properties below
+
+    Properties that can't be read on a host are null:
+
+      cpu_model        model name of the first processor
+      cpu_count        online logical processors
+      cpu_sockets      physical packages
+      mem_bytes        total memory
+      kernel           kernel release
+      disk_device      block device holding the dbpath
+      disk_model       model of that device, or of the disk it's a partition of
+      disk_rotational  1 for spinning disks, 0 for solid state
+      disk_fs          filesystem type of the dbpath
+      mongod_version   first line of mongod --version
+      ycsb_version     version of the ycsb core jar
+
+    Hosts have the same hardware when their cpu model and count, memory
+    rounded to GB, disk model and type and filesystem are the same.
+    Kernels and versions are reported but don't make hardware differ.
+    '''
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # The file in the series log directory that receives the inventory.
+    INVENTORY_FILENAME = "RunYcsb-inventory.json"
+
+    # Properties that are integers.
+    INTEGER_PROPERTIES = ('cpu_count', 'cpu_sockets', 'mem_bytes', 'disk_rotational')
+
+    BYTES_PER_GB = 1024 ** 3
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, hosts=None, controller=None, captured=None):
+        self.hosts = hosts if hosts is not None else OrderedDict()
+        self.controller = controller
+        self.captured = captured
+
+    # --------------------------------------------------------
+    # read
+    # --------------------------------------------------------
+    @classmethod
+    def read(cls, inventoryFile):
+        '''Return the inventory stored in an inventory file.'''
+        with open(inventoryFile, 'r') as f:
+            document = json.load(f, object_pairs_hook=OrderedDict)
+        return cls(document['hosts'], document['controller'], document['captured'])
+
+    # --------------------------------------------------------
+    # getScript
+    # --------------------------------------------------------
+    @classmethod
+    def getScript(cls, dbpath, mongodPath, ycsbHome=None):
+        '''
+        Return the shell command that prints the properties of the host
+        it runs on as name=value lines.  The ycsb version is only read
+        when ycsbHome is given.
+        '''
+        script = [
+            "echo cpu_model=$(grep -m1 '^model name' /proc/cpuinfo | cut -d: -f2- | sed 's/^ *//')",
+            "echo cpu_count=$(getconf _NPROCESSORS_ONLN)",
+            "echo cpu_sockets=$(grep '^physical id' /proc/cpuinfo | sort -u | wc -l)",
+            "echo mem_bytes=$(($(sed -n 's/^MemTotal: *\\([0-9]*\\) kB$/\\1/p' /proc/meminfo) * 1024))",
+            "echo kernel=$(uname -r)",
+            "dev=$(basename $(readlink -f $(df -P " + dbpath + " | tail -1 | cut -d' ' -f1)))",
+            "disk=$(lsblk -no pkname /dev/$dev 2> /dev/null | head -1)",
+            "disk=${disk:-$dev}",
+            "echo disk_device=$dev",
+            "echo disk_model=$(cat /sys/block/$disk/device/model 2> /dev/null)",
+            "echo disk_rotational=$(cat /sys/block/$disk/queue/rotational 2> /dev/null)",
+            "echo disk_fs=$(df -PT " + dbpath + " | tail -1 | awk '{print $2}')",
+            "echo mongod_version=$(" + mongodPath + " --version 2> /dev/null | head -1)"]
+        if ycsbHome:
+            script.append("echo ycsb_version=$(find " + ycsbHome + " -maxdepth 3 -name 'core-*.jar' | head -1 | " +
+                          "sed 's/.*core-//; s/[.]jar$//')")
+        return "; ".join(script)
+
+    # --------------------------------------------------------
+    # parse
+    # --------------------------------------------------------
+    @classmethod
+    def parse(cls, output):
+        '''Return the properties printed by the inventory script.'''
+        properties = OrderedDict()
+        for line in output.splitlines():
+            if '=' not in line:
+                continue
+            name, value = line.strip().split('=', 1)
+            value = value.strip() or None
+            if value is not None and name in cls.INTEGER_PROPERTIES:
+                value = int(value) if value.isdigit() else None
+            properties[name] = value
+        return properties
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, host, properties):
+        self.hosts[host] = properties
+
+    # --------------------------------------------------------
+    # getDocument
+    # --------------------------------------------------------
+    def getDocument(self):
+        '''Return the inventory as the JSON object of the inventory file.'''
+        return OrderedDict([('captured', self.captured), ('controller', self.controller), ('hosts', self.hosts)])
+
+    # --------------------------------------------------------
+    # getHardware
+    # --------------------------------------------------------
+    def getHardware(self, host):
+        '''
+        Return a description of a host's hardware that is the same for
+        hosts with the same hardware, or None for an unknown host.
+        '''
+        properties = self.hosts.get(host)
+        if not properties:
+            return None
+        description = (properties.get('cpu_model') or "unknown cpu") + " x" + str(properties.get('cpu_count'))
+        if properties.get('mem_bytes'):
+            description += ", " + str(int(round(float(properties['mem_bytes']) / self.BYTES_PER_GB))) + " GB"
+        disk = [properties.get('disk_model'), {0: 'ssd', 1: 'hdd'}.get(properties.get('disk_rotational')),
+                properties.get('disk_fs')]
+        if [d for d in disk if d]:
+            description += ", " + " ".join(d for d in disk if d)
+        return description
+
+    # --------------------------------------------------------
+    # getHostsHardware
+    # --------------------------------------------------------
+    def getHostsHardware(self, hosts):
+        '''
+        Return the (hardware, cpu count, memory bytes) of a set of hosts,
+        where hardware joins the descriptions of the distinct hosts and
+        the counts are summed over them, or None when a host is unknown
+        or its cpu count or memory couldn't be read.
+        '''
+        hosts = sorted(set(hosts))
+        if not hosts or [h for h in hosts if not self.hosts.get(h)]:
+            return None
+        cores = [self.hosts[h].get('cpu_count') for h in hosts]
+        memory = [self.hosts[h].get('mem_bytes') for h in hosts]
+        if None in cores or None in memory:
+            return None
+        return " + ".join(sorted(self.getHardware(h) for h in hosts)), sum(cores), sum(memory)
+
+    # --------------------------------------------------------
+    # getReport
+    # --------------------------------------------------------
+    def getReport(self):
+        '''Return the lines that describe each host of the inventory.'''
+        lines = ['------ host inventory', "Captured: " + str(self.captured)]
+        for host, properties in self.hosts.items():
+            software = ["kernel " + str(properties.get('kernel'))]
+            if properties.get('mongod_version'):
+                software.append(properties['mongod_version'])
+            if properties.get('ycsb_version'):
+                software.append("ycsb " + properties['ycsb_version'])
+            role = " (controller)" if host == self.controller else ""
+            lines.append("Host " + host + role + ": " + str(self.getHardware(host)) + "; " + ", ".join(software))
+        return lines
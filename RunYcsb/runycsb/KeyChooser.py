@@ -0,0 +1,142 @@
+'''
+Created on Oct 19, 2026
+
+These classes are used by the RunYcsb's LoadGenerator script to
+choose record numbers with the request distributions of the YCSB
+core workload: uniform, zipfian and latest.
+'''
+import random, threading
+
+# --------------------------------------------------------
+# fnvHash64
+# --------------------------------------------------------
+def fnvHash64(value):
+    '''
+    Return the 64 bit FNV-1a hash of a long's 8 bytes as a
+    non-negative number, as computed by YCSB's Utils.FNVhash64.
+    '''
+    hashval = 0xCBF29CE484222325
+    for i in range(8):
+        hashval ^= value & 0xff
+        value >>= 8
+        hashval = (hashval * 1099511628211) & 0xFFFFFFFFFFFFFFFF
+    if hashval >= 1 << 63:
+        hashval = (1 << 64) - hashval
+    return hashval
+
+class UniformChooser(object):
+    '''Choose record numbers uniformly from [low, high].'''
+
+    def __init__(self, low, high, seed=None):
+        self.low = low
+        self.high = high
+        self.random = random.Random(seed)
+
+    def next(self):
+        return self.random.randint(self.low, self.high)
+
+class ZipfianChooser(object):
+    '''
+    Choose record numbers from [low, low + items) with a zipfian
+    distribution in which low is the most popular, using the algorithm
+    of Gray et al. that YCSB's ZipfianGenerator implements.  The item
+    count can grow as records are inserted, in which case the zeta
+    constant is extended incrementally.
+    '''
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    ZIPFIAN_CONSTANT = 0.99
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, low, items, seed=None, theta=ZIPFIAN_CONSTANT, zetan=None):
+        '''
+        A precomputed zetan for the item count can be given to avoid
+        summing it, which takes a while for large item counts.
+        '''
+        self.low = low
+        self.theta = theta
+        self.alpha = 1.0 / (1.0 - theta)
+        self.zeta2theta = self._zeta(0, 2, 0.0)
+        self.items = items
+        self.zetan = zetan if zetan is not None else self._zeta(0, items, 0.0)
+        self.eta = self._eta()
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    # --------------------------------------------------------
+    # next
+    # --------------------------------------------------------
+    def next(self, items=None):
+        '''
+        Return the next record number, first growing the item count
+        to items when a larger count is given.
+        '''
+        if items is not None and items > self.items:
+            with self.lock:
+                if items > self.items:
+                    self.zetan = self._zeta(self.items, items, self.zetan)
+                    self.items = items
+                    self.eta = self._eta()
+        u = self.random.random()
+        uz = u * self.zetan
+        if uz < 1.0:
+            return self.low
+        if uz < 1.0 + 0.5 ** self.theta:
+            return self.low + 1
+        value = int(self.items * ((self.eta * u - self.eta + 1) ** self.alpha))
+        return self.low + min(value, self.items - 1)
+
+    # --------------------------------------------------------
+    # _zeta
+    # --------------------------------------------------------
+    def _zeta(self, start, end, partial):
+        '''Extend a partial zeta sum over items start + 1 .. end.'''
+        total = partial
+        for i in xrange(start, end):
+            total += 1.0 / ((i + 1) ** self.theta)
+        return total
+
+    # --------------------------------------------------------
+    # _eta
+    # --------------------------------------------------------
+    def _eta(self):
+        return (1 - (2.0 / self.items) ** (1 - self.theta)) / (1 - self.zeta2theta / self.zetan)
+
+class ScrambledZipfianChooser(object):
+    '''
+    Choose record numbers from [low, low + items) with a zipfian
+    popularity whose popular items are scattered over the range by
+    hashing, as YCSB does for its zipfian request distribution.
+    '''
+
+    # The zipfian is drawn over a large fixed item count whose zeta
+    # constant YCSB precomputes.
+    ITEM_COUNT = 10000000000
+    ZETAN = 26.46902820178302
+
+    def __init__(self, low, items, seed=None):
+        self.low = low
+        self.items = items
+        self.zipfian = ZipfianChooser(0, self.ITEM_COUNT, seed, zetan=self.ZETAN)
+
+    def next(self):
+        return self.low + fnvHash64(self.zipfian.next()) % self.items
+
+class LatestChooser(object):
+    '''
+    Choose record numbers with a zipfian popularity that favours the
+    most recently inserted records, as YCSB's SkewedLatestGenerator
+    does.  The latest record number is read from a callable.
+    '''
+
+    def __init__(self, latest, seed=None):
+        self.latest = latest
+        self.zipfian = ZipfianChooser(0, max(latest(), 1), seed)
+
+    def next(self):
+        latest = self.latest()
+        return latest - self.zipfian.next(latest)
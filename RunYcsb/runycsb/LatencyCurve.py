@@ -0,0 +1,102 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to build the
+latency versus offered load curve of each key from the steps of its
+target rate ladders, and by the fabfile to judge each step of an
+adaptive search for the highest rate that meets the latency SLA.
+'''
+from array import array
+from LatencyHistogram import LatencyHistogram
+
+class LatencyCurve(object):
+    '''
+    Each step of a ladder runs ycsb with -target set to an offered
+    rate.  A step sustains its rate when ycsb achieves at least
+    SUSTAIN_RATIO of it and the SLA percentile of the latencies of all
+    its operation types together is within the SLA limit.  The maximum
+    sustainable throughput of a key is the highest average achieved
+    throughput of the offered rates that it sustains.
+    '''
+    __slots__ = ('percentile', 'latencyUs', 'curves')
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    SUSTAIN_RATIO = 0.95
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, percentile, latencyUs):
+        '''A latencyUs of None reports curves without a maximum.'''
+        self.percentile = percentile
+        self.latencyUs = latencyUs
+
+        # key -> offered rate -> (array of achieved throughputs, merged histogram).
+        self.curves = {}
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, key, element):
+        '''Fold the target rate steps of a collated element into its key.'''
+        for target, ycsb in element.targetRuns:
+            curve = self.curves.setdefault(key, {})
+            if target not in curve:
+                curve[target] = (array('d'), LatencyHistogram())
+            throughputs, histogram = curve[target]
+            throughputs.append(ycsb.throughput)
+            histogram.merge(self.getHistogram(ycsb))
+
+    # --------------------------------------------------------
+    # getHistogram
+    # --------------------------------------------------------
+    def getHistogram(self, ycsb):
+        '''Return the histogram of all of a phase's operation types together.'''
+        histogram = LatencyHistogram()
+        for opType, typeHistogram in ycsb.typeHistograms.items():
+            histogram.merge(typeHistogram)
+        return histogram
+
+    # --------------------------------------------------------
+    # isSustained
+    # --------------------------------------------------------
+    def isSustained(self, target, throughput, latency):
+        '''
+        Return True if an achieved throughput and SLA percentile
+        latency sustain an offered rate.  A missing latency never does.
+        '''
+        return throughput >= self.SUSTAIN_RATIO * target and latency is not None \
+               and latency <= self.latencyUs
+
+    # --------------------------------------------------------
+    # getCurve
+    # --------------------------------------------------------
+    def getCurve(self, key):
+        '''
+        Return a list of (offered rate, average achieved throughput,
+        runs, SLA percentile latency, operations) sorted by offered
+        rate, with throughputs truncated to integers and latencies in
+        microseconds.  The latency is None for steps without histograms.
+        '''
+        points = []
+        for target in sorted(self.curves.get(key, {})):
+            throughputs, histogram = self.curves[key][target]
+            points.append((target, int(sum(throughputs) / len(throughputs)), len(throughputs),
+                           histogram.getPercentile(self.percentile), histogram.count))
+        return points
+
+    # --------------------------------------------------------
+    # getMaxSustainable
+    # --------------------------------------------------------
+    def getMaxSustainable(self, key):
+        '''
+        Return the maximum sustainable throughput of a key, or None
+        when there's no SLA limit or no offered rate was sustained.
+        '''
+        if self.latencyUs is None:
+            return None
+        sustained = [throughput for target, throughput, runs, latency, ops in self.getCurve(key)
+                     if self.isSustained(target, throughput, latency)]
+        return max(sustained) if sustained else None
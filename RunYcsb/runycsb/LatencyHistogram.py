@@ -0,0 +1,147 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's LoadGenerator script to record
+operation latencies in the manner of an HDR histogram, and by the
+CollateResults script to merge them across clients and repeats so
+that percentiles come from the combined distribution.
+'''
+
+class LatencyHistogram(object):
+    '''
+    Latencies are recorded in whole microseconds into log-linear
+    buckets: values below 128us have a bucket each, and every power of
+    two above that is split into 64 buckets, so a recorded value is
+    known to within 1/64 of itself at any magnitude.  Buckets are kept
+    sparsely, so an idle histogram costs next to nothing.
+    '''
+    __slots__ = ('counts', 'count', 'totalUs', 'minUs', 'maxUs')
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # Values below 2^LINEAR_BITS get their own bucket and each power
+    # of two above gets 2^(LINEAR_BITS - 1) buckets.
+    LINEAR_BITS = 7
+    SUB_BUCKETS = 1 << (LINEAR_BITS - 1)
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self):
+        # Bucket index -> number of values recorded in it.
+        self.counts = {}
+        self.count = 0
+        self.totalUs = 0
+        self.minUs = None
+        self.maxUs = None
+
+    # --------------------------------------------------------
+    # record
+    # --------------------------------------------------------
+    def record(self, us, count=1):
+        '''Record a latency in microseconds count times.'''
+        us = max(int(us), 0)
+        if count <= 0:
+            return
+        index = self._index(us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.totalUs += us * count
+        if self.minUs is None or us < self.minUs:
+            self.minUs = us
+        if self.maxUs is None or us > self.maxUs:
+            self.maxUs = us
+
+    # --------------------------------------------------------
+    # merge
+    # --------------------------------------------------------
+    def merge(self, other):
+        '''Add every value recorded in another histogram to this one.'''
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.totalUs += other.totalUs
+        for us in (other.minUs, other.maxUs):
+            if us is not None:
+                if self.minUs is None or us < self.minUs:
+                    self.minUs = us
+                if self.maxUs is None or us > self.maxUs:
+                    self.maxUs = us
+
+    # --------------------------------------------------------
+    # toString
+    # --------------------------------------------------------
+    def toString(self):
+        '''
+        Return a compact single line form that fromString reads back:
+        the count, total, min and max followed by index:count pairs.
+        '''
+        fields = [str(self.count), str(self.totalUs), str(self.minUs), str(self.maxUs)]
+        fields += [str(index) + ":" + str(self.counts[index]) for index in sorted(self.counts)]
+        return " ".join(fields)
+
+    # --------------------------------------------------------
+    # fromString
+    # --------------------------------------------------------
+    @classmethod
+    def fromString(cls, text):
+        '''Return the histogram written by toString.'''
+        fields = text.split()
+        histogram = cls()
+        histogram.count = int(fields[0])
+        histogram.totalUs = int(fields[1])
+        histogram.minUs = None if fields[2] == 'None' else int(fields[2])
+        histogram.maxUs = None if fields[3] == 'None' else int(fields[3])
+        for pair in fields[4:]:
+            index, count = pair.split(':')
+            histogram.counts[int(index)] = int(count)
+        return histogram
+
+    # --------------------------------------------------------
+    # getMean
+    # --------------------------------------------------------
+    def getMean(self):
+        '''Return the exact mean latency, or None if nothing was recorded.'''
+        if not self.count:
+            return None
+        return float(self.totalUs) / self.count
+
+    # --------------------------------------------------------
+    # getPercentile
+    # --------------------------------------------------------
+    def getPercentile(self, percentile):
+        '''
+        Return the latency at or below which the given percentage of
+        values fall, as the upper end of its bucket capped by the
+        largest value recorded, or None if nothing was recorded.
+        '''
+        if not self.count:
+            return None
+        rank = max(1, int(round(self.count * percentile / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upperBound(index), self.maxUs)
+        return self.maxUs
+
+    # --------------------------------------------------------
+    # _index
+    # --------------------------------------------------------
+    def _index(self, us):
+        if us < (1 << self.LINEAR_BITS):
+            return us
+        shift = us.bit_length() - self.LINEAR_BITS
+        return shift * self.SUB_BUCKETS + (us >> shift)
+
+    # --------------------------------------------------------
+    # _upperBound
+    # --------------------------------------------------------
+    def _upperBound(self, index):
+        '''Return the largest value that falls into a bucket.'''
+        if index < (1 << self.LINEAR_BITS):
+            return index
+        shift = index // self.SUB_BUCKETS - 1
+        sub = index - shift * self.SUB_BUCKETS
+        return ((sub + 1) << shift) - 1
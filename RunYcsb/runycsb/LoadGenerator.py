@@ -0,0 +1,453 @@
+'''
+Created on Oct 19, 2026
+
+This script is a Python replacement for the ycsb command that the
+RunYcsb's fabfile script runs when load_generator is set to python.
+It takes the ycsb command line, runs the YCSB core workload against
+MongoDB with pymongo and writes its results in the format that
+CollateYcsb parses.
+
+  python LoadGenerator.py load|run mongodb [-P workloadfile] [-p name=value]...
+                          [-threads n] [-target ops/sec] [-s]
+'''
+import os, sys, time, random, threading, logging
+from datetime import datetime
+from KeyChooser import fnvHash64, UniformChooser, ZipfianChooser, ScrambledZipfianChooser, LatestChooser
+from LatencyHistogram import LatencyHistogram
+
+# pymongo is only needed on the host that runs the load.
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+class LoadGenerator(object):
+    '''
+    Client threads share the operation count, key choosers and the
+    insert key sequence, and record their latencies into one histogram
+    per operation type.  pymongo releases the interpreter lock while it
+    waits on the server, so threads overlap their requests much as
+    ycsb's client threads do.
+    '''
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # Property defaults of the YCSB core workload.
+    DEFAULT_PROPERTIES = {
+        'recordcount': '0', 'operationcount': '0', 'threadcount': '1', 'target': '0',
+        'fieldcount': '10', 'fieldlength': '100', 'writeallfields': 'false',
+        'readproportion': '0.95', 'updateproportion': '0.05', 'insertproportion': '0',
+        'scanproportion': '0', 'readmodifywriteproportion': '0',
+        'requestdistribution': 'uniform', 'maxscanlength': '1000', 'scanlengthdistribution': 'uniform',
+        'insertorder': 'hashed', 'insertstart': '0', 'table': 'usertable', 'maxexecutiontime': '0',
+        'mongodb.database': 'ycsb', 'mongodb.writeConcern': 'acknowledged',
+    }
+
+    # The YCSB core workloads, used when the -P file doesn't exist on
+    # this host so that no ycsb install is needed.
+    CORE_WORKLOADS = {
+        'workloada': {'readproportion': '0.5', 'updateproportion': '0.5', 'requestdistribution': 'zipfian'},
+        'workloadb': {'readproportion': '0.95', 'updateproportion': '0.05', 'requestdistribution': 'zipfian'},
+        'workloadc': {'readproportion': '1', 'updateproportion': '0', 'requestdistribution': 'zipfian'},
+        'workloadd': {'readproportion': '0.95', 'updateproportion': '0', 'insertproportion': '0.05',
+                      'requestdistribution': 'latest'},
+        'workloade': {'readproportion': '0', 'updateproportion': '0', 'scanproportion': '0.95',
+                      'insertproportion': '0.05', 'requestdistribution': 'zipfian', 'maxscanlength': '100'},
+        'workloadf': {'readproportion': '0.5', 'updateproportion': '0', 'readmodifywriteproportion': '0.5',
+                      'requestdistribution': 'zipfian'},
+    }
+
+    # Operation types in the order they are reported.
+    OPERATIONS = ['INSERT', 'READ', 'UPDATE', 'SCAN', 'READ-MODIFY-WRITE']
+
+    # Write concerns by their YCSB mongodb binding names.
+    WRITE_CONCERNS = {
+        'unacknowledged': {'w': 0}, 'errors_ignored': {'w': 0}, 'normal': {'w': 0},
+        'acknowledged': {'w': 1}, 'safe': {'w': 1},
+        'journaled': {'w': 1, 'j': True}, 'fsync_safe': {'w': 1, 'j': True},
+        'replica_acknowledged': {'w': 2}, 'majority': {'w': 'majority'},
+    }
+
+    # Seconds between status lines when -s is given.
+    STATUS_INTERVAL = 10
+
+    # --------------------------------------------------------
+    # Class Variables
+    # --------------------------------------------------------
+    # Set the log level here.
+    LOG = logging.getLogger('LoadGenerator')
+    LOG.setLevel(logging.INFO)
+    LOG.addHandler(logging.StreamHandler())
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, args):
+        '''Parse a ycsb style command line.'''
+        if len(args) < 2 or args[0] not in ('load', 'run'):
+            msg = "Usage: LoadGenerator.py load|run mongodb [-P workloadfile] [-p name=value]... " \
+                  + "[-threads n] [-target ops/sec] [-s]"
+            raise Exception(msg)
+        self.load = args[0] == 'load'
+        self.status = False
+        self.args = args
+        self.workloadFile = None
+
+        # Workload files are read before -p properties, which override them.
+        overrides = {}
+        i = 2
+        while i < len(args):
+            if args[i] == '-P':
+                self.workloadFile = args[i+1]
+                i += 1
+            elif args[i] == '-p':
+                name, value = args[i+1].split('=', 1)
+                overrides[name] = value
+                i += 1
+            elif args[i] == '-threads':
+                overrides['threadcount'] = args[i+1]
+                i += 1
+            elif args[i] == '-target':
+                overrides['target'] = args[i+1]
+                i += 1
+            elif args[i] == '-s':
+                self.status = True
+            elif args[i] not in ('-t', '-load'):
+                msg = "Unknown LoadGenerator option " + args[i] + "."
+                raise Exception(msg)
+            i += 1
+        self.props = dict(self.DEFAULT_PROPERTIES)
+        if self.workloadFile:
+            self.props.update(self._readWorkload(self.workloadFile))
+        self.props.update(overrides)
+
+        # Latency histograms and error counts by operation type.
+        self.histograms = dict((op, LatencyHistogram()) for op in self.OPERATIONS)
+        self.errors = dict((op, 0) for op in self.OPERATIONS)
+        self.lock = threading.Lock()
+        self.operations = 0
+        
+        # The first unexpected error raised in a client thread.
+        self.failure = None
+
+    # --------------------------------------------------------
+    # run
+    # --------------------------------------------------------
+    def run(self):
+        '''Run the phase, print its results and return the exit status.'''
+        if pymongo is None:
+            msg = "The python load generator requires pymongo on the host that runs it."
+            raise Exception(msg)
+        props = self.props
+        threadCount = int(props['threadcount'])
+        recordCount = int(props['recordcount'])
+        insertStart = int(props['insertstart'])
+        insertCount = int(props.get('insertcount', recordCount - insertStart))
+        opCount = insertCount if self.load else int(props['operationcount'])
+
+        # Command line in the form CollateYcsb expects.
+        cmdLine = "Command line: -db LoadGenerator"
+        for name in sorted(props):
+            cmdLine += " -p " + name + "=" + props[name]
+        if self.workloadFile:
+            cmdLine += " -P " + self.workloadFile
+        cmdLine += " -load" if self.load else " -t"
+        print(cmdLine)
+        sys.stdout.flush()
+
+        self._connect()
+        self._prepareKeys(recordCount, insertStart, opCount)
+        self.opsLeft = opCount
+        targetPerThread = float(props['target']) / threadCount
+
+        # Run the client threads and, optionally, the status thread.
+        # As in ycsb, a positive maxexecutiontime ends the phase after
+        # that many seconds even if operations are left.
+        self.startTime = time.time()
+        maxSecs = int(props['maxexecutiontime'])
+        self.deadline = self.startTime + maxSecs if maxSecs > 0 else None
+        threads = [threading.Thread(target=self._clientThread, args=(targetPerThread,)) for t in range(threadCount)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        done = threading.Event()
+        if self.status:
+            statusThread = threading.Thread(target=self._statusThread, args=(done,))
+            statusThread.daemon = True
+            statusThread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(1)
+        done.set()
+        if self.failure:
+            raise self.failure
+        runtimeMs = int((time.time() - self.startTime) * 1000)
+        self._report(runtimeMs)
+        return 0
+
+    # --------------------------------------------------------
+    # _readWorkload
+    # --------------------------------------------------------
+    def _readWorkload(self, workloadFile):
+        '''
+        Read a ycsb workload properties file, falling back on the
+        built-in core workload of the same name when it doesn't exist.
+        '''
+        if not os.path.isfile(workloadFile):
+            name = os.path.basename(workloadFile)
+            if name not in self.CORE_WORKLOADS:
+                msg = "Workload file " + workloadFile + " not found and not a core workload."
+                raise Exception(msg)
+            return self.CORE_WORKLOADS[name]
+        props = {}
+        with open(workloadFile, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and (not line.startswith('#')) and line.find('=') > 0:
+                    name, value = line.split('=', 1)
+                    props[name.strip()] = value.strip()
+        return props
+
+    # --------------------------------------------------------
+    # _connect
+    # --------------------------------------------------------
+    def _connect(self):
+        '''
+        Connect to the hosts given by env.hosts, which the fabfile
+        sets, or to mongodb.url.
+        '''
+        props = self.props
+        if props.get('env.hosts'):
+            url = "mongodb://" + props['env.hosts'] + "/"
+        else:
+            url = props.get('mongodb.url', "mongodb://localhost:27017/")
+        writeConcern = self.WRITE_CONCERNS.get(props['mongodb.writeConcern'].lower())
+        if writeConcern is None:
+            msg = "Unknown mongodb.writeConcern " + props['mongodb.writeConcern'] + "."
+            raise Exception(msg)
+        self.client = pymongo.MongoClient(url, maxPoolSize=int(props['threadcount']) + 1, **writeConcern)
+        self.collection = self.client[props['mongodb.database']][props['table']]
+
+    # --------------------------------------------------------
+    # _prepareKeys
+    # --------------------------------------------------------
+    def _prepareKeys(self, recordCount, insertStart, opCount):
+        '''
+        Set up the operation mix, the key choosers and the insert key
+        sequence.  Loads insert from insertstart and runs insert after
+        the loaded records.
+        '''
+        props = self.props
+        self.fieldCount = int(props['fieldcount'])
+        self.fieldLength = int(props['fieldlength'])
+        self.hashed = props['insertorder'] == 'hashed'
+        self.nextInsert = insertStart if self.load else recordCount
+        self.lastInserted = self.nextInsert - 1
+
+        # Cumulative operation proportions.
+        self.mix = []
+        total = 0.0
+        if self.load:
+            self.mix.append((1.0, 'INSERT'))
+        else:
+            for op, prop in (('READ', 'readproportion'), ('UPDATE', 'updateproportion'),
+                             ('INSERT', 'insertproportion'), ('SCAN', 'scanproportion'),
+                             ('READ-MODIFY-WRITE', 'readmodifywriteproportion')):
+                if float(props[prop]) > 0:
+                    total += float(props[prop])
+                    self.mix.append((total, op))
+        self.random = random.Random()
+
+        # Key choosers.  Zipfian ranges leave room for the records the
+        # run may insert, and keys not inserted yet are chosen again.
+        distribution = props['requestdistribution']
+        expected = recordCount + int(opCount * float(props['insertproportion']) * 2)
+        if distribution == 'uniform':
+            self.keyChooser = UniformChooser(0, max(recordCount - 1, 0))
+        elif distribution == 'zipfian':
+            self.keyChooser = ScrambledZipfianChooser(0, max(expected, 1))
+        elif distribution == 'latest':
+            self.keyChooser = LatestChooser(lambda: self.lastInserted)
+        else:
+            msg = "Unknown requestdistribution " + distribution + "."
+            raise Exception(msg)
+        maxScan = int(props['maxscanlength'])
+        if props['scanlengthdistribution'] == 'zipfian':
+            self.scanChooser = ZipfianChooser(1, maxScan)
+        else:
+            self.scanChooser = UniformChooser(1, maxScan)
+
+        # Field values are slices of a random string.
+        letters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+        self.valuePool = ''.join(self.random.choice(letters) for i in range(4096 + self.fieldLength))
+
+    # --------------------------------------------------------
+    # _clientThread
+    # --------------------------------------------------------
+    def _clientThread(self, targetPerThread):
+        '''
+        Take operations from the shared count until none are left,
+        pacing them at the per-thread target rate when one is set.
+        Errors other than driver errors stop every thread.
+        '''
+        done = 0
+        start = time.time()
+        while True:
+            if self.deadline and time.time() >= self.deadline:
+                return
+            with self.lock:
+                if self.opsLeft <= 0 or self.failure:
+                    return
+                self.opsLeft -= 1
+            try:
+                self._doOperation()
+            except Exception as e:
+                with self.lock:
+                    self.failure = self.failure or e
+                return
+            done += 1
+            if targetPerThread > 0:
+                delay = start + done / targetPerThread - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+
+    # --------------------------------------------------------
+    # _doOperation
+    # --------------------------------------------------------
+    def _doOperation(self):
+        u = self.random.random() * self.mix[-1][0]
+        for limit, op in self.mix:
+            if u < limit:
+                break
+        if op == 'INSERT':
+            with self.lock:
+                keynum = self.nextInsert
+                self.nextInsert += 1
+            self._timed(op, lambda: self.collection.insert_one(self._record(keynum)))
+            with self.lock:
+                self.lastInserted = max(self.lastInserted, keynum)
+        elif op == 'READ':
+            key = self._key(self._chooseKeynum())
+            self._timed(op, lambda: self.collection.find_one({'_id': key}))
+        elif op == 'UPDATE':
+            key = self._key(self._chooseKeynum())
+            self._timed(op, lambda: self.collection.update_one({'_id': key}, {'$set': self._fields(False)}))
+        elif op == 'SCAN':
+            key = self._key(self._chooseKeynum())
+            length = self.scanChooser.next()
+            self._timed(op, lambda: list(self.collection.find({'_id': {'$gte': key}}).sort('_id', 1).limit(length)))
+        else:
+            key = self._key(self._chooseKeynum())
+            def readModifyWrite():
+                self._timed('READ', lambda: self.collection.find_one({'_id': key}))
+                self._timed('UPDATE', lambda: self.collection.update_one({'_id': key}, {'$set': self._fields(False)}))
+            self._timed(op, readModifyWrite)
+        with self.lock:
+            self.operations += 1
+
+    # --------------------------------------------------------
+    # _timed
+    # --------------------------------------------------------
+    def _timed(self, op, action):
+        '''Run an operation and record its latency, counting failures.'''
+        start = time.time()
+        try:
+            action()
+        except pymongo.errors.PyMongoError as e:
+            self.LOG.debug(op + " failed: " + str(e))
+            with self.lock:
+                self.errors[op] += 1
+        latencyUs = (time.time() - start) * 1000000
+        with self.lock:
+            self.histograms[op].record(latencyUs)
+
+    # --------------------------------------------------------
+    # _chooseKeynum
+    # --------------------------------------------------------
+    def _chooseKeynum(self):
+        '''Choose a record number that has already been inserted.'''
+        keynum = self.keyChooser.next()
+        while keynum > self.lastInserted:
+            keynum = self.keyChooser.next()
+        return keynum
+
+    # --------------------------------------------------------
+    # _key
+    # --------------------------------------------------------
+    def _key(self, keynum):
+        if self.hashed:
+            keynum = fnvHash64(keynum)
+        return "user" + str(keynum)
+
+    # --------------------------------------------------------
+    # _fields
+    # --------------------------------------------------------
+    def _fields(self, allFields):
+        '''Return random values for every field or for one random field.'''
+        if allFields or self.props['writeallfields'] == 'true':
+            names = range(self.fieldCount)
+        else:
+            names = [self.random.randrange(self.fieldCount)]
+        fields = {}
+        for i in names:
+            offset = self.random.randrange(len(self.valuePool) - self.fieldLength)
+            fields['field' + str(i)] = self.valuePool[offset:offset + self.fieldLength]
+        return fields
+
+    # --------------------------------------------------------
+    # _record
+    # --------------------------------------------------------
+    def _record(self, keynum):
+        record = self._fields(True)
+        record['_id'] = self._key(keynum)
+        return record
+
+    # --------------------------------------------------------
+    # _statusThread
+    # --------------------------------------------------------
+    def _statusThread(self, done):
+        '''Write a ycsb style status line every STATUS_INTERVAL seconds.'''
+        lastOps = 0
+        lastTime = self.startTime
+        while not done.wait(self.STATUS_INTERVAL):
+            now = time.time()
+            ops = self.operations
+            stamp = datetime.now()
+            sys.stderr.write(stamp.strftime('%Y-%m-%d %H:%M:%S') + ':%03d ' % (stamp.microsecond // 1000) +
+                             str(int(now - self.startTime)) + " sec: " + str(ops) + " operations; " +
+                             "%.2f current ops/sec;\n" % ((ops - lastOps) / (now - lastTime)))
+            sys.stderr.flush()
+            lastOps = ops
+            lastTime = now
+
+    # --------------------------------------------------------
+    # _report
+    # --------------------------------------------------------
+    def _report(self, runtimeMs):
+        '''Print the overall and per operation type results.'''
+        lines = ["[OVERALL], RunTime(ms), " + str(runtimeMs),
+                 "[OVERALL], Operations, " + str(self.operations),
+                 "[OVERALL], Throughput(ops/sec), " + str(self.operations * 1000.0 / max(runtimeMs, 1))]
+        for op in self.OPERATIONS:
+            histogram = self.histograms[op]
+            if not histogram.count:
+                continue
+            lines += ["[" + op + "], Operations, " + str(histogram.count),
+                      "[" + op + "], AverageLatency(us), " + str(histogram.getMean()),
+                      "[" + op + "], MinLatency(us), " + str(histogram.minUs),
+                      "[" + op + "], MaxLatency(us), " + str(histogram.maxUs),
+                      "[" + op + "], 95thPercentileLatency(us), " + str(histogram.getPercentile(95)),
+                      "[" + op + "], 99thPercentileLatency(us), " + str(histogram.getPercentile(99)),
+                      "[" + op + "], Return=0, " + str(histogram.count - self.errors[op]),
+                      "[" + op + "], LatencyHistogram(us), " + histogram.toString()]
+            if self.errors[op]:
+                lines.append("[" + op + "], Return=-1, " + str(self.errors[op]))
+        print('\n'.join(lines))
+        sys.stdout.flush()
+
+# --------------------------------------------------------
+# Main
+# --------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(LoadGenerator(sys.argv[1:]).run())
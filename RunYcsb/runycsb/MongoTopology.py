@@ -0,0 +1,215 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's fabfile script to plan the mongod
+and mongos processes of a cell's topology: a standalone mongod, a
+replica set or a sharded cluster with config servers and a mongos.
+'''
+import json
+
+class MongoTopology(object):
+    '''
+    A topology is planned from a normalised element of the topologies
+    array in the series configuration.  The plan lists every process
+    with its host, port and dbpath, the mongo shell statements that
+    join the processes together once they are running, and the
+    endpoint that ycsb connects to.
+    '''
+    __slots__ = ('topology', 'defaultHost', 'dbpath')
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # Supported topology types.
+    TYPE_STANDALONE = 'standalone'
+    TYPE_REPLSET = 'replset'
+    TYPE_SHARDED = 'sharded'
+    TYPES = [TYPE_STANDALONE, TYPE_REPLSET, TYPE_SHARDED]
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, topology, defaultHost, dbpath):
+        '''
+        The topology's processes are spread round-robin over its hosts,
+        or all run on defaultHost when it names none.  Each process gets
+        its own directory under dbpath.
+        '''
+        self.topology = topology
+        self.defaultHost = defaultHost
+        self.dbpath = dbpath
+
+    # --------------------------------------------------------
+    # isStandalone
+    # --------------------------------------------------------
+    def isStandalone(self):
+        return self.topology['type'] == self.TYPE_STANDALONE
+
+    # --------------------------------------------------------
+    # getHosts
+    # --------------------------------------------------------
+    def getHosts(self):
+        '''Return the hosts the topology's processes run on.'''
+        return self.topology['hosts'] or [self.defaultHost]
+
+    # --------------------------------------------------------
+    # getProcesses
+    # --------------------------------------------------------
+    def getProcesses(self):
+        '''
+        Return one dictionary per process in start order with these
+        entries:
+
+          name      process name, unique within the topology
+          program   mongod or mongos
+          host      host the process runs on
+          port      port the process listens on, None for the default port
+          dbpath    database directory, None for mongos
+          replSet   replica set name, or None
+          role      data, config or router
+          args      flags other than --port, --dbpath, --logpath and --fork
+
+        Data bearing processes are started with the cell's mongo parms
+        after args.  The first data process plays the part of the
+        standalone mongod in log naming and collation.
+        '''
+        topology = self.topology
+        if self.isStandalone():
+            return [self._process('mongod', 'mongod', None, self.dbpath, None, 'data', '')]
+
+        processes = []
+        if topology['type'] == self.TYPE_REPLSET:
+            for m in range(topology['members']):
+                processes.append(self._process('m' + str(m), 'mongod', len(processes), None,
+                                               self._replSetName(), 'data', ''))
+            return processes
+
+        # Config servers first since the mongos needs them at startup.
+        for c in range(topology['config_servers']):
+            replSet = self._replSetName('cfg') if topology['config_replset'] else None
+            processes.append(self._process('cfg' + str(c), 'mongod', len(processes), None, replSet,
+                                           'config', '--configsvr'))
+        for s in range(topology['shards']):
+            replSet = self._replSetName('s' + str(s)) if topology['members'] > 1 else None
+            for m in range(topology['members']):
+                processes.append(self._process('s' + str(s) + 'm' + str(m), 'mongod', len(processes), None,
+                                               replSet, 'data', '--shardsvr'))
+        processes.append(self._process('mongos', 'mongos', len(processes), None, None, 'router',
+                                       '--configdb ' + self._seedList(self._role(processes, 'config'))))
+        return processes
+
+    # --------------------------------------------------------
+    # getInitSteps
+    # --------------------------------------------------------
+    def getInitSteps(self):
+        '''
+        Return the (process, script, readyScript) steps that join the
+        processes together in the order they must run.  Each script
+        is evaluated by the mongo shell against the process, after
+        which readyScript is polled until it prints true.
+        '''
+        processes = self.getProcesses()
+        steps = []
+
+        # Initiate every replica set on its first member and wait
+        # for that member to become primary.
+        replSets = []
+        for process in processes:
+            if process['replSet'] and process['replSet'] not in replSets:
+                replSets.append(process['replSet'])
+        for replSet in replSets:
+            members = [p for p in processes if p['replSet'] == replSet]
+            config = {'_id': replSet, 'members': []}
+            if members[0]['role'] == 'config':
+                config['configsvr'] = True
+            for i in range(len(members)):
+                member = {'_id': i, 'host': self._address(members[i])}
+                if i == 0:
+                    member['priority'] = 2
+                config['members'].append(member)
+            steps.append((members[0], 'rs.initiate(' + json.dumps(config, sort_keys=True) + ')',
+                          'db.isMaster().ismaster'))
+
+        # Add the shards through the mongos and shard the collection.
+        if self.topology['type'] == self.TYPE_SHARDED:
+            mongos = self._role(processes, 'router')[0]
+            script = ''
+            for s in range(self.topology['shards']):
+                shard = [p for p in processes if p['name'].startswith('s' + str(s) + 'm')]
+                script += 'sh.addShard(' + json.dumps(self._seedList(shard)) + '); '
+            database = self.topology['shard_collection'].split('.', 1)[0]
+            script += 'sh.enableSharding(' + json.dumps(database) + '); '
+            script += 'sh.shardCollection(' + json.dumps(self.topology['shard_collection']) + ', ' + \
+                      self.topology['shard_key'] + ')'
+            steps.append((mongos, script, 'db.getSiblingDB("config").shards.count() == ' +
+                          str(self.topology['shards'])))
+        return steps
+
+    # --------------------------------------------------------
+    # getEndpoint
+    # --------------------------------------------------------
+    def getEndpoint(self):
+        '''
+        Return the host list ycsb connects to: the mongos of a sharded
+        cluster, every member of a replica set, or defaultHost for a
+        standalone mongod.
+        '''
+        if self.isStandalone():
+            return self.defaultHost
+        processes = self.getProcesses()
+        if self.topology['type'] == self.TYPE_SHARDED:
+            return self._address(self._role(processes, 'router')[0])
+        return ",".join(self._address(p) for p in processes)
+
+    # --------------------------------------------------------
+    # _process
+    # --------------------------------------------------------
+    def _process(self, name, program, index, dbpath, replSet, role, args):
+        '''
+        Build a process dictionary.  Processes with an index get the
+        index-th port after the base port, a host chosen round-robin
+        and, unless they are a mongos, a directory under dbpath.
+        '''
+        process = {'name': name, 'program': program, 'host': self.defaultHost, 'port': None,
+                   'dbpath': dbpath, 'replSet': replSet, 'role': role, 'args': args}
+        if index is not None:
+            hosts = self.getHosts()
+            process['host'] = hosts[index % len(hosts)]
+            process['port'] = self.topology['base_port'] + index
+            if program == 'mongod':
+                process['dbpath'] = self.dbpath.rstrip('/') + '/' + name
+        return process
+
+    # --------------------------------------------------------
+    # _replSetName
+    # --------------------------------------------------------
+    def _replSetName(self, suffix=None):
+        name = self.topology['name'] or self.topology['type']
+        if suffix:
+            name += '_' + suffix
+        return name
+
+    # --------------------------------------------------------
+    # _role
+    # --------------------------------------------------------
+    def _role(self, processes, role):
+        return [p for p in processes if p['role'] == role]
+
+    # --------------------------------------------------------
+    # _address
+    # --------------------------------------------------------
+    def _address(self, process):
+        return process['host'] + ':' + str(process['port'])
+
+    # --------------------------------------------------------
+    # _seedList
+    # --------------------------------------------------------
+    def _seedList(self, processes):
+        '''
+        Return the connection string of a group of processes, which
+        is prefixed with the replica set name when they form one.
+        '''
+        seeds = ",".join(self._address(p) for p in processes)
+        if processes[0]['replSet']:
+            seeds = processes[0]['replSet'] + '/' + seeds
+        return seeds
@@ -0,0 +1,117 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to flag the
+runs of a key whose throughput lies outside a robust band around the
+key's other runs, so that one bad repeat doesn't silently skew the
+key's average and stdev.
+'''
+from mystats import stddev
+
+class OutlierFilter(object):
+    '''
+    Two methods are supported, both of which are built on statistics
+    that a single wild value can't drag along with it:
+
+      mad   flag values whose modified z-score, 0.6745 * |x - median| / MAD,
+            exceeds the threshold (Iglewicz and Hoaglin suggest 3.5)
+      iqr   flag values beyond threshold * IQR outside the quartiles
+            (Tukey's fences use 1.5)
+
+    When more than half the values are equal the MAD is zero, in which
+    case the mean absolute deviation scaled by 1.2533 stands in for it.
+    Keys with fewer than MIN_VALUES runs are never flagged.
+    '''
+    __slots__ = ('method', 'threshold')
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    MIN_VALUES = 3
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, method, threshold):
+        '''The method is none, mad or iqr.'''
+        self.method = method
+        self.threshold = threshold
+
+    # --------------------------------------------------------
+    # isEnabled
+    # --------------------------------------------------------
+    def isEnabled(self):
+        return self.method != 'none'
+
+    # --------------------------------------------------------
+    # getOutliers
+    # --------------------------------------------------------
+    def getOutliers(self, values):
+        '''Return the sorted indexes of the values flagged as outliers.'''
+        if not self.isEnabled() or len(values) < self.MIN_VALUES:
+            return []
+        if self.method == 'mad':
+            low, high = self._madBand(values)
+        else:
+            low, high = self._iqrBand(values)
+        if low is None:
+            return []
+        return [i for i, value in enumerate(values) if value < low or value > high]
+
+    # --------------------------------------------------------
+    # getStats
+    # --------------------------------------------------------
+    def getStats(self, values, outliers):
+        '''
+        Return the (average, count, stdev) of the values that aren't
+        outliers, truncated to integers as ResultAggregate.getStats does.
+        '''
+        kept = [value for i, value in enumerate(values) if i not in outliers]
+        if not kept:
+            return 0, 0, 0
+        return sum(kept) // len(kept), len(kept), int(stddev(kept))
+
+    # --------------------------------------------------------
+    # _madBand
+    # --------------------------------------------------------
+    def _madBand(self, values):
+        '''
+        Return the (low, high) bounds of the values that are kept, or
+        (None, None) when the values have no spread at all.
+        '''
+        center = self._median(values)
+        deviations = [abs(value - center) for value in values]
+        scale = self._median(deviations) / 0.6745
+        if scale == 0:
+            scale = 1.2533 * sum(deviations) / len(deviations)
+        if scale == 0:
+            return None, None
+        return center - self.threshold * scale, center + self.threshold * scale
+
+    # --------------------------------------------------------
+    # _iqrBand
+    # --------------------------------------------------------
+    def _iqrBand(self, values):
+        ordered = sorted(values)
+        q1 = self._quantile(ordered, 0.25)
+        q3 = self._quantile(ordered, 0.75)
+        spread = q3 - q1
+        if spread == 0:
+            return None, None
+        return q1 - self.threshold * spread, q3 + self.threshold * spread
+
+    # --------------------------------------------------------
+    # _median
+    # --------------------------------------------------------
+    def _median(self, values):
+        return self._quantile(sorted(values), 0.5)
+
+    # --------------------------------------------------------
+    # _quantile
+    # --------------------------------------------------------
+    def _quantile(self, ordered, q):
+        '''Return a quantile of sorted values, interpolating linearly between ranks.'''
+        position = (len(ordered) - 1) * q
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
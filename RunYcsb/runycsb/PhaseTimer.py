@@ -0,0 +1,168 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's fabfile script to time each phase
+of the orchestrator, such as cleaning the dbpath, starting mongod and
+loading, for each cell, and by the CollateResults script to break the
+wall time of a series down by phase.
+'''
+import json
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+class PhaseTimer(object):
+    '''
+    Each timed phase appends one JSON-lines record to the timing file:
+
+      {"cell": "wt1_1-workloada-50000recs-8thrds", "finished": "...", "phase": "clean",
+       "run": "2026-10-19T09:00:00", "secs": 12.5, "sequence": 3, "started": "...", "status": "ok"}
+
+    Phases outside any cell, such as the initial setup, have a null
+    cell.  The status is error when the phase raised an exception.  Run
+    identifies one invocation of the orchestrator, so that a series
+    resumed into the same log directory doesn't count the time between
+    invocations as wall time.
+    '''
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # The JSON-lines file in the series log directory that
+    # receives all phase timing records.
+    TIMING_FILENAME = "RunYcsb-timing.jsonl"
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, timingFile=None, append=None):
+        '''
+        Records are appended to timingFile when it's given, by calling
+        append with the file name and the record's line when that's
+        given, as for a file on another host, and on this host otherwise.
+        '''
+        self.timingFile = timingFile
+        self.append = append
+        self.run = datetime.now().isoformat()
+        self.cell = None
+        self.sequence = None
+
+        # Phase -> [seconds, count] in the order phases were first seen.
+        self.totals = OrderedDict()
+
+        # Run -> [first started, last finished] of its records.
+        self.spans = OrderedDict()
+
+    # --------------------------------------------------------
+    # read
+    # --------------------------------------------------------
+    @classmethod
+    def read(cls, timingFile):
+        '''Return a timer that totals the records of a timing file.'''
+        timer = cls()
+        with open(timingFile, 'r') as f:
+            for line in f:
+                if line.strip():
+                    timer._add(json.loads(line))
+        return timer
+
+    # --------------------------------------------------------
+    # setCell
+    # --------------------------------------------------------
+    def setCell(self, cell, sequence=None):
+        '''Attribute the phases that follow to a cell, or to none.'''
+        self.cell = cell
+        self.sequence = sequence
+
+    # --------------------------------------------------------
+    # phase
+    # --------------------------------------------------------
+    @contextmanager
+    def phase(self, name):
+        '''Time the body of a with statement as a phase of the current cell.'''
+        started = datetime.now()
+        status = 'ok'
+        try:
+            yield
+        except:
+            status = 'error'
+            raise
+        finally:
+            finished = datetime.now()
+            record = OrderedDict([('run', self.run), ('cell', self.cell), ('sequence', self.sequence),
+                                  ('phase', name), ('started', started.isoformat()),
+                                  ('finished', finished.isoformat()),
+                                  ('secs', round(self._secs(finished - started), 3)), ('status', status)])
+            self._add(record)
+            if self.timingFile and self.append:
+                self.append(self.timingFile, json.dumps(record, sort_keys=True))
+            elif self.timingFile:
+                with open(self.timingFile, 'a') as f:
+                    f.write(json.dumps(record, sort_keys=True) + "\n")
+
+    # --------------------------------------------------------
+    # getSummary
+    # --------------------------------------------------------
+    def getSummary(self):
+        '''
+        Return the wall time in seconds and a list of (phase, seconds,
+        count, percent of wall time) sorted by decreasing seconds.  Time
+        that no phase accounts for is reported as phase other.  Wall
+        time is summed over the runs of the orchestrator.
+        '''
+        wall = sum(self._secs(self._parse(last) - self._parse(first)) for first, last in self.spans.values())
+        summary = [(name, secs, count, 100.0 * secs / wall if wall else 0.0)
+                   for name, (secs, count) in self.totals.items()]
+        summary.sort(key=lambda s: -s[1])
+        other = wall - sum(secs for secs, count in self.totals.values())
+        if other > 0:
+            summary.append(('other', other, 0, 100.0 * other / wall))
+        return wall, summary
+
+    # --------------------------------------------------------
+    # getReport
+    # --------------------------------------------------------
+    def getReport(self):
+        '''Return the lines of the wall time breakdown.'''
+        wall, summary = self.getSummary()
+        lines = ['------ phase timing', "Wall time: " + self._duration(wall)]
+        for name, secs, count, percent in summary:
+            line = "Phase " + name + ": " + self._duration(secs) + " (" + "%.1f" % percent + "%"
+            if count:
+                line += ", count " + str(count)
+            lines.append(line + ")")
+        return lines
+
+    # --------------------------------------------------------
+    # _add
+    # --------------------------------------------------------
+    def _add(self, record):
+        totals = self.totals.setdefault(record['phase'], [0.0, 0])
+        totals[0] += record['secs']
+        totals[1] += 1
+        span = self.spans.setdefault(record['run'], [record['started'], record['finished']])
+        span[0] = min(span[0], record['started'])
+        span[1] = max(span[1], record['finished'])
+
+    # --------------------------------------------------------
+    # _secs
+    # --------------------------------------------------------
+    def _secs(self, delta):
+        return delta.days * 86400 + delta.seconds + delta.microseconds / 1000000.0
+
+    # --------------------------------------------------------
+    # _parse
+    # --------------------------------------------------------
+    def _parse(self, isoformat):
+        '''Parse a datetime written by isoformat, which leaves out zero microseconds.'''
+        if '.' in isoformat:
+            return datetime.strptime(isoformat, '%Y-%m-%dT%H:%M:%S.%f')
+        return datetime.strptime(isoformat, '%Y-%m-%dT%H:%M:%S')
+
+    # --------------------------------------------------------
+    # _duration
+    # --------------------------------------------------------
+    def _duration(self, secs):
+        '''Format seconds as h:mm:ss, the way timedelta prints.'''
+        secs = int(round(secs))
+        return "%d:%02d:%02d" % (secs // 3600, secs // 60 % 60, secs % 60)
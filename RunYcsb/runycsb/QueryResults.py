@@ -0,0 +1,181 @@
+'''
+Created on Oct 19, 2026
+
+This script queries the result index that the RunYcsb's CollateResults
+script adds each collated series to when result_index is configured, or
+a snapshot of the shared result repository when result_repository is
+configured and its directory is given instead of an index file.
+It filters the runs of a phase on key components, groups them and
+prints the average, count and stdev of their throughput, optionally
+pivoting one component into columns.
+
+  python QueryResults.py indexfile [-w component=value[,value]...]...
+                         [-g component[,component]...] [-p component]
+                         [--phase load|run] [-n lastseries] [--per core|gb]
+
+For example, wiredTiger against mmapv1 on workloadb with 50M records
+over the last three series:
+
+  python QueryResults.py results.db -w workload=workloadb -w recs=50000000
+                         -g threads -p engine -n 3
+
+Series of the repository are named controller:series after the host
+that collated them.  Rows that compare runs from different hardware are
+marked with *, and --per core or --per gb compares them by throughput
+per core or per GB of memory instead.
+'''
+import os, sys, argparse
+from ResultIndex import ResultIndex
+from ResultRepository import ResultRepository
+
+class QueryResults(object):
+    '''
+    Components are those of ResultIndex.COMPONENTS.  Journal is 1 or 0
+    and variant holds the key components without a column of their own
+    joined by "|", which is empty for plain cells.  Without -g, runs
+    are grouped by every key component that isn't filtered on, as in
+    the collation report.
+    '''
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    DEFAULT_GROUP_BY = ['engine', 'workload', 'journal', 'sync', 'recs', 'ops', 'threads', 'variant']
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, args):
+        '''Parse the command line.'''
+        parser = argparse.ArgumentParser(prog='QueryResults.py',
+                                         description='Query the runs of a RunYcsb result index or repository.')
+        parser.add_argument('indexfile', help='result index file or result repository directory')
+        parser.add_argument('-w', '--where', action='append', default=[], metavar='COMPONENT=VALUE[,VALUE]',
+                            help='keep runs whose component has one of the values')
+        parser.add_argument('-g', '--group-by', metavar='COMPONENT[,COMPONENT]',
+                            help='group runs by these components')
+        parser.add_argument('-p', '--pivot', metavar='COMPONENT',
+                            help='report each value of this component in its own column')
+        parser.add_argument('--phase', choices=['load', 'run'], default='run')
+        parser.add_argument('-n', '--last-series', type=int, default=0, metavar='N',
+                            help='only query the N most recently added series')
+        parser.add_argument('--per', choices=sorted(ResultIndex.PER),
+                            help='normalise throughput by the cores or GB of memory of the hosts')
+        options = parser.parse_args(args)
+
+        self.indexFile = options.indexfile
+        self.phase = options.phase
+        self.lastSeries = options.last_series
+        self.pivot = options.pivot
+        self.per = options.per
+        self.filters = {}
+        for where in options.where:
+            if '=' not in where:
+                parser.error("expected component=value in -w " + where)
+            component, values = where.split('=', 1)
+            self.filters.setdefault(component, []).extend(values.split(','))
+        if options.group_by:
+            self.groupBy = options.group_by.split(',')
+        else:
+            self.groupBy = [c for c in self.DEFAULT_GROUP_BY if c not in self.filters]
+        if self.pivot in self.groupBy:
+            self.groupBy.remove(self.pivot)
+
+    # --------------------------------------------------------
+    # run
+    # --------------------------------------------------------
+    def run(self):
+        '''Run the query, print its results and return the exit status.'''
+        if os.path.isdir(self.indexFile):
+            index = self._loadRepository(self.indexFile)
+        else:
+            index = ResultIndex(self.indexFile)
+        try:
+            groupBy = self.groupBy + ([self.pivot] if self.pivot else [])
+            results = index.query(self.phase, self.filters, groupBy, self.lastSeries, self.per)
+        finally:
+            index.close()
+        if self.pivot:
+            rows, mismatched = self._pivot(results)
+        else:
+            rows = [self.groupBy + ['average', 'count', 'stdev', '']]
+            mismatched = [len(hardware) > 1 for values, avg, cnt, stdev, hardware in results]
+            rows += [map(self._format, values) + [str(avg), str(cnt), str(stdev), self._mark(len(hardware) > 1)]
+                     for values, avg, cnt, stdev, hardware in results]
+        self._printTable(rows)
+        if True in mismatched:
+            print("\n* compares runs from different hardware" + 
+                  ("" if self.per else ", see --per core or --per gb"))
+        return 0
+
+    # --------------------------------------------------------
+    # _loadRepository
+    # --------------------------------------------------------
+    def _loadRepository(self, directory):
+        '''
+        Return an in-memory result index holding a snapshot of the
+        repository, with series added in the order they were collated.
+        '''
+        index = ResultIndex(':memory:')
+        for header, runs in ResultRepository(directory).read():
+            seriesId = index.beginSeries(header['controller'] + ":" + header['series'], header['logpath'],
+                                         header['collated'])
+            for run in runs:
+                index.addRun(seriesId, run['key'], run['host'], run['phase'], run['throughput'],
+                             run['sequence'], run['log'], run.get('hardware'), run.get('cores'),
+                             run.get('mem_bytes'))
+        return index
+
+    # --------------------------------------------------------
+    # _pivot
+    # --------------------------------------------------------
+    def _pivot(self, results):
+        '''
+        Return table rows with a column per pivot value, each cell
+        holding the group's average and, in parentheses, its count, and
+        whether each row compares runs from different hardware.
+        '''
+        pivotValues = sorted(set(values[-1] for values, avg, cnt, stdev, hardware in results))
+        cells = {}
+        rowHardware = {}
+        groups = []
+        for values, avg, cnt, stdev, hardware in results:
+            group = values[:-1]
+            if group not in cells:
+                cells[group] = {}
+                rowHardware[group] = set()
+                groups.append(group)
+            cells[group][values[-1]] = str(avg) + " (" + str(cnt) + ")"
+            rowHardware[group].update(hardware)
+        rows = [self.groupBy + [self.pivot + "=" + self._format(v) for v in pivotValues] + ['']]
+        mismatched = [len(rowHardware[group]) > 1 for group in groups]
+        for group, mismatch in zip(groups, mismatched):
+            rows.append(map(self._format, group) + [cells[group].get(v, "-") for v in pivotValues] + 
+                        [self._mark(mismatch)])
+        return rows, mismatched
+
+    # --------------------------------------------------------
+    # _printTable
+    # --------------------------------------------------------
+    def _printTable(self, rows):
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        for row in rows:
+            print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+    # --------------------------------------------------------
+    # _mark
+    # --------------------------------------------------------
+    def _mark(self, mismatch):
+        return "*" if mismatch else ""
+
+    # --------------------------------------------------------
+    # _format
+    # --------------------------------------------------------
+    def _format(self, value):
+        return "" if value is None else str(value)
+
+# --------------------------------------------------------
+# Main
+# --------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(QueryResults(sys.argv[1:]).run())
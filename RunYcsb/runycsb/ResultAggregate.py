@@ -0,0 +1,99 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to
+accumulate the results of all executions that share a key.
+'''
+import os
+from array import array
+from mystats import stddev
+from LatencyHistogram import LatencyHistogram
+
+class ResultAggregate(object):
+    '''
+    Elements are folded into an aggregate as soon as they are parsed
+    and then discarded, so collation memory grows with the number of
+    keys and not with the number of log files.  Throughputs are kept
+    in typed arrays, which cost a few bytes per run, because the report
+    lists every run's throughput as well as the average and stddev.
+    Each throughput's schedule sequence number is kept alongside it,
+    or -1 for series run before sequence numbers were recorded, so
+    that the ycsb logs of outlying runs can be looked up once they are
+    flagged, as are the names of any profiler output files with the run
+    throughput they were recorded during.
+    Latency histograms are merged per operation type, so percentiles
+    describe all runs of the key together rather than averaging each
+    run's percentiles.
+    '''
+    __slots__ = ('key', 'loadThroughputs', 'runThroughputs', 'loadSequences', 'runSequences',
+                 'runProfiles', 'loadHistograms', 'runHistograms')
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, key):
+        self.key = key
+        self.loadThroughputs = array('l')
+        self.runThroughputs = array('l')
+        self.loadSequences = array('l')
+        self.runSequences = array('l')
+        
+        # (profile file name, run throughput) of each profiled run.
+        self.runProfiles = []
+        
+        # Operation type -> merged LatencyHistogram.
+        self.loadHistograms = {}
+        self.runHistograms = {}
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, element):
+        '''Fold the load and run results of a collated element into this aggregate.'''
+        sequence = int(element.cellMeta.get('sequence', -1))
+        if element.ycsbLoad:
+            self.loadThroughputs.append(element.ycsbLoad.throughput)
+            self.loadSequences.append(sequence)
+            self._mergeHistograms(self.loadHistograms, element.ycsbLoad)
+        if element.ycsbRun:
+            self.runThroughputs.append(element.ycsbRun.throughput)
+            self.runSequences.append(sequence)
+            for profileName in element.getProfileFileNames():
+                self.runProfiles.append((os.path.basename(profileName), element.ycsbRun.throughput))
+            self._mergeHistograms(self.runHistograms, element.ycsbRun)
+
+    # --------------------------------------------------------
+    # _mergeHistograms
+    # --------------------------------------------------------
+    def _mergeHistograms(self, histograms, ycsb):
+        for opType, histogram in ycsb.typeHistograms.items():
+            histograms.setdefault(opType, LatencyHistogram()).merge(histogram)
+
+    # --------------------------------------------------------
+    # getStats
+    # --------------------------------------------------------
+    def getStats(self, throughputs):
+        '''
+        Return the (average, count, stdev) of a throughput array with
+        average and stdev truncated to integers.  All three are zero
+        when the array is empty.
+        '''
+        if not throughputs:
+            return 0, 0, 0
+        return sum(throughputs) // len(throughputs), len(throughputs), int(stddev(throughputs))
+
+    # --------------------------------------------------------
+    # getLatencyStats
+    # --------------------------------------------------------
+    def getLatencyStats(self, histograms, percentiles):
+        '''
+        Return a list of (operation type, count, percentile latencies)
+        from merged histograms, sorted by operation type, where the 
+        latencies are in microseconds in the order of percentiles.
+        '''
+        stats = []
+        for opType in sorted(histograms):
+            histogram = histograms[opType]
+            if histogram.count:
+                stats.append((opType, histogram.count, [histogram.getPercentile(p) for p in percentiles]))
+        return stats
@@ -0,0 +1,221 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to add the
+collated runs of a series to an sqlite result index, and by the
+QueryResults script to filter, group and pivot the runs of every
+series in the index.
+'''
+import sqlite3
+from math import sqrt
+
+class ResultIndex(object):
+    '''
+    Each completed phase of a collated cell is stored as one row of
+    the runs table, with the components of its collation key split
+    into indexed columns.  Key components without a column of their
+    own, such as clients, placement, topology and named axis values,
+    are kept together in the variant column in key order.  Series are
+    numbered in the order they are first added, and collating a series
+    again replaces its runs.  Runs of series with a host inventory also
+    store the hardware, cores and memory of their data bearing hosts,
+    and index files created before those columns existed are given them.
+    '''
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # Columns that queries can filter, group and pivot on.  Series
+    # is the series name, which is stored in the series table.
+    COMPONENTS = ['engine', 'workload', 'journal', 'sync', 'recs', 'ops', 'threads', 'variant', 'host', 'hardware',
+                  'series']
+
+    # Throughput normalisations, by name, as SQL expressions.
+    PER = {'core': "throughput * 1.0 / cores", 'gb': "throughput * 1073741824.0 / mem_bytes"}
+
+    # Key components with a column of their own, by key prefix.
+    KEY_COLUMNS = {'sync=': 'sync', 'recs=': 'recs', 'ops=': 'ops', 'threads=': 'threads'}
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS series (id INTEGER PRIMARY KEY, name TEXT UNIQUE, logpath TEXT, "
+        + "collated TEXT)",
+        "CREATE TABLE IF NOT EXISTS runs (series_id INTEGER, host TEXT, engine TEXT, workload TEXT, "
+        + "journal INTEGER, sync TEXT, recs INTEGER, ops INTEGER, threads INTEGER, variant TEXT, "
+        + "phase TEXT, throughput INTEGER, sequence INTEGER, log TEXT, hardware TEXT, cores INTEGER, "
+        + "mem_bytes INTEGER)",
+        "CREATE INDEX IF NOT EXISTS runs_series ON runs (series_id)",
+        "CREATE INDEX IF NOT EXISTS runs_engine ON runs (engine, workload, recs)",
+        "CREATE INDEX IF NOT EXISTS runs_workload ON runs (workload, recs, threads)",
+        "CREATE INDEX IF NOT EXISTS runs_threads ON runs (threads)",
+        "CREATE INDEX IF NOT EXISTS runs_host ON runs (host)",
+    ]
+
+    # Columns added to the runs table since it was first created.
+    ADDED_COLUMNS = [('hardware', 'TEXT'), ('cores', 'INTEGER'), ('mem_bytes', 'INTEGER')]
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, fileName):
+        '''Open the index file, creating it if it doesn't exist.'''
+        self.fileName = fileName
+        self.connection = sqlite3.connect(fileName)
+        for statement in self.SCHEMA:
+            self.connection.execute(statement)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(runs)")]
+        for column, columnType in self.ADDED_COLUMNS:
+            if column not in columns:
+                self.connection.execute("ALTER TABLE runs ADD COLUMN " + column + " " + columnType)
+        self.connection.commit()
+
+    # --------------------------------------------------------
+    # beginSeries
+    # --------------------------------------------------------
+    def beginSeries(self, name, logpath, collated):
+        '''
+        Start adding the runs of a series, replacing any runs that
+        an earlier collation of it added, and return the series id.
+        '''
+        row = self.connection.execute("SELECT id FROM series WHERE name = ?", (name,)).fetchone()
+        if row:
+            seriesId = row[0]
+            self.connection.execute("DELETE FROM runs WHERE series_id = ?", (seriesId,))
+            self.connection.execute("UPDATE series SET logpath = ?, collated = ? WHERE id = ?",
+                                    (logpath, collated, seriesId))
+        else:
+            seriesId = self.connection.execute("INSERT INTO series (name, logpath, collated) VALUES (?, ?, ?)",
+                                               (name, logpath, collated)).lastrowid
+        return seriesId
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, seriesId, key, element, hostsHardware=None):
+        '''
+        Add the completed phases of a collated element under its key,
+        with the (hardware, cores, memory bytes) of its hosts if known.
+        '''
+        host = element.manifest.get('host') if element.manifest else None
+        sequence = int(element.cellMeta.get('sequence', -1))
+        hardware, cores, memBytes = hostsHardware or (None, None, None)
+        for phase, ycsb in (('load', element.ycsbLoad), ('run', element.ycsbRun)):
+            if ycsb:
+                self.addRun(seriesId, key, host, phase, ycsb.throughput, sequence, element.ycsbLogFileName,
+                            hardware, cores, memBytes)
+
+    # --------------------------------------------------------
+    # addRun
+    # --------------------------------------------------------
+    def addRun(self, seriesId, key, host, phase, throughput, sequence, log, hardware=None, cores=None,
+               memBytes=None):
+        '''Add the throughput of one phase of a run under its key.'''
+        columns = self.parseKey(key)
+        self.connection.execute(
+            "INSERT INTO runs (series_id, host, engine, workload, journal, sync, recs, ops, threads, variant, "
+            + "phase, throughput, sequence, log, hardware, cores, mem_bytes) "
+            + "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (seriesId, host, columns['engine'], columns['workload'], columns['journal'],
+             columns['sync'], columns['recs'], columns['ops'], columns['threads'],
+             columns['variant'], phase, throughput, sequence, log, hardware, cores, memBytes))
+
+    # --------------------------------------------------------
+    # commit
+    # --------------------------------------------------------
+    def commit(self):
+        self.connection.commit()
+
+    # --------------------------------------------------------
+    # close
+    # --------------------------------------------------------
+    def close(self):
+        self.connection.close()
+
+    # --------------------------------------------------------
+    # parseKey
+    # --------------------------------------------------------
+    def parseKey(self, key):
+        '''Split a collation key into a dictionary of column values.'''
+        parts = key.split('|')
+        columns = {'engine': parts[0], 'workload': parts[1], 'journal': 1, 'sync': None,
+                   'recs': None, 'ops': None, 'threads': None, 'variant': ''}
+        variant = []
+        for part in parts[2:]:
+            prefix = part[:part.find('=') + 1]
+            if part == 'nojournal':
+                columns['journal'] = 0
+            elif prefix in self.KEY_COLUMNS:
+                value = part[len(prefix):]
+                columns[self.KEY_COLUMNS[prefix]] = value if prefix == 'sync=' else int(value)
+            else:
+                variant.append(part)
+        columns['variant'] = '|'.join(variant)
+        return columns
+
+    # --------------------------------------------------------
+    # query
+    # --------------------------------------------------------
+    def query(self, phase, filters, groupBy, lastSeries=0, per=None):
+        '''
+        Return the (group values, average, count, stdev, hardware) of
+        the runs of a phase, grouped by a list of components and sorted
+        by them, where hardware is the sorted list of the hardware the
+        group's runs ran on.  Filters map components to lists of
+        accepted values and lastSeries, when positive, limits the runs
+        to those of the most recently added series.  Per, one of PER,
+        normalises throughput by the cores or GB of memory of each run's
+        hosts and leaves out runs without them.  Averages and stdevs are
+        truncated to integers as in the collation report.
+        '''
+        for component in list(filters) + list(groupBy):
+            if component not in self.COMPONENTS:
+                msg = "Unknown result component " + component + ", expected one of " + \
+                      ", ".join(self.COMPONENTS) + "."
+                raise Exception(msg)
+        if per and per not in self.PER:
+            msg = "Unknown throughput normalisation " + per + ", expected one of " + \
+                  ", ".join(sorted(self.PER)) + "."
+            raise Exception(msg)
+        value = "(" + self.PER[per] + ")" if per else "throughput"
+        columns = [self._column(c) for c in groupBy]
+        sql = "SELECT " + "".join(c + ", " for c in columns) + \
+              "runs.hardware, COUNT(*), SUM(" + value + "), SUM(" + value + " * " + value + ") " + \
+              "FROM runs JOIN series ON runs.series_id = series.id WHERE phase = ?"
+        parms = [phase]
+        if per:
+            sql += " AND cores > 0 AND mem_bytes > 0"
+        for component, values in filters.items():
+            sql += " AND " + self._column(component) + " IN (" + ", ".join("?" * len(values)) + ")"
+            parms += values
+        if lastSeries > 0:
+            sql += " AND series.id IN (SELECT id FROM series ORDER BY id DESC LIMIT ?)"
+            parms.append(lastSeries)
+        
+        # Each group is split by hardware, whose descriptions contain the
+        # separator of GROUP_CONCAT, and its sums are merged back here.
+        columns.append('runs.hardware')
+        sql += " GROUP BY " + ", ".join(columns) + " ORDER BY " + ", ".join(columns)
+        groups = []
+        for row in self.connection.execute(sql, parms):
+            values, hardware, count, total, squares = tuple(row[:-4]), row[-4], row[-3], row[-2], row[-1]
+            if not groups or groups[-1][0] != values:
+                groups.append((values, [], [0, 0, 0]))
+            if hardware:
+                groups[-1][1].append(hardware)
+            sums = groups[-1][2]
+            sums[0] += count
+            sums[1] += total
+            sums[2] += squares
+        results = []
+        for values, hardware, (count, total, squares) in groups:
+            avg = float(total) / count
+            variance = (squares - count * avg * avg) / (count - 1) if count > 1 else 0
+            results.append((values, int(avg), count, int(sqrt(max(variance, 0))), sorted(hardware)))
+        return results
+
+    # --------------------------------------------------------
+    # _column
+    # --------------------------------------------------------
+    def _column(self, component):
+        if component == 'series':
+            return 'series.name'
+        return 'runs.' + component
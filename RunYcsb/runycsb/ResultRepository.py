@@ -0,0 +1,308 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to add the
+collated runs of a series to a result repository on local disk that
+many collators, on one host or on hosts sharing the directory, can
+write to at the same time, and by the QueryResults script to read a
+consistent snapshot of every series in it.
+'''
+import os, json, socket, fcntl, errno, tempfile
+from collections import OrderedDict
+
+class ResultRepository(object):
+    '''
+    The repository is a directory of JSON-lines files that are never
+    changed once written:
+
+      segments/<controller>-<pid>-<collated>-<random>.jsonl
+                   one per collation, written to a temporary file and
+                   renamed into place when complete, so that readers
+                   never see part of one and writers never contend
+      index-<generation>.jsonl
+                   the compacted contents of earlier segments
+      CURRENT      names the current index, and is replaced by renaming
+
+    Each segment starts with a series record that identifies the
+    controller host that collated it and the series, followed by a run
+    record per completed phase that carries the benchmark host and, for
+    series with a host inventory, the hardware of its data bearing hosts:
+
+      {"type": "series", "controller": "ctl1", "series": "s1", "logpath": "...", "collated": "..."}
+      {"type": "run", "key": "wt|workloada|...", "host": "bench1", "phase": "run", "throughput": 41234,
+       "sequence": 3, "log": "ycsb-...", "hardware": "...", "cores": 8, "mem_bytes": 33541967872}
+
+    Collating a series again writes a new segment, and only the latest
+    series of each controller and series name is live, so reading a
+    series twice does no harm.  Compaction folds the live series into a
+    new index once COMPACT_SEGMENTS segments have accumulated, replaces
+    CURRENT and then removes the segments it folded in.  It holds an
+    exclusive lock so that only one collator compacts at a time; writers
+    and readers never wait for it.  Readers take no locks: they read
+    CURRENT, its index and every segment, and start over if CURRENT was
+    replaced or a file removed in the meantime.
+    '''
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    CURRENT_FILENAME = "CURRENT"
+    LOCK_FILENAME = "compact.lock"
+    SEGMENT_DIR = "segments"
+    SEGMENT_EXTENSION = ".jsonl"
+
+    # Segments written since the last compaction that trigger the next.
+    COMPACT_SEGMENTS = 16
+
+    # Times a reader starts over before giving up.
+    READ_ATTEMPTS = 10
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, directory):
+        '''Open the repository directory, creating it if it doesn't exist.'''
+        self.directory = directory
+        self.segmentFile = None
+        self.segmentName = None
+        self.segmentTempName = None
+        self.segmentHeader = None
+        segmentDir = os.path.join(directory, self.SEGMENT_DIR)
+        try:
+            os.makedirs(segmentDir)
+        except OSError as e:
+            if e.errno != errno.EEXIST or not os.path.isdir(segmentDir):
+                raise
+
+    # --------------------------------------------------------
+    # beginSeries
+    # --------------------------------------------------------
+    def beginSeries(self, name, logpath, collated):
+        '''
+        Start the segment of a collated series and return its name,
+        which stands in for the series id of ResultIndex.
+        '''
+        controller = socket.gethostname()
+        self.segmentName = "-".join([self._safe(controller), str(os.getpid()), self._safe(collated),
+                                     os.urandom(4).encode('hex')]) + self.SEGMENT_EXTENSION
+        fd, self.segmentTempName = tempfile.mkstemp(prefix='.', suffix='.tmp',
+                                                    dir=os.path.join(self.directory, self.SEGMENT_DIR))
+        self.segmentFile = os.fdopen(fd, 'w')
+        self.segmentHeader = OrderedDict([('type', 'series'), ('controller', controller), ('series', name),
+                                          ('logpath', logpath), ('collated', collated)])
+        self._write(self.segmentHeader)
+        return self.segmentName
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, segmentName, key, element, hostsHardware=None):
+        '''
+        Add the completed phases of a collated element under its key,
+        with the (hardware, cores, memory bytes) of its hosts if known.
+        '''
+        host = element.manifest.get('host') if element.manifest else None
+        sequence = int(element.cellMeta.get('sequence', -1))
+        logName = os.path.basename(element.ycsbLogFileName)
+        hardware, cores, memBytes = hostsHardware or (None, None, None)
+        for phase, ycsb in (('load', element.ycsbLoad), ('run', element.ycsbRun)):
+            if ycsb:
+                self._write(OrderedDict([('type', 'run'), ('key', key), ('host', host), ('phase', phase),
+                                         ('throughput', ycsb.throughput), ('sequence', sequence),
+                                         ('log', logName), ('hardware', hardware), ('cores', cores),
+                                         ('mem_bytes', memBytes)]))
+
+    # --------------------------------------------------------
+    # commit
+    # --------------------------------------------------------
+    def commit(self):
+        '''
+        Make the segment visible to readers, then compact if enough
+        segments have accumulated and no other collator is compacting.
+        '''
+        if not self.segmentFile:
+            return
+        self.segmentFile.flush()
+        os.fsync(self.segmentFile.fileno())
+        self.segmentFile.close()
+        self.segmentFile = None
+        os.rename(self.segmentTempName, os.path.join(self.directory, self.SEGMENT_DIR, self.segmentName))
+        if len(self._listSegments()) >= self.COMPACT_SEGMENTS:
+            self.compact(False)
+
+    # --------------------------------------------------------
+    # close
+    # --------------------------------------------------------
+    def close(self):
+        '''Discard a segment that wasn't committed.'''
+        if self.segmentFile:
+            self.segmentFile.close()
+            self.segmentFile = None
+            os.remove(self.segmentTempName)
+
+    # --------------------------------------------------------
+    # compact
+    # --------------------------------------------------------
+    def compact(self, wait=True):
+        '''
+        Fold the live series of the current index and the segments into
+        a new index generation and remove the files it replaces.  When
+        wait is False, return False at once if another collator holds
+        the compaction lock.
+        '''
+        with open(os.path.join(self.directory, self.LOCK_FILENAME), 'a') as lock:
+            try:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+            except IOError as e:
+                if e.errno in (errno.EAGAIN, errno.EACCES):
+                    return False
+                raise
+            try:
+                current, series, segments = self._readSnapshot()
+                generation = current['generation'] + 1
+                indexName = "index-%06d" % generation + self.SEGMENT_EXTENSION
+                fd, tempName = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=self.directory)
+                with os.fdopen(fd, 'w') as f:
+                    for header, runs in series:
+                        for record in [header] + runs:
+                            f.write(json.dumps(record) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.rename(tempName, os.path.join(self.directory, indexName))
+                self._replaceCurrent(OrderedDict([('generation', generation), ('index', indexName)]))
+
+                # Only the segments that were folded in are removed, since
+                # others may have been committed since.
+                for name in segments:
+                    self._remove(os.path.join(self.directory, self.SEGMENT_DIR, name))
+                if current['index']:
+                    self._remove(os.path.join(self.directory, current['index']))
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        return True
+
+    # --------------------------------------------------------
+    # read
+    # --------------------------------------------------------
+    def read(self):
+        '''
+        Return a consistent snapshot of the live series as a list of
+        (series record, list of run records), ordered by collation time.
+        '''
+        current, series, segments = self._readSnapshot()
+        return series
+
+    # --------------------------------------------------------
+    # _readSnapshot
+    # --------------------------------------------------------
+    def _readSnapshot(self):
+        '''
+        Return the CURRENT record the snapshot was read against, the
+        live series and the names of the segments read, starting over
+        whenever a compaction interferes.
+        '''
+        for attempt in range(self.READ_ATTEMPTS):
+            current = self._readCurrent()
+            try:
+                live = OrderedDict()
+                if current['index']:
+                    self._readSeries(os.path.join(self.directory, current['index']), live)
+                segments = sorted(self._listSegments())
+                for name in segments:
+                    self._readSeries(os.path.join(self.directory, self.SEGMENT_DIR, name), live)
+            except IOError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+                continue
+            if self._readCurrent() == current:
+                return current, sorted(live.values(), key=lambda s: s[0]['collated']), segments
+        msg = "No consistent snapshot of result repository " + self.directory + " after " + \
+              str(self.READ_ATTEMPTS) + " attempts."
+        raise Exception(msg)
+
+    # --------------------------------------------------------
+    # _readSeries
+    # --------------------------------------------------------
+    def _readSeries(self, fileName, live):
+        '''
+        Read the series of an index or segment file into live, which
+        maps (controller, series) to the latest (series record, runs).
+        '''
+        header = None
+        runs = []
+        with open(fileName, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line, object_pairs_hook=OrderedDict)
+                if record['type'] == 'series':
+                    self._keepLatest(live, header, runs)
+                    header = record
+                    runs = []
+                else:
+                    runs.append(record)
+        self._keepLatest(live, header, runs)
+
+    # --------------------------------------------------------
+    # _keepLatest
+    # --------------------------------------------------------
+    def _keepLatest(self, live, header, runs):
+        if header is None:
+            return
+        identity = (header['controller'], header['series'])
+        if identity not in live or live[identity][0]['collated'] <= header['collated']:
+            live[identity] = (header, runs)
+
+    # --------------------------------------------------------
+    # _readCurrent
+    # --------------------------------------------------------
+    def _readCurrent(self):
+        try:
+            with open(os.path.join(self.directory, self.CURRENT_FILENAME), 'r') as f:
+                return json.load(f, object_pairs_hook=OrderedDict)
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return OrderedDict([('generation', 0), ('index', None)])
+
+    # --------------------------------------------------------
+    # _replaceCurrent
+    # --------------------------------------------------------
+    def _replaceCurrent(self, current):
+        fd, tempName = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=self.directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(current, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tempName, os.path.join(self.directory, self.CURRENT_FILENAME))
+
+    # --------------------------------------------------------
+    # _listSegments
+    # --------------------------------------------------------
+    def _listSegments(self):
+        '''Return the names of the committed segments, leaving out temporary files.'''
+        return [name for name in os.listdir(os.path.join(self.directory, self.SEGMENT_DIR))
+                if name.endswith(self.SEGMENT_EXTENSION) and not name.startswith('.')]
+
+    # --------------------------------------------------------
+    # _write
+    # --------------------------------------------------------
+    def _write(self, record):
+        self.segmentFile.write(json.dumps(record) + "\n")
+
+    # --------------------------------------------------------
+    # _remove
+    # --------------------------------------------------------
+    def _remove(self, fileName):
+        try:
+            os.remove(fileName)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+
+    # --------------------------------------------------------
+    # _safe
+    # --------------------------------------------------------
+    def _safe(self, text):
+        '''Reduce text to characters that are safe in a file name.'''
+        return "".join(c if c.isalnum() or c in '._' else '_' for c in text)
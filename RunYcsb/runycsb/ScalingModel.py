@@ -0,0 +1,223 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to fit a
+model of run throughput against record count for each engine, parms
+and workload combination, detect the record count at which the data
+outgrows memory and predict throughput at record counts that weren't
+run, so that small sweeps can screen configurations before they are
+run at production scale.
+'''
+import math
+from array import array
+from collections import OrderedDict
+
+class ScalingModel(object):
+    '''
+    Results are grouped by everything in their collation key except the
+    record and operation counts.  Within a group every run is a point
+    (log2 of its record count, its run throughput), and two models are
+    fitted to the points by least squares:
+
+      linear   throughput = a + b * log2(recs)
+      hinge    throughput = a + b * log2(recs) + c * max(0, log2(recs / knee))
+
+    In groups of at least MIN_KNEE_SIZES record counts, the hinge model
+    is tried with the knee at each measured record count but the first
+    and the last, and the best fit is kept when throughput falls faster
+    beyond its knee and its BIC is lower than the linear model's.  That
+    knee is where the data outgrew the cache, since reads start going to
+    disk from there on.  Predictions come with 95% prediction intervals,
+    which widen as they extrapolate further.
+    '''
+    __slots__ = ('predictRecordCounts', 'groups')
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # Key components that vary within a group.
+    SIZE_COMPONENTS = ('recs=', 'ops=')
+
+    # Groups need this many distinct record counts to be fitted, and this
+    # many for the hinge model not to pass through every record count.
+    MIN_SIZES = 3
+    MIN_KNEE_SIZES = 4
+
+    # Two-sided 95% quantiles of Student's t distribution by degrees of
+    # freedom, beyond which the normal quantile is close enough.
+    T_QUANTILES = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                   2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                   2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+    NORMAL_QUANTILE = 1.96
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, predictRecordCounts):
+        self.predictRecordCounts = predictRecordCounts
+
+        # group -> record count -> (array of run throughputs, array of load dbpath bytes).
+        self.groups = {}
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, key, element):
+        '''Fold the run throughput of a collated element into its group.'''
+        if not element.ycsbRun:
+            return
+        group = self.getGroup(key)
+        recs = element.ycsbRun.recordCount
+        sizes = self.groups.setdefault(group, {})
+        if recs not in sizes:
+            sizes[recs] = (array('d'), array('d'))
+        throughputs, dbpathBytes = sizes[recs]
+        throughputs.append(element.ycsbRun.throughput)
+        if 'load_dbpath_bytes' in element.cellMeta:
+            dbpathBytes.append(float(element.cellMeta['load_dbpath_bytes']))
+
+    # --------------------------------------------------------
+    # getGroup
+    # --------------------------------------------------------
+    def getGroup(self, key):
+        '''Remove the record and operation counts from a key.'''
+        return '|'.join(part for part in key.split('|') if not part.startswith(self.SIZE_COMPONENTS))
+
+    # --------------------------------------------------------
+    # getGroups
+    # --------------------------------------------------------
+    def getGroups(self):
+        '''Return the sorted groups with enough record counts to fit.'''
+        return sorted(g for g, sizes in self.groups.items() if len(sizes) >= self.MIN_SIZES)
+
+    # --------------------------------------------------------
+    # getModel
+    # --------------------------------------------------------
+    def getModel(self, group):
+        '''
+        Return the fitted model of a group as an OrderedDict with
+        these entries, or None when the points can't be fitted:
+
+          sizes         sorted record counts that were run
+          runs          number of points
+          coefficients  (a, b) or (a, b, c) of the chosen model
+          knee          record count of the knee, or None for the linear model
+          knee_bytes    average dbpath bytes after loading at the knee, or None
+          r2            coefficient of determination
+          rse_pct       residual standard error relative to the mean throughput
+          predictions   list of (record count, throughput, low, high), where
+                        the bounds are None without residual degrees of freedom
+        '''
+        sizes = self.groups.get(group, {})
+        points = [(math.log(recs, 2), throughput) for recs in sorted(sizes) for throughput in sizes[recs][0]]
+        fit = self._fit(points, None)
+        if fit is None:
+            return None
+        knee = None
+        recordCounts = sorted(sizes)
+        if len(recordCounts) >= self.MIN_KNEE_SIZES:
+            for recs in recordCounts[1:-1]:
+                hinge = self._fit(points, math.log(recs, 2))
+                if hinge and hinge['coefficients'][2] < 0 and hinge['bic'] < fit['bic']:
+                    fit = hinge
+                    knee = recs
+
+        model = OrderedDict()
+        model['sizes'] = recordCounts
+        model['runs'] = len(points)
+        model['coefficients'] = fit['coefficients']
+        model['knee'] = knee
+        model['knee_bytes'] = None
+        if knee and sizes[knee][1]:
+            model['knee_bytes'] = sum(sizes[knee][1]) / len(sizes[knee][1])
+        ys = [y for x, y in points]
+        meanY = sum(ys) / len(ys)
+        total = sum((y - meanY) ** 2 for y in ys)
+        model['r2'] = 1 - fit['sse'] / total if total > 0 else 1.0
+        df = len(points) - len(fit['coefficients'])
+        rse = math.sqrt(fit['sse'] / df) if df > 0 else None
+        model['rse_pct'] = 100.0 * rse / meanY if rse is not None and meanY > 0 else None
+        model['predictions'] = []
+        for recs in self.predictRecordCounts:
+            row = self._row(math.log(recs, 2), fit['knee'])
+            value = self._dot(row, fit['coefficients'])
+            low = high = None
+            if rse is not None:
+                spread = self._tQuantile(df) * rse * math.sqrt(1 + self._dot(row, self._multiply(fit['inverse'], row)))
+                low = max(value - spread, 0.0)
+                high = value + spread
+            model['predictions'].append((recs, max(value, 0.0), low, high))
+        return model
+
+    # --------------------------------------------------------
+    # _fit
+    # --------------------------------------------------------
+    def _fit(self, points, knee):
+        '''
+        Fit the linear model, or the hinge model when a knee (in log2
+        record count) is given, and return a dictionary of its
+        coefficients, the inverse of X'X, the residual sum of squares
+        and the BIC.  None is returned when the fit is singular.
+        '''
+        rows = [self._row(x, knee) for x, y in points]
+        p = len(rows[0])
+        xtx = [[sum(r[i] * r[j] for r in rows) for j in range(p)] for i in range(p)]
+        inverse = self._invert(xtx)
+        if inverse is None:
+            return None
+        xty = [sum(r[i] * y for r, (x, y) in zip(rows, points)) for i in range(p)]
+        coefficients = tuple(self._multiply(inverse, xty))
+        sse = sum((y - self._dot(r, coefficients)) ** 2 for r, (x, y) in zip(rows, points))
+        n = len(points)
+
+        # A perfect fit would make the log of the sse undefined.
+        bic = n * math.log(max(sse, 1e-9) / n) + (p + (1 if knee is not None else 0)) * math.log(n)
+        return {'coefficients': coefficients, 'inverse': inverse, 'sse': sse, 'bic': bic, 'knee': knee}
+
+    # --------------------------------------------------------
+    # _row
+    # --------------------------------------------------------
+    def _row(self, x, knee):
+        if knee is None:
+            return [1.0, x]
+        return [1.0, x, max(0.0, x - knee)]
+
+    # --------------------------------------------------------
+    # _invert
+    # --------------------------------------------------------
+    def _invert(self, matrix):
+        '''Invert a small square matrix by Gauss-Jordan elimination, or return None if it's singular.'''
+        n = len(matrix)
+        work = [list(row) + [1.0 if i == j else 0.0 for j in range(n)] for i, row in enumerate(matrix)]
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(work[r][col]))
+            if abs(work[pivot][col]) < 1e-12:
+                return None
+            work[col], work[pivot] = work[pivot], work[col]
+            scale = work[col][col]
+            work[col] = [v / scale for v in work[col]]
+            for r in range(n):
+                if r != col and work[r][col]:
+                    factor = work[r][col]
+                    work[r] = [v - factor * w for v, w in zip(work[r], work[col])]
+        return [row[n:] for row in work]
+
+    # --------------------------------------------------------
+    # _multiply
+    # --------------------------------------------------------
+    def _multiply(self, matrix, vector):
+        return [self._dot(row, vector) for row in matrix]
+
+    # --------------------------------------------------------
+    # _dot
+    # --------------------------------------------------------
+    def _dot(self, a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    # --------------------------------------------------------
+    # _tQuantile
+    # --------------------------------------------------------
+    def _tQuantile(self, df):
+        if df <= len(self.T_QUANTILES):
+            return self.T_QUANTILES[df - 1]
+        return self.NORMAL_QUANTILE
@@ -0,0 +1,285 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to write
+a self-contained HTML report that shows how throughput and latency
+scale with record count and thread count.
+'''
+import math, cgi
+
+class ScalingReport(object):
+    '''
+    Results are grouped by everything in their collation key except
+    the record, operation and thread counts, so each group holds one
+    engine/parms/workload combination.  Within a group, values are
+    folded into running sums per (record count, thread count) point
+    as elements are added, so no element is retained.
+    '''
+    __slots__ = ('groups',)
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    HTML_FILENAME = "RunYcsb-scaling.html"
+
+    # Key components that vary within a scaling group.
+    SCALING_COMPONENTS = ('recs=', 'ops=', 'threads=')
+
+    # Chart geometry and series colours.
+    CHART_WIDTH = 520
+    CHART_HEIGHT = 300
+    MARGIN_LEFT = 70
+    MARGIN_RIGHT = 150
+    MARGIN_TOP = 30
+    MARGIN_BOTTOM = 45
+    COLORS = ['#1f77b4', '#d62728', '#2ca02c', '#ff7f0e', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f']
+
+    # Indexes into the running sums kept for each point.
+    LOAD_SUM, LOAD_CNT, RUN_SUM, RUN_CNT, LAT_SUM, LAT_CNT = range(6)
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self):
+        # group -> {(recordCount, threadCount): running sums}
+        self.groups = {}
+
+    # --------------------------------------------------------
+    # addElement
+    # --------------------------------------------------------
+    def addElement(self, key, element):
+        '''
+        Fold a collated element into the point for its record and
+        thread counts within its group.
+        '''
+        if not element.ycsbLoad:
+            return
+        group = self.getGroup(key)
+        point = (element.ycsbLoad.recordCount, element.ycsbLoad.threadCount)
+        sums = self.groups.setdefault(group, {}).setdefault(point, [0, 0, 0, 0, 0.0, 0])
+        sums[self.LOAD_SUM] += element.ycsbLoad.throughput
+        sums[self.LOAD_CNT] += 1
+        if element.ycsbRun:
+            sums[self.RUN_SUM] += element.ycsbRun.throughput
+            sums[self.RUN_CNT] += 1
+            latency = element.ycsbRun.getAverageLatency()
+            if latency is not None:
+                sums[self.LAT_SUM] += latency
+                sums[self.LAT_CNT] += 1
+
+    # --------------------------------------------------------
+    # getGroup
+    # --------------------------------------------------------
+    def getGroup(self, key):
+        '''Remove the record, operation and thread counts from a key.'''
+        parts = [part for part in key.split('|') if not part.startswith(self.SCALING_COMPONENTS)]
+        return '|'.join(parts)
+
+    # --------------------------------------------------------
+    # getPoints
+    # --------------------------------------------------------
+    def getPoints(self, group):
+        '''
+        Return the averaged points of a group sorted by thread count
+        and record count.  Each point is a dictionary with recs,
+        threads, load, run and latency values; averages without any
+        contributing value are None.
+        '''
+        points = []
+        for (recs, threads), sums in self.groups[group].items():
+            points.append({
+                'recs': recs,
+                'threads': threads,
+                'load': self._avg(sums[self.LOAD_SUM], sums[self.LOAD_CNT]),
+                'run': self._avg(sums[self.RUN_SUM], sums[self.RUN_CNT]),
+                'latency': self._avg(sums[self.LAT_SUM], sums[self.LAT_CNT]),
+            })
+        points.sort(key=lambda p: (p['threads'], p['recs']))
+        return points
+
+    # --------------------------------------------------------
+    # getEfficiencies
+    # --------------------------------------------------------
+    def getEfficiencies(self, points, metric='run'):
+        '''
+        Compute the scaling efficiency between adjacent points.  Along
+        the record count axis (at a fixed thread count) efficiency is
+        the fraction of throughput retained per doubling of the data:
+        (t2/t1) ** (1 / log2(r2/r1)).  Along the thread count axis (at
+        a fixed record count) it is the speedup relative to linear:
+        (t2/t1) / (n2/n1).  A list of (axis, fromPoint, toPoint,
+        efficiency) tuples is returned.
+        '''
+        results = []
+        for axis, fixed in (('recs', 'threads'), ('threads', 'recs')):
+            series = self._series(points, fixed, axis, metric)
+            for fixedValue in sorted(series.keys()):
+                line = series[fixedValue]
+                for i in range(1, len(line)):
+                    x1, t1, p1 = line[i-1]
+                    x2, t2, p2 = line[i]
+                    if t1 <= 0 or x1 <= 0 or x2 <= x1:
+                        continue
+                    if axis == 'recs':
+                        eff = (float(t2) / t1) ** (1.0 / math.log(float(x2) / x1, 2))
+                    else:
+                        eff = (float(t2) / t1) / (float(x2) / x1)
+                    results.append((axis, p1, p2, eff))
+        return results
+
+    # --------------------------------------------------------
+    # write
+    # --------------------------------------------------------
+    def write(self, filename):
+        '''Write the HTML report to filename.'''
+        with open(filename, 'w') as f:
+            f.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>RunYcsb scaling report</title>\n')
+            f.write('<style>body{font-family:sans-serif} table{border-collapse:collapse;margin:8px 0}' +
+                    'td,th{border:1px solid #ccc;padding:2px 8px;text-align:right} svg{margin:4px}</style>\n')
+            f.write('</head><body>\n<h1>RunYcsb scaling report</h1>\n')
+            for group in sorted(self.groups.keys()):
+                f.write(self._groupHtml(group))
+            f.write('</body></html>\n')
+
+    # --------------------------------------------------------
+    # _groupHtml
+    # --------------------------------------------------------
+    def _groupHtml(self, group):
+        '''Return the charts and tables of one group.'''
+        points = self.getPoints(group)
+        html = ['<h2>' + cgi.escape(group) + '</h2>\n']
+
+        # Charts are only drawn along axes that have more than one value.
+        for axis, fixed, label, logX in (('recs', 'threads', 'record count', True),
+                                         ('threads', 'recs', 'thread count', False)):
+            if len(set(p[axis] for p in points)) < 2:
+                continue
+            for metric, yLabel in (('run', 'run ops/sec'), ('load', 'load ops/sec'),
+                                   ('latency', 'run avg latency (us)')):
+                series = self._series(points, fixed, axis, metric)
+                if series:
+                    legend = dict((v, fixed + '=' + str(v)) for v in series.keys())
+                    html.append(self._chart(yLabel + ' vs ' + label, label, yLabel, series, legend, logX))
+
+        # Point table.
+        html.append('<table><tr><th>recs</th><th>threads</th><th>load ops/sec</th>' +
+                    '<th>run ops/sec</th><th>run avg latency (us)</th></tr>\n')
+        for p in points:
+            html.append('<tr><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s</td></tr>\n' %
+                        (p['recs'], p['threads'], self._fmt(p['load']), self._fmt(p['run']),
+                         self._fmt(p['latency'])))
+        html.append('</table>\n')
+
+        # Efficiency table.
+        efficiencies = self.getEfficiencies(points)
+        if efficiencies:
+            html.append('<table><tr><th>axis</th><th>from</th><th>to</th><th>run efficiency</th></tr>\n')
+            for axis, p1, p2, eff in efficiencies:
+                what = 'retained per doubling' if axis == 'recs' else 'of linear speedup'
+                html.append('<tr><td>%s</td><td>%s</td><td>%s</td><td>%.1f%% %s</td></tr>\n' %
+                            (axis, self._pointLabel(p1), self._pointLabel(p2), eff * 100, what))
+            html.append('</table>\n')
+        return ''.join(html)
+
+    # --------------------------------------------------------
+    # _chart
+    # --------------------------------------------------------
+    def _chart(self, title, xLabel, yLabel, series, legend, logX):
+        '''
+        Return an inline SVG line chart.  Series maps a legend value
+        to a list of (x, y, point) tuples sorted by x.
+        '''
+        xs = sorted(set(x for line in series.values() for x, y, p in line))
+        yMax = max(y for line in series.values() for x, y, p in line) or 1
+        plotW = self.CHART_WIDTH - self.MARGIN_LEFT - self.MARGIN_RIGHT
+        plotH = self.CHART_HEIGHT - self.MARGIN_TOP - self.MARGIN_BOTTOM
+
+        # Record counts are plotted on a log2 scale so that each
+        # doubling of the data is the same distance apart.
+        scale = (lambda v: math.log(v, 2)) if logX and xs[0] > 0 else float
+        xLo, xHi = scale(xs[0]), scale(xs[-1])
+        def px(x):
+            if xHi == xLo:
+                return self.MARGIN_LEFT + plotW / 2.0
+            return self.MARGIN_LEFT + plotW * (scale(x) - xLo) / (xHi - xLo)
+        def py(y):
+            return self.MARGIN_TOP + plotH * (1 - float(y) / yMax)
+
+        svg = ['<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d">' %
+               (self.CHART_WIDTH, self.CHART_HEIGHT)]
+        svg.append('<text x="%d" y="18" font-size="13">%s</text>' % (self.MARGIN_LEFT, cgi.escape(title)))
+
+        # Axes, ticks and labels.
+        bottom = self.MARGIN_TOP + plotH
+        svg.append('<line x1="%d" y1="%d" x2="%d" y2="%d" stroke="#000"/>' %
+                   (self.MARGIN_LEFT, bottom, self.MARGIN_LEFT + plotW, bottom))
+        svg.append('<line x1="%d" y1="%d" x2="%d" y2="%d" stroke="#000"/>' %
+                   (self.MARGIN_LEFT, self.MARGIN_TOP, self.MARGIN_LEFT, bottom))
+        for x in xs:
+            svg.append('<text x="%.1f" y="%d" font-size="10" text-anchor="middle">%s</text>' %
+                       (px(x), bottom + 14, self._short(x)))
+        for i in range(5):
+            y = yMax * i / 4.0
+            svg.append('<text x="%d" y="%.1f" font-size="10" text-anchor="end">%s</text>' %
+                       (self.MARGIN_LEFT - 4, py(y) + 3, self._short(y)))
+            svg.append('<line x1="%d" y1="%.1f" x2="%d" y2="%.1f" stroke="#eee"/>' %
+                       (self.MARGIN_LEFT + 1, py(y), self.MARGIN_LEFT + plotW, py(y)))
+        svg.append('<text x="%.1f" y="%d" font-size="11" text-anchor="middle">%s</text>' %
+                   (self.MARGIN_LEFT + plotW / 2.0, self.CHART_HEIGHT - 8, cgi.escape(xLabel)))
+        svg.append('<text x="12" y="%.1f" font-size="11" text-anchor="middle" transform="rotate(-90 12 %.1f)">%s</text>' %
+                   (self.MARGIN_TOP + plotH / 2.0, self.MARGIN_TOP + plotH / 2.0, cgi.escape(yLabel)))
+
+        # One polyline with point markers per series plus a legend entry.
+        for i, value in enumerate(sorted(series.keys())):
+            color = self.COLORS[i % len(self.COLORS)]
+            coords = ' '.join('%.1f,%.1f' % (px(x), py(y)) for x, y, p in series[value])
+            svg.append('<polyline fill="none" stroke="%s" stroke-width="2" points="%s"/>' % (color, coords))
+            for x, y, p in series[value]:
+                svg.append('<circle cx="%.1f" cy="%.1f" r="3" fill="%s"><title>%s: %s</title></circle>' %
+                           (px(x), py(y), color, self._pointLabel(p), self._fmt(y)))
+            ly = self.MARGIN_TOP + 14 * i
+            svg.append('<rect x="%d" y="%d" width="10" height="10" fill="%s"/>' %
+                       (self.MARGIN_LEFT + plotW + 12, ly, color))
+            svg.append('<text x="%d" y="%d" font-size="11">%s</text>' %
+                       (self.MARGIN_LEFT + plotW + 26, ly + 9, cgi.escape(legend[value])))
+        svg.append('</svg>\n')
+        return ''.join(svg)
+
+    # --------------------------------------------------------
+    # _series
+    # --------------------------------------------------------
+    def _series(self, points, fixed, axis, metric):
+        '''
+        Split points into lines that hold the fixed component constant
+        and vary along axis.  Points without the metric are skipped.
+        '''
+        series = {}
+        for p in points:
+            if p[metric] is not None:
+                series.setdefault(p[fixed], []).append((p[axis], p[metric], p))
+        for line in series.values():
+            line.sort(key=lambda item: item[0])
+        return series
+
+    # --------------------------------------------------------
+    # Formatting helpers
+    # --------------------------------------------------------
+    def _avg(self, total, count):
+        if count == 0:
+            return None
+        return float(total) / count
+
+    def _fmt(self, value):
+        if value is None:
+            return '-'
+        return '%.1f' % value
+
+    def _short(self, value):
+        '''Abbreviate large axis values, e.g. 5000000 -> 5M.'''
+        for divisor, suffix in ((1000000000, 'G'), (1000000, 'M'), (1000, 'k')):
+            if abs(value) >= divisor:
+                return ('%.1f' % (float(value) / divisor)).rstrip('0').rstrip('.') + suffix
+        return ('%.1f' % value).rstrip('0').rstrip('.')
+
+    def _pointLabel(self, p):
+        return 'recs=' + str(p['recs']) + ', threads=' + str(p['threads'])
@@ -12,7 +12,9 @@ and initialize the configuration data in the series configuration json file.
 # time bin/ycsb load mongodb -p recordcount=15000000 -p operationcount=30000000 -p threadcount=1 -p hosts=localhost -P workloads/workloada
 
 from fabric.api import env
-import json, os, logging
+import json, os, re, math, logging, itertools, random
+from collections import OrderedDict
+from MongoTopology import MongoTopology
 
 # Constants.
 SERIES_CONFIG_FILE = 'seriesConfig.json'
@@ -30,6 +32,91 @@ class SeriesEnv():
     DEFAULT_REPORT = True
     DEFAULT_CSV_FILE = False
     DEFAULT_CSV_DELIMITER = ','
+    DEFAULT_PROGRESS_INTERVAL = 0
+    DEFAULT_SCALING_REPORT = False
+    DEFAULT_SCHEDULE = 'sequential'
+    DEFAULT_CANARY_INTERVAL = 0
+    DEFAULT_CANARY_NORMALIZE = False
+    DEFAULT_CANARY_DRIFT_THRESHOLD = 0.05
+    DEFAULT_YCSB_CLIENTS = 1
+    DEFAULT_TOPOLOGY_BASE_PORT = 27017
+    DEFAULT_TOPOLOGY_READY_TIMEOUT = 120
+    DEFAULT_STORAGE_STATS = False
+    DEFAULT_MANIFEST_CHECK = False
+    DEFAULT_PROFILER = 'none'
+    DEFAULT_PROFILER_FREQUENCY = 99
+    DEFAULT_TUNING_ETA = 3
+    DEFAULT_TUNING_KEEP = 3
+    DEFAULT_TUNING_REPEATS = 1
+    DEFAULT_TUNING_FINAL_REPEATS = 3
+    DEFAULT_TUNING_MIN_OPERATIONCOUNT = 1000
+    DEFAULT_TUNING_CANDIDATES = 0
+    DEFAULT_LATENCY_PERCENTILES = [50, 95, 99, 99.9]
+    DEFAULT_OUTLIER_METHOD = 'mad'
+    DEFAULT_SOAK_SECS = 0
+    DEFAULT_TARGET_SEARCH_STEPS = 0
+    DEFAULT_SLA_PERCENTILE = 99
+    DEFAULT_SOAK_OPERATIONCOUNT = 2147483647
+    DEFAULT_SOAK_DROP_PERCENT = 10
+    DEFAULT_OUTLIER_PRIMARY = 'raw'
+    DEFAULT_LOAD_GENERATOR = 'ycsb'
+    DEFAULT_LOADGEN_PYTHON = 'python'
+    
+    # Programs that can drive the load and run phases.  Ycsb runs the
+    # java ycsb client and python runs LoadGenerator.py with the same
+    # command line.
+    LOAD_GENERATORS = ['ycsb', 'python']
+    
+    # Outlier detection methods and their default thresholds.  Mad flags
+    # runs whose modified z-score exceeds the threshold and iqr flags
+    # runs beyond threshold interquartile ranges outside the quartiles.
+    OUTLIER_METHODS = ['none', 'mad', 'iqr']
+    DEFAULT_OUTLIER_THRESHOLDS = {'mad': 3.5, 'iqr': 1.5}
+    
+    # Which of a key's throughput figures is reported as its average:
+    # all runs, or the runs that weren't flagged as outliers.
+    OUTLIER_PRIMARIES = ['raw', 'filtered']
+    
+    # Cell ordering modes.  Sequential runs cells in matrix order, random
+    # shuffles them with a recorded seed and interleave cycles through the
+    # mongo_parms entries so that host drift affects all of them alike.
+    SCHEDULES = ['sequential', 'random', 'interleave']
+
+    # Placement settings that can appear at the top level of the
+    # configuration or in any element of the placements array.
+    PLACEMENT_SETTINGS = ['mongo_cpuset', 'mongo_numactl', 'ycsb_cpuset', 'ycsb_numactl']
+    
+    # The axes every series is expanded over, from outermost to
+    # innermost.  Named axes from the axes array follow these.  The 
+    # parms and repeat values are 1-based indexes.
+    BUILTIN_AXES = ['repeat', 'workload', 'parms', 'recordcount', 'placement', 'topology', 'cache_mode']
+    
+    # Mongo deployments a cell can run against.  See MongoTopology.
+    TOPOLOGY_TYPES = MongoTopology.TYPES
+    
+    # Page cache treatments applied before each ycsb phase.  None leaves
+    # the cache as the previous cell left it, cold syncs and drops the OS
+    # page cache before each phase, warm_read reads every data file before
+    # the run phase and warm_run runs a discarded ycsb warm-up before it.
+    CACHE_MODES = ['none', 'cold', 'warm_read', 'warm_run']
+    DEFAULT_CACHE_MODE = 'none'
+    
+    # Profilers that can be attached to the cell's mongod for the run
+    # phase.  Perf samples stacks with perf record, pidstat samples cpu,
+    # memory, io and context switches every second and command runs the
+    # profiler_command template.
+    PROFILERS = ['none', 'perf', 'pidstat', 'command']
+    
+    # The named axis that tells the rungs of a tuning search apart in
+    # log file names and collation keys.
+    TUNING_RUNG_AXIS = 'rung'
+    
+    # Ycsb properties that are set from other configuration parameters.
+    RESERVED_YCSB_PROPERTIES = ['recordcount', 'operationcount', 'env.hosts', 'maxexecutiontime']
+    
+    # Ycsb properties that generated workloads can't set since the ycsb
+    # command line, which overrides workload files, always sets them.
+    RESERVED_WORKLOAD_PROPERTIES = RESERVED_YCSB_PROPERTIES + ['threadcount', 'insertstart', 'insertcount']
     
     # --------------------------------------------------------
     # Class Variables
@@ -55,12 +142,18 @@ class SeriesEnv():
         self.logpath = None
         self.dbpath = None
         
+        # The expanded benchmark matrix, one dictionary per cell in 
+        # execution order.  See _expandCells.
+        self.cells = []
+        
         # Properties expected in the config file are:
         #
         #  hosts                mandatory    array of string
         #  dbpath_root          mandatory    string, path to database directory
         #  logpath_root         mandatory    string, path to root directory for all logs
-        #  series_name          mandatory    string, subdirectory name for this run's mongo and ycsb logs 
+        #  series_name          mandatory    string, subdirectory name for this run's mongo and ycsb logs and
+        #                                            name of this series in the result index and repository,
+        #                                            where collating a series again replaces its runs
         #  series_repeat        optional     integer, number of time whole series repeats (default = 1)
         #
         #  dry_run              optional     boolean, echo command be don't execute anything (default = False)
@@ -69,15 +162,166 @@ class SeriesEnv():
         #  ycsb_operationcount  optional     integer (ignores negative numbers)
         #  ycsb_recordcount     mandatory    integer
         #  ycsb_threadcount     mandatory    integer
-        #  ycsb_workloads       mandatory    array of string
+        #  ycsb_workloads       mandatory    array of string or object.  A string names a workload file in ycsb's
+        #                                            workloads directory.  An object defines a generated workload 
+        #                                            with a mandatory name (letters, digits and underscores), a 
+        #                                            mandatory base workload file name, optional properties that 
+        #                                            override the base's and an optional sweep that maps properties
+        #                                            to an array of values or a {"from", "to", "step"} range.  Each
+        #                                            combination of sweep values is a workload of its own, and the
+        #                                            workload file of each cell is generated in the log directory on
+        #                                            the target host.  Collation keys generated workloads by name
+        #                                            and every generated property, and the workload axis filters
+        #                                            them by name
+        #  ycsb_clients         optional     integer, number of concurrent ycsb client processes per phase, which
+        #                                            share the phase's records, operations and threads (default = 1)
+        #  load_generator       optional     string, ycsb or python, the program that drives each phase (default = "ycsb")
+        #  loadgen_python       optional     string, python interpreter with pymongo on the target host (default = "python")
+        #  loadgen_path         optional     string, directory holding LoadGenerator.py on the target host 
+        #                                            (default = the directory of this file)
         #   
         #  mongo_bin_path       mandatory    string, path to bin directory containing mongod 
         #  mongo_parms          mandatory    string, all parms other than --dbpath and --logpath 
         #                                            - specify storageEngine with its parms here
-        #  
+        #
+        #  mongo_cpuset         optional     string, cpu list passed to taskset -c when starting mongod (ex: "0-7")
+        #  mongo_numactl        optional     string, numactl policy options for mongod (ex: "--cpunodebind=0 --membind=0")
+        #  ycsb_cpuset          optional     string, cpu list passed to taskset -c when starting ycsb (ex: "8-15")
+        #  ycsb_numactl         optional     string, numactl policy options for ycsb (ex: "--interleave=all")
+        #  placements           optional     array of object, each with a mandatory name (letters, digits and
+        #                                            underscores) and any of the four settings above.  Each
+        #                                            placement is run as an additional matrix axis and settings
+        #                                            it omits are taken from the top level values.  Without
+        #                                            placements, cells pinned by the top level settings are
+        #                                            collated apart by their taskset and numactl prefixes.
+        #
+        #  topologies           optional     array of object, each with a mandatory name (letters, digits and
+        #                                            underscores) and type: standalone, replset or sharded.  Each
+        #                                            topology is run as an additional matrix axis, brought up before
+        #                                            and torn down after every cell.  Replica sets take members
+        #                                            (default = 3).  Sharded clusters take shards (default = 2), 
+        #                                            members per shard (default = 1), config_servers (default = 1), 
+        #                                            config_replset (boolean, default = false), shard_collection 
+        #                                            (default = "ycsb.usertable") and shard_key (mongo shell document, 
+        #                                            default = "{_id: 'hashed'}").  Processes listen on consecutive 
+        #                                            ports from base_port (default = 27017), use directories under
+        #                                            dbpath_root and are spread over the topology's hosts array 
+        #                                            (default = the fabric host).  Without topologies, each cell
+        #                                            runs a standalone mongod as before.
+        #  topology_ready_timeout optional   integer, seconds to wait for a topology's processes to come up
+        #                                            (default = 120)
+        #
+        #  axes                 optional     array of object, each with a mandatory name (letters, digits and
+        #                                            underscores), a non-empty values array and either a mongo_flag
+        #                                            (ex: "--wiredTigerCacheSizeGB") or a ycsb_property (ex: "fieldcount").
+        #                                            Each axis multiplies the matrix by its values, which are appended 
+        #                                            to the mongod command line or passed to ycsb with -p.  A boolean
+        #                                            mongo_flag value of true adds the bare flag and false omits it.
+        #  axis_include         optional     array of object, each mapping axis names to a value or array of values.
+        #                                            When given, only cells matching all entries of at least one
+        #                                            filter are run.  Axis names include repeat, workload, parms
+        #                                            (1-based mongo_parms index), recordcount, placement, topology 
+        #                                            and cache_mode.
+        #  axis_exclude         optional     array of object, same form as axis_include.  Cells matching all
+        #                                            entries of any filter are not run.
+        #
+        #  cache_mode           optional     string or array of string, page cache treatment before each ycsb
+        #                                            phase: none, cold, warm_read or warm_run.  Cold and warm_read
+        #                                            treat every host of a topology's data bearing mongods.  An array
+        #                                            is run as an additional matrix axis (default = "none")
+        #  cache_warmup_ops     optional     integer, operation count of the warm_run warm-up (default = recordcount)
+        #
+        #  storage_stats        optional     boolean, record dbpath and journal sizes after each phase and the bytes
+        #                                            read and written by the dbpath devices during it, reported as
+        #                                            bytes per record and write amplification (default = false)
+        #
+        #  tuning_eta           optional     integer, run_tuning keeps the best 1/tuning_eta of the candidate mongod
+        #                                            configurations at each rung and runs the survivors with a run
+        #                                            phase tuning_eta times longer.  The candidates are those that
+        #                                            mongo_parms and the mongo_flag axes expand to (default = 3)
+        #  tuning_keep          optional     integer, number of best configurations run at the full operation count
+        #                                            in the last rung and reported (default = 3)
+        #  tuning_repeats       optional     integer, runs of each candidate in the rungs before the last (default = 1)
+        #  tuning_final_repeats optional     integer, runs of each candidate in the last rung (default = 3)
+        #  tuning_min_operationcount optional integer, shortest run phase of a rung (default = 1000)
+        #  tuning_candidates    optional     integer, randomly sample this many candidates, 0 searches them all 
+        #                                            (default = 0)
+        #  tuning_seed          optional     integer, random seed for the candidate sample (default = chosen and logged)
+        #
+        #  profiler             optional     string, profiler attached to the cell's data bearing mongod for the
+        #                                            run phase: none, perf, pidstat or command.  Its output is
+        #                                            written to the log directory under the cell's log name with a
+        #                                            profile- prefix.  Perf needs perf_event access (default = "none")
+        #  profiler_frequency   optional     integer, perf sampling frequency in Hz (default = 99)
+        #  profiler_command     optional     string, shell command template run by the command profiler, in which
+        #                                            {pid} is replaced by the mongod pid and {output} by the output
+        #                                            file.  It must handle SIGINT, which stops it, since it
+        #                                            starts with SIGINT ignored
+        #
+        #  schedule             optional     string, cell order: sequential, random or interleave (default = "sequential")
+        #  schedule_seed        optional     integer, random seed for the random schedule, ignored by the
+        #                                            other schedules (default = chosen and logged)
+        #  canary_interval      optional     integer, run a baseline canary cell before every canary_interval cells
+        #                                            and after the last cell, 0 disables canaries (default = 0)
+        #  canary_cell          optional     object, axis filter selecting the canary from the first repeat of the
+        #                                            matrix, same form as an axis_include entry (default = first cell)
+        #  canary_normalize     optional     boolean, also report throughput normalised against the canary 
+        #                                            baseline interpolated at each cell's position (default = false)
+        #  canary_drift_threshold optional   number, relative canary throughput range that is reported as drift
+        #                                            (default = 0.05)
+        #
+        #  soak_secs            optional     integer, run every cell's run phase for this many seconds of wall time
+        #                                            (ycsb maxexecutiontime) with throughput sampled every 10 seconds,
+        #                                            and report its throughput degradation, 0 disables (default = 0)
+        #  soak_operationcount  optional     integer, operationcount of soak run phases, which only needs to outlast
+        #                                            soak_secs.  Workloads that insert with a zipfian request 
+        #                                            distribution size their key space from it (default = 2147483647)
+        #  soak_drop_percent    optional     number, throughput drop from the start of a soak that is timed
+        #                                            (default = 10)
+        #
+        #  target_rates         optional     array of number, after each cell's run phase, run it again on the same
+        #                                            data at each of these ycsb -target rates in ops/sec
+        #  target_search_steps  optional     integer, then run it at this many rates picked by a bisection search
+        #                                            for the highest rate that meets the SLA, 0 disables (default = 0)
+        #  target_search_max_rate optional   number, upper end of the search (default = unthrottled run throughput)
+        #  sla_percentile       optional     number, latency percentile of all operation types together that the
+        #                                            SLA limits (default = 99)
+        #  sla_latency_us       optional     number, SLA latency limit in microseconds, required by the search.  The
+        #                                            report gives the highest throughput of the target rates that
+        #                                            met it as the maximum sustainable throughput
+        #
+        #  progress_interval    optional     integer, seconds between progress samples of a running ycsb phase,
+        #                                            0 runs ycsb in the foreground without progress events (default = 0)
+        #  abort_min_throughput optional     number, ops/sec below which a running phase counts as stalled
+        #  abort_after_secs     optional     number, seconds of stalled throughput, or of no new ycsb status line
+        #                                            (at least two status intervals), after which the phase is killed
+        #                                            and the cell is marked failed (requires abort_min_throughput)
+        #
         #  report               optional     boolean, write result summary to stdout (default = True)
+        #  latency_percentiles  optional     array of number, latency percentiles reported from the per key merge
+        #                                            of all runs' latency histograms (default = [50, 95, 99, 99.9])
+        #  outlier_method       optional     string, flag runs whose throughput is an outlier among their key's
+        #                                            runs: none, mad or iqr (default = "mad")
+        #  outlier_threshold    optional     number, modified z-score (mad) or multiple of the interquartile
+        #                                            range (iqr) beyond which a run is flagged (default = 3.5 or 1.5)
+        #  outlier_primary      optional     string, figure reported as a key's average and stdev: raw uses
+        #                                            every run and filtered excludes outliers (default = "raw")
         #  csv_file             optional     boolean, write result summary to RunYcsb.csv in log directory (default = false)
         #  csv_delimiter        optional     single character or escape sequence (ex: "\t" for tab) (default = ",") 
+        #  result_index         optional     string, sqlite file that collated runs are added to for QueryResults.py,
+        #                                            relative to the log directory unless absolute (default = none)
+        #  result_repository    optional     string, directory shared by many series and controllers that collated
+        #                                            runs are added to, which collators can write to concurrently
+        #                                            and QueryResults.py can read as a snapshot, relative to the
+        #                                            log directory unless absolute (default = none)
+        #  manifest_check       optional     boolean, also read the mongod options record of cells with a manifest
+        #                                            and warn when it disagrees with the manifest, whose values
+        #                                            are used either way (default = false)
+        #  scaling_predict_recordcounts optional array of integer, record counts at which the run throughput of
+        #                                            each engine/parms/workload is predicted from a model fitted
+        #                                            to the record counts that were run (default = [])
+        #  scaling_report       optional     boolean, write throughput and latency scaling charts to 
+        #                                            RunYcsb-scaling.html in log directory (default = false)
         # 
         # Read the configuration file.
         with open(SERIES_CONFIG_FILE, 'r') as fp:
@@ -89,6 +333,10 @@ class SeriesEnv():
         # Process the configuration.
         self._processConfig(self.seriesConfig)
         
+        # Expand and filter the benchmark matrix, then order it and
+        # add any canary cells.
+        self.cells = self._scheduleCells(self._expandCells(self.seriesConfig), self.seriesConfig)
+        
         # Write configuration debug message   
         self.LOG.debug("----- seriesConfig:")
         self.LOG.debug(self.seriesConfig)
@@ -205,8 +453,524 @@ class SeriesEnv():
                 and (not isinstance(config['csv_delimiter'], str) or (not len(config['csv_delimiter']) == 1)):
             msg = "The optional csv_delimiter parameter must be a string of length 1 in configuration file " \
                   + SERIES_CONFIG_FILE + "."
-            raise Exception(msg) 
-            
+            raise Exception(msg)
+
+        # Check the top level placement settings.
+        self._validatePlacement(config, "configuration file")
+
+        # Check placements array
+        if config.has_key('placements') and config['placements']:
+            if not isinstance(config['placements'], list):
+                msg = "The optional placements parameter must be an array in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+            names = []
+            for placement in config['placements']:
+                if (not isinstance(placement, dict)) or (not placement.has_key('name')) \
+                        or (not isinstance(placement['name'], basestring)) \
+                        or (not re.match(r'^\w+$', placement['name'])):
+                    msg = "Each placement must be an object with a name made of letters, digits and " \
+                          + "underscores in configuration file " + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                if placement['name'] in names:
+                    msg = "Placement name " + placement['name'] + " appears more than once in configuration file " \
+                          + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                names.append(placement['name'])
+                self._validatePlacement(placement, "placement " + placement['name'] + " of configuration file")
+
+        # Check topologies array
+        if config.has_key('topologies') and config['topologies']:
+            if not isinstance(config['topologies'], list):
+                msg = "The optional topologies parameter must be an array in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+            names = []
+            for topology in config['topologies']:
+                if (not isinstance(topology, dict)) or (not topology.has_key('name')) \
+                        or (not isinstance(topology['name'], basestring)) \
+                        or (not re.match(r'^\w+$', topology['name'])):
+                    msg = "Each topology must be an object with a name made of letters, digits and " \
+                          + "underscores in configuration file " + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                if topology['name'] in names:
+                    msg = "Topology name " + topology['name'] + " appears more than once in configuration file " \
+                          + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                names.append(topology['name'])
+                self._validateTopology(topology)
+        if (config.has_key('topology_ready_timeout')) and config['topology_ready_timeout'] is not None \
+                and (not isinstance(config['topology_ready_timeout'], (long, int)) \
+                     or config['topology_ready_timeout'] <= 0):
+            msg = "The optional topology_ready_timeout parameter must be a positive integer in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check the named axes and the axis filters.
+        self._validateAxes(config)
+        
+        # Check the generated workload definitions, whose properties
+        # mustn't be set by ycsb_property axes too.
+        self._validateWorkloads(config)
+
+        # Check ycsb_clients
+        if (config.has_key('ycsb_clients')) and config['ycsb_clients'] is not None \
+                and (not isinstance(config['ycsb_clients'], (long, int)) or config['ycsb_clients'] < 1):
+            msg = "The optional ycsb_clients parameter must be a positive integer in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check cache_mode, which may be a single mode or an array of modes.
+        if (config.has_key('cache_mode')) and config['cache_mode']:
+            modes = config['cache_mode'] if isinstance(config['cache_mode'], list) else [config['cache_mode']]
+            if [m for m in modes if m not in self.CACHE_MODES] or len(set(modes)) != len(modes):
+                msg = "The optional cache_mode parameter must be one or an array of distinct values from " \
+                      + ", ".join(self.CACHE_MODES) + " in configuration file " + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+
+        # Check cache_warmup_ops
+        if (config.has_key('cache_warmup_ops')) and config['cache_warmup_ops'] is not None \
+                and (not isinstance(config['cache_warmup_ops'], (long, int)) or config['cache_warmup_ops'] <= 0):
+            msg = "The optional cache_warmup_ops parameter must be a positive integer in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check schedule
+        if (config.has_key('schedule')) and config['schedule'] \
+                and config['schedule'] not in self.SCHEDULES:
+            msg = "The optional schedule parameter must be one of " + ", ".join(self.SCHEDULES) \
+                  + " in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check schedule_seed and canary_interval
+        for parm in ['schedule_seed', 'canary_interval']:
+            if (config.has_key(parm)) and config[parm] is not None \
+                    and (not isinstance(config[parm], (long, int)) or isinstance(config[parm], bool) \
+                         or config[parm] < 0):
+                msg = "The optional " + parm + " parameter must be a non-negative integer in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+
+        # Check canary_normalize
+        if (config.has_key('canary_normalize')) and config['canary_normalize'] \
+                and (not isinstance(config['canary_normalize'], bool)):
+            msg = "The optional canary_normalize parameter must be specified as a boolean value in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check canary_drift_threshold
+        if (config.has_key('canary_drift_threshold')) and config['canary_drift_threshold'] \
+                and (not isinstance(config['canary_drift_threshold'], (long, int, float)) \
+                     or config['canary_drift_threshold'] <= 0):
+            msg = "The optional canary_drift_threshold parameter must be a positive number in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check load_generator
+        if (config.has_key('load_generator')) and config['load_generator'] \
+                and config['load_generator'] not in self.LOAD_GENERATORS:
+            msg = "The optional load_generator parameter must be one of " + ", ".join(self.LOAD_GENERATORS) \
+                  + " in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        for parm in ['loadgen_python', 'loadgen_path']:
+            if (config.has_key(parm)) and config[parm] and (not isinstance(config[parm], basestring)):
+                msg = "The optional " + parm + " parameter must be a string in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+
+        # Check latency_percentiles
+        if (config.has_key('latency_percentiles')) and config['latency_percentiles'] \
+                and ((not isinstance(config['latency_percentiles'], list)) \
+                     or [p for p in config['latency_percentiles'] 
+                         if isinstance(p, bool) or (not isinstance(p, (int, long, float))) or p <= 0 or p > 100]):
+            msg = "The optional latency_percentiles parameter must be an array of numbers greater than 0 and at " \
+                  + "most 100 in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check the soak parameters
+        for parm in ['soak_secs', 'soak_operationcount']:
+            if (config.has_key(parm)) and config[parm] is not None \
+                    and (not isinstance(config[parm], (long, int)) or isinstance(config[parm], bool) \
+                         or config[parm] < 0):
+                msg = "The optional " + parm + " parameter must be a non-negative integer in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+        if (config.has_key('soak_drop_percent')) and config['soak_drop_percent'] \
+                and (isinstance(config['soak_drop_percent'], bool) \
+                     or not isinstance(config['soak_drop_percent'], (long, int, float)) \
+                     or config['soak_drop_percent'] <= 0 or config['soak_drop_percent'] >= 100):
+            msg = "The optional soak_drop_percent parameter must be a number greater than 0 and less than 100 " \
+                  + "in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check the target rate parameters
+        if (config.has_key('target_rates')) and config['target_rates'] \
+                and ((not isinstance(config['target_rates'], list)) \
+                     or [r for r in config['target_rates'] 
+                         if isinstance(r, bool) or (not isinstance(r, (int, long, float))) or r <= 0]):
+            msg = "The optional target_rates parameter must be an array of positive numbers in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        if (config.has_key('target_search_steps')) and config['target_search_steps'] is not None \
+                and (not isinstance(config['target_search_steps'], (long, int)) \
+                     or isinstance(config['target_search_steps'], bool) or config['target_search_steps'] < 0):
+            msg = "The optional target_search_steps parameter must be a non-negative integer in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        for parm in ['target_search_max_rate', 'sla_latency_us']:
+            if (config.has_key(parm)) and config[parm] is not None \
+                    and (isinstance(config[parm], bool) or not isinstance(config[parm], (long, int, float)) \
+                         or config[parm] <= 0):
+                msg = "The optional " + parm + " parameter must be a positive number in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+        if (config.has_key('sla_percentile')) and config['sla_percentile'] \
+                and (isinstance(config['sla_percentile'], bool) \
+                     or not isinstance(config['sla_percentile'], (long, int, float)) \
+                     or config['sla_percentile'] <= 0 or config['sla_percentile'] > 100):
+            msg = "The optional sla_percentile parameter must be a number greater than 0 and at most 100 " \
+                  + "in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        if config.get('target_search_steps') and not config.get('sla_latency_us'):
+            msg = "The target_search_steps parameter requires the sla_latency_us parameter in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check scaling_predict_recordcounts
+        if (config.has_key('scaling_predict_recordcounts')) and config['scaling_predict_recordcounts'] \
+                and ((not isinstance(config['scaling_predict_recordcounts'], list)) \
+                     or [r for r in config['scaling_predict_recordcounts'] 
+                         if isinstance(r, bool) or (not isinstance(r, (int, long))) or r <= 0]):
+            msg = "The optional scaling_predict_recordcounts parameter must be an array of positive integers in " \
+                  + "configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check the result index and repository parameters
+        for parm in ['result_index', 'result_repository']:
+            if (config.has_key(parm)) and config[parm] and (not isinstance(config[parm], basestring)):
+                msg = "The optional " + parm + " parameter must be a string in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+
+        # Check manifest_check
+        if (config.has_key('manifest_check')) and config['manifest_check'] \
+                and (not isinstance(config['manifest_check'], bool)):
+            msg = "The optional manifest_check parameter must be specified as a boolean value in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check the outlier parameters
+        if (config.has_key('outlier_method')) and config['outlier_method'] \
+                and config['outlier_method'] not in self.OUTLIER_METHODS:
+            msg = "The optional outlier_method parameter must be one of " + ", ".join(self.OUTLIER_METHODS) \
+                  + " in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        if (config.has_key('outlier_threshold')) and config['outlier_threshold'] \
+                and (isinstance(config['outlier_threshold'], bool) \
+                     or not isinstance(config['outlier_threshold'], (long, int, float)) \
+                     or config['outlier_threshold'] <= 0):
+            msg = "The optional outlier_threshold parameter must be a positive number in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        if (config.has_key('outlier_primary')) and config['outlier_primary'] \
+                and config['outlier_primary'] not in self.OUTLIER_PRIMARIES:
+            msg = "The optional outlier_primary parameter must be one of " + ", ".join(self.OUTLIER_PRIMARIES) \
+                  + " in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check the tuning parameters
+        for parm, minimum in [('tuning_eta', 2), ('tuning_keep', 1), ('tuning_repeats', 1), ('tuning_final_repeats', 1),
+                              ('tuning_min_operationcount', 1), ('tuning_candidates', 0), ('tuning_seed', 0)]:
+            if (config.has_key(parm)) and config[parm] is not None \
+                    and (not isinstance(config[parm], (long, int)) or isinstance(config[parm], bool) \
+                         or config[parm] < minimum):
+                msg = "The optional " + parm + " parameter must be an integer of at least " + str(minimum) \
+                      + " in configuration file " + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+
+        # Check the profiler parameters
+        if (config.has_key('profiler')) and config['profiler'] \
+                and config['profiler'] not in self.PROFILERS:
+            msg = "The optional profiler parameter must be one of " + ", ".join(self.PROFILERS) \
+                  + " in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        if (config.has_key('profiler_frequency')) and config['profiler_frequency'] is not None \
+                and (not isinstance(config['profiler_frequency'], (long, int)) \
+                     or isinstance(config['profiler_frequency'], bool) or config['profiler_frequency'] <= 0):
+            msg = "The optional profiler_frequency parameter must be a positive integer in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        if (config.has_key('profiler_command')) and config['profiler_command'] \
+                and (not isinstance(config['profiler_command'], basestring)):
+            msg = "The optional profiler_command parameter must be a string in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        if config.get('profiler') == 'command' \
+                and not (config.get('profiler_command') and '{pid}' in config['profiler_command']):
+            msg = "The command profiler requires a profiler_command parameter containing {pid} in configuration " \
+                  + "file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check storage_stats
+        if (config.has_key('storage_stats')) and config['storage_stats'] \
+                and (not isinstance(config['storage_stats'], bool)):
+            msg = "The optional storage_stats parameter must be specified as a boolean value in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check scaling_report
+        if (config.has_key('scaling_report')) and config['scaling_report'] \
+                and (not isinstance(config['scaling_report'], bool)):
+            msg = "The optional scaling_report parameter must be specified as a boolean value in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check progress_interval
+        if (config.has_key('progress_interval')) and config['progress_interval'] \
+                and (not isinstance(config['progress_interval'], (long, int)) or config['progress_interval'] < 0):
+            msg = "The optional progress_interval parameter must be a non-negative integer in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+        # Check the abort rule, whose two parameters must be given together.
+        for parm in ['abort_min_throughput', 'abort_after_secs']:
+            if (config.has_key(parm)) and config[parm] is not None \
+                    and (not isinstance(config[parm], (long, int, float)) or config[parm] < 0):
+                msg = "The optional " + parm + " parameter must be a non-negative number in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+        if (config.get('abort_min_throughput') is None) != (config.get('abort_after_secs') is None):
+            msg = "The abort_min_throughput and abort_after_secs parameters must be specified together in " \
+                  + "configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        if (config.get('abort_min_throughput') is not None) and (not config.get('progress_interval')):
+            msg = "The abort rule requires a positive progress_interval in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+
+    # --------------------------------------------------------
+    # _validatePlacement
+    # --------------------------------------------------------
+    def _validatePlacement(self, placement, where):
+        '''
+        Check the optional cpu set and numa policy strings that
+        can appear at the top level or in a placements element.
+        '''
+        for setting in self.PLACEMENT_SETTINGS:
+            if placement.has_key(setting) and placement[setting] \
+                    and (not isinstance(placement[setting], basestring)):
+                msg = "The optional " + setting + " parameter must be a string in " + where + " " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+
+    # --------------------------------------------------------
+    # _validateTopology
+    # --------------------------------------------------------
+    def _validateTopology(self, topology):
+        '''Check the type and settings of a topologies element.'''
+        where = " of topology " + topology['name'] + " in configuration file " + SERIES_CONFIG_FILE + "."
+        if topology.get('type') not in self.TOPOLOGY_TYPES:
+            msg = "The type must be one of " + ", ".join(self.TOPOLOGY_TYPES) + where
+            raise Exception(msg)
+        for parm in ['members', 'shards', 'config_servers', 'base_port']:
+            if topology.get(parm) is not None \
+                    and (not isinstance(topology[parm], (long, int)) or isinstance(topology[parm], bool) \
+                         or topology[parm] < 1):
+                msg = "The optional " + parm + " parameter must be a positive integer" + where
+                raise Exception(msg)
+        if topology.get('config_replset') is not None and (not isinstance(topology['config_replset'], bool)):
+            msg = "The optional config_replset parameter must be a boolean value" + where
+            raise Exception(msg)
+        for parm in ['shard_collection', 'shard_key']:
+            if topology.get(parm) is not None \
+                    and (not isinstance(topology[parm], basestring) or (not topology[parm])):
+                msg = "The optional " + parm + " parameter must be a non-empty string" + where
+                raise Exception(msg)
+        if topology.get('shard_collection') and topology['shard_collection'].find('.') < 1:
+            msg = "The shard_collection parameter must be a database.collection namespace" + where
+            raise Exception(msg)
+        if topology.get('hosts') is not None \
+                and ((not isinstance(topology['hosts'], list)) \
+                     or [h for h in topology['hosts'] if (not isinstance(h, basestring)) or (not h)]):
+            msg = "The optional hosts parameter must be an array of host names" + where
+            raise Exception(msg)
+
+        # Mirrored config servers come in ones or threes.
+        if topology['type'] == MongoTopology.TYPE_SHARDED and (not topology.get('config_replset')) \
+                and topology.get('config_servers', 1) not in (1, 3):
+            msg = "Without config_replset, config_servers must be 1 or 3" + where
+            raise Exception(msg)
+
+    # --------------------------------------------------------
+    # _validateWorkloads
+    # --------------------------------------------------------
+    def _validateWorkloads(self, config):
+        '''
+        Check the generated workload definitions of the ycsb_workloads
+        array.  Workload names, whether of files or definitions, must
+        be distinct.
+        '''
+        names = []
+        axisProperties = [a['ycsb_property'] for a in config.get('axes') or [] if a.has_key('ycsb_property')]
+        for workload in config['ycsb_workloads']:
+            if isinstance(workload, basestring):
+                name = workload
+            else:
+                if (not isinstance(workload, dict)) or (not isinstance(workload.get('name'), basestring)) \
+                        or (not re.match(r'^\w+$', workload['name'])) \
+                        or (not isinstance(workload.get('base'), basestring)) or (not workload['base']):
+                    msg = "Each ycsb_workloads entry must be a workload file name or an object with a name made " \
+                          + "of letters, digits and underscores and a base workload file name in configuration " \
+                          + "file " + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                name = workload['name']
+                where = " of workload " + name + " in configuration file " + SERIES_CONFIG_FILE + "."
+                properties = workload.get('properties') or {}
+                sweep = workload.get('sweep') or {}
+                if (not isinstance(properties, dict)) or (not isinstance(sweep, dict)):
+                    msg = "The properties and sweep" + where[:-1] + " must be objects."
+                    raise Exception(msg)
+                for prop in properties.keys() + sweep.keys():
+                    if (not re.match(r'^[\w.]+$', prop)) or prop in self.RESERVED_WORKLOAD_PROPERTIES:
+                        msg = "Property " + prop + where[:-1] + " must be made of letters, digits, underscores " \
+                              + "and periods and be other than " + ", ".join(self.RESERVED_WORKLOAD_PROPERTIES) + "."
+                        raise Exception(msg)
+                    if prop in properties and prop in sweep:
+                        msg = "Property " + prop + " is both set and swept" + where
+                        raise Exception(msg)
+                    if prop in axisProperties:
+                        msg = "Property " + prop + where[:-1] + " is also the ycsb_property of an axis."
+                        raise Exception(msg)
+                for prop, value in properties.items():
+                    if not isinstance(value, (basestring, bool, int, long, float)):
+                        msg = "The value of property " + prop + where[:-1] + " must be a string, number or boolean."
+                        raise Exception(msg)
+                for prop, values in sweep.items():
+                    self._getSweepValues(values, "The sweep of property " + prop + " of workload " + name)
+            if name in names:
+                msg = "Workload " + name + " appears more than once in ycsb_workloads in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+            names.append(name)
+
+    # --------------------------------------------------------
+    # _getSweepValues
+    # --------------------------------------------------------
+    def _getSweepValues(self, values, what):
+        '''
+        Return the values of a workload property sweep, which is either
+        an array of distinct scalars or a {"from", "to", "step"} range 
+        whose values are rounded to 10 decimals unless all three bounds
+        are integers.  What starts the message of the exception raised
+        for a malformed sweep.
+        '''
+        if isinstance(values, list):
+            if (not values) or [v for v in values if not isinstance(v, (basestring, bool, int, long, float))] \
+                    or len(set(values)) != len(values):
+                msg = what + " must be a non-empty array of distinct strings, numbers or booleans in " \
+                      + "configuration file " + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+            return values
+        bounds = [values.get(b) if isinstance(values, dict) else None for b in ('from', 'to', 'step')]
+        if [b for b in bounds if isinstance(b, bool) or not isinstance(b, (int, long, float))] \
+                or bounds[2] <= 0 or bounds[0] > bounds[1]:
+            msg = what + " must be an array or an object with numeric from, to and step, where from is at most " \
+                  + "to and step is positive, in configuration file " + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        start, stop, step = bounds
+        count = int(math.floor((stop - start) / float(step) + 1e-9)) + 1
+        if not [b for b in bounds if isinstance(b, float)]:
+            return [start + i * step for i in range(count)]
+        return [round(start + i * step, 10) for i in range(count)]
+
+    # --------------------------------------------------------
+    # _validateAxes
+    # --------------------------------------------------------
+    def _validateAxes(self, config):
+        '''
+        Check the optional axes array and the axis_include and 
+        axis_exclude filters.  Filters are checked for unknown axis
+        names here; whether they leave anything to run is checked 
+        when the matrix is expanded.
+        '''
+        names = list(self.BUILTIN_AXES)
+        if config.has_key('axes') and config['axes']:
+            if not isinstance(config['axes'], list):
+                msg = "The optional axes parameter must be an array in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+            for axis in config['axes']:
+                if (not isinstance(axis, dict)) or (not isinstance(axis.get('name'), basestring)) \
+                        or (not re.match(r'^\w+$', axis['name'])):
+                    msg = "Each axis must be an object with a name made of letters, digits and " \
+                          + "underscores in configuration file " + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                if axis['name'] in names or axis['name'] == self.TUNING_RUNG_AXIS:
+                    msg = "Axis name " + axis['name'] + " is used more than once or is a built-in or reserved " \
+                          + "axis name in configuration file " + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                names.append(axis['name'])
+                
+                # Each axis targets exactly one mongod flag or ycsb property.
+                if axis.has_key('mongo_flag') == axis.has_key('ycsb_property'):
+                    msg = "Axis " + axis['name'] + " must specify exactly one of mongo_flag and ycsb_property " \
+                          + "in configuration file " + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                if axis.has_key('mongo_flag'):
+                    if (not isinstance(axis['mongo_flag'], basestring)) or (not axis['mongo_flag'].startswith('--')):
+                        msg = "The mongo_flag of axis " + axis['name'] + " must be a string starting with -- " \
+                              + "in configuration file " + SERIES_CONFIG_FILE + "."
+                        raise Exception(msg)
+                    for mongoParms in config['mongo_parms']:
+                        if re.search(re.escape(axis['mongo_flag']) + r'(\s|=|$)', mongoParms):
+                            msg = "The mongo_flag of axis " + axis['name'] + " also appears in mongo_parms " \
+                                  + "in configuration file " + SERIES_CONFIG_FILE + "."
+                            raise Exception(msg)
+                else:
+                    if (not isinstance(axis['ycsb_property'], basestring)) or (not axis['ycsb_property']) \
+                            or axis['ycsb_property'] in self.RESERVED_YCSB_PROPERTIES:
+                        msg = "The ycsb_property of axis " + axis['name'] + " must be a property name other " \
+                              + "than " + ", ".join(self.RESERVED_YCSB_PROPERTIES) + " in configuration file " \
+                              + SERIES_CONFIG_FILE + "."
+                        raise Exception(msg)
+                
+                # Values must be a non-empty array of distinct scalars.
+                values = axis.get('values')
+                if (not isinstance(values, list)) or (not values) \
+                        or [v for v in values if not isinstance(v, (basestring, bool, int, long, float))] \
+                        or len(set(values)) != len(values):
+                    msg = "The values of axis " + axis['name'] + " must be a non-empty array of distinct " \
+                          + "strings, numbers or booleans in configuration file " + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+                
+        # Check the canary cell filter, which is a single filter.
+        if config.has_key('canary_cell') and config['canary_cell']:
+            if not isinstance(config['canary_cell'], dict):
+                msg = "The optional canary_cell parameter must be an object in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+            for name in config['canary_cell'].keys():
+                if name not in names:
+                    msg = "Unknown axis name " + name + " in canary_cell in configuration file " \
+                          + SERIES_CONFIG_FILE + "."
+                    raise Exception(msg)
+        
+        # Check the filters.
+        for parm in ['axis_include', 'axis_exclude']:
+            if (not config.has_key(parm)) or (not config[parm]):
+                continue
+            if (not isinstance(config[parm], list)) \
+                    or [f for f in config[parm] if (not isinstance(f, dict)) or (not f)]:
+                msg = "The optional " + parm + " parameter must be an array of non-empty objects in " \
+                      + "configuration file " + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+            for axisFilter in config[parm]:
+                for name in axisFilter.keys():
+                    if name not in names:
+                        msg = "Unknown axis name " + name + " in " + parm + " in configuration file " \
+                              + SERIES_CONFIG_FILE + "."
+                        raise Exception(msg)
+        
     # --------------------------------------------------------
     # _processConfig
     # --------------------------------------------------------
@@ -241,11 +1005,391 @@ class SeriesEnv():
         if (not config.has_key('csv_delimiter')) or (not config['csv_delimiter']):  
             config['csv_delimiter'] = self.DEFAULT_CSV_DELIMITER;  
             
+        # Make sure the scaling_report value is always assigned.
+        if (not config.has_key('scaling_report')) or (not config['scaling_report']):
+            config['scaling_report'] = self.DEFAULT_SCALING_REPORT;
+
+        # Make sure the load generator values are always assigned.
+        if (not config.has_key('load_generator')) or (not config['load_generator']):
+            config['load_generator'] = self.DEFAULT_LOAD_GENERATOR;
+        if (not config.has_key('loadgen_python')) or (not config['loadgen_python']):
+            config['loadgen_python'] = self.DEFAULT_LOADGEN_PYTHON;
+        if (not config.has_key('loadgen_path')) or (not config['loadgen_path']):
+            config['loadgen_path'] = os.path.dirname(os.path.abspath(__file__))
+
+        # Make sure the latency_percentiles value is always assigned.
+        if (not config.has_key('latency_percentiles')) or (not config['latency_percentiles']):
+            config['latency_percentiles'] = list(self.DEFAULT_LATENCY_PERCENTILES)
+
+        # Make sure the soak values are always assigned.
+        if (not config.has_key('soak_secs')) or (not config['soak_secs']):
+            config['soak_secs'] = self.DEFAULT_SOAK_SECS;
+        if (not config.has_key('soak_operationcount')) or (not config['soak_operationcount']):
+            config['soak_operationcount'] = self.DEFAULT_SOAK_OPERATIONCOUNT;
+        if (not config.has_key('soak_drop_percent')) or (not config['soak_drop_percent']):
+            config['soak_drop_percent'] = self.DEFAULT_SOAK_DROP_PERCENT;
+
+        # Make sure the target rate values are always assigned.
+        if (not config.has_key('target_rates')) or (not config['target_rates']):
+            config['target_rates'] = []
+        if (not config.has_key('target_search_steps')) or (not config['target_search_steps']):
+            config['target_search_steps'] = self.DEFAULT_TARGET_SEARCH_STEPS;
+        config['target_search_max_rate'] = config.get('target_search_max_rate')
+        config['sla_latency_us'] = config.get('sla_latency_us')
+        if (not config.has_key('sla_percentile')) or (not config['sla_percentile']):
+            config['sla_percentile'] = self.DEFAULT_SLA_PERCENTILE;
+
+        # Make sure the scaling_predict_recordcounts value is always assigned.
+        if (not config.has_key('scaling_predict_recordcounts')) or (not config['scaling_predict_recordcounts']):
+            config['scaling_predict_recordcounts'] = []
+
+        # Make sure the result index and repository values are always assigned.
+        if (not config.has_key('result_index')) or (not config['result_index']):
+            config['result_index'] = None
+        if (not config.has_key('result_repository')) or (not config['result_repository']):
+            config['result_repository'] = None
+
+        # Make sure the manifest_check value is always assigned.
+        if (not config.has_key('manifest_check')) or (not config['manifest_check']):
+            config['manifest_check'] = self.DEFAULT_MANIFEST_CHECK
+
+        # Make sure the outlier values are always assigned.
+        if (not config.has_key('outlier_method')) or (not config['outlier_method']):
+            config['outlier_method'] = self.DEFAULT_OUTLIER_METHOD;
+        if (not config.has_key('outlier_threshold')) or (not config['outlier_threshold']):
+            config['outlier_threshold'] = self.DEFAULT_OUTLIER_THRESHOLDS.get(config['outlier_method'], 0);
+        if (not config.has_key('outlier_primary')) or (not config['outlier_primary']):
+            config['outlier_primary'] = self.DEFAULT_OUTLIER_PRIMARY;
+
+        # Make sure the tuning values are always assigned.  The sample
+        # gets a seed so that it can be recorded and reproduced on resume.
+        if (not config.has_key('tuning_eta')) or (not config['tuning_eta']):
+            config['tuning_eta'] = self.DEFAULT_TUNING_ETA;
+        if (not config.has_key('tuning_keep')) or (not config['tuning_keep']):
+            config['tuning_keep'] = self.DEFAULT_TUNING_KEEP;
+        if (not config.has_key('tuning_repeats')) or (not config['tuning_repeats']):
+            config['tuning_repeats'] = self.DEFAULT_TUNING_REPEATS;
+        if (not config.has_key('tuning_final_repeats')) or (not config['tuning_final_repeats']):
+            config['tuning_final_repeats'] = self.DEFAULT_TUNING_FINAL_REPEATS;
+        if (not config.has_key('tuning_min_operationcount')) or (not config['tuning_min_operationcount']):
+            config['tuning_min_operationcount'] = self.DEFAULT_TUNING_MIN_OPERATIONCOUNT;
+        if (not config.has_key('tuning_candidates')) or (not config['tuning_candidates']):
+            config['tuning_candidates'] = self.DEFAULT_TUNING_CANDIDATES;
+        if (not config.has_key('tuning_seed')) or config['tuning_seed'] is None:
+            config['tuning_seed'] = random.randint(0, 2**31 - 1)
+
+        # Make sure the profiler values are always assigned.
+        if (not config.has_key('profiler')) or (not config['profiler']):
+            config['profiler'] = self.DEFAULT_PROFILER;
+        if (not config.has_key('profiler_frequency')) or (not config['profiler_frequency']):
+            config['profiler_frequency'] = self.DEFAULT_PROFILER_FREQUENCY;
+        config['profiler_command'] = config.get('profiler_command')
+
+        # Make sure the storage_stats value is always assigned.
+        if (not config.has_key('storage_stats')) or (not config['storage_stats']):
+            config['storage_stats'] = self.DEFAULT_STORAGE_STATS;
+
+        # Make sure the progress_interval value is always assigned.
+        if (not config.has_key('progress_interval')) or (not config['progress_interval']):
+            config['progress_interval'] = self.DEFAULT_PROGRESS_INTERVAL;
+
+        # Leave the abort rule disabled unless both parameters are given.
+        config['abort_min_throughput'] = config.get('abort_min_throughput')
+        config['abort_after_secs'] = config.get('abort_after_secs')
+
         # Assign default operation count if none provided.  On average,
         # we do a read and an update on each record.
         if (not config.has_key('ycsb_operationcount')) or (not config['ycsb_operationcount']) \
                 or (not isinstance(config['ycsb_operationcount'], list)):
-            config['ycsb_operationcount'] = map(lambda x : 2 * x, config['ycsb_recordcount'][:]) 
+            config['ycsb_operationcount'] = map(lambda x : 2 * x, config['ycsb_recordcount'][:])
+
+        # Make sure there is always at least one placement.  Without a
+        # placements array, a single unnamed placement carries the top
+        # level settings so that log file names and collation keys are
+        # unchanged.  Named placements inherit the top level settings
+        # they don't override.
+        if (not config.has_key('placements')) or (not config['placements']):
+            config['placements'] = [{'name': None}]
+        for placement in config['placements']:
+            for setting in self.PLACEMENT_SETTINGS:
+                if (not placement.has_key(setting)) or (not placement[setting]):
+                    placement[setting] = config.get(setting) or None
+
+        # Make sure there is always at least one topology.  Without a 
+        # topologies array, a single unnamed standalone topology leaves
+        # log file names and collation keys unchanged.  Unspecified 
+        # topology settings take their defaults.
+        if (not config.has_key('topologies')) or (not config['topologies']):
+            config['topologies'] = [{'name': None, 'type': MongoTopology.TYPE_STANDALONE}]
+        for topology in config['topologies']:
+            defaults = {'hosts': [], 'base_port': self.DEFAULT_TOPOLOGY_BASE_PORT, 'config_servers': 1,
+                        'config_replset': False, 'shard_collection': 'ycsb.usertable', 'shard_key': "{_id: 'hashed'}",
+                        'members': 3 if topology['type'] == MongoTopology.TYPE_REPLSET else 1, 'shards': 2}
+            for setting, value in defaults.items():
+                if topology.get(setting) is None:
+                    topology[setting] = value
+        if (not config.has_key('topology_ready_timeout')) or (not config['topology_ready_timeout']):
+            config['topology_ready_timeout'] = self.DEFAULT_TOPOLOGY_READY_TIMEOUT;
+
+        # Make sure the ycsb_clients value is always assigned.
+        if (not config.has_key('ycsb_clients')) or (not config['ycsb_clients']):
+            config['ycsb_clients'] = self.DEFAULT_YCSB_CLIENTS;
+            
+        # Make sure cache_mode is always assigned as an array.
+        if (not config.has_key('cache_mode')) or (not config['cache_mode']):
+            config['cache_mode'] = [self.DEFAULT_CACHE_MODE]
+        elif not isinstance(config['cache_mode'], list):
+            config['cache_mode'] = [config['cache_mode']]
+        config['cache_warmup_ops'] = config.get('cache_warmup_ops')
+            
+        # Make sure the schedule values are always assigned.  A random 
+        # schedule without a seed gets one so that it can be recorded and
+        # the same order reproduced later.  Other schedules have no seed.
+        if (not config.has_key('schedule')) or (not config['schedule']):
+            config['schedule'] = self.DEFAULT_SCHEDULE;
+        if config['schedule'] != 'random':
+            config['schedule_seed'] = None
+        elif (not config.has_key('schedule_seed')) or config['schedule_seed'] is None:
+            config['schedule_seed'] = random.randint(0, 2**31 - 1)
+        if (not config.has_key('canary_interval')) or (not config['canary_interval']):
+            config['canary_interval'] = self.DEFAULT_CANARY_INTERVAL;
+        if (not config.has_key('canary_cell')) or (not config['canary_cell']):
+            config['canary_cell'] = {}
+        if (not config.has_key('canary_normalize')) or (not config['canary_normalize']):
+            config['canary_normalize'] = self.DEFAULT_CANARY_NORMALIZE;
+        if (not config.has_key('canary_drift_threshold')) or (not config['canary_drift_threshold']):
+            config['canary_drift_threshold'] = self.DEFAULT_CANARY_DRIFT_THRESHOLD;
+            
+        # Make sure the axes and filters are always assigned.
+        for parm in ['axes', 'axis_include', 'axis_exclude']:
+            if (not config.has_key(parm)) or (not config[parm]):
+                config[parm] = []
+            
+    # --------------------------------------------------------
+    # _expandCells
+    # --------------------------------------------------------
+    def _expandCells(self, config):
+        '''
+        Expand the cartesian product of the built-in and named axes
+        into a list of cells in execution order and apply the axis
+        filters.  Each cell is a dictionary with these entries:
+        
+          values          OrderedDict of every axis name to its value in the cell
+          repeat          0-based repeat iteration
+          parmsIndex      0-based index into mongo_parms
+          workload        ycsb workload file name or generated workload name
+          workloadBase    base workload file name of a generated workload, or None
+          workloadProperties  list of (property, value) pairs a generated workload sets, sorted by property
+          workloadSweep   list of (property, value) pairs of its swept properties, sorted by property
+          mongoParms      mongo_parms entry followed by any mongo_flag axis values
+          recordCount     ycsb record count
+          operationCount  ycsb operation count
+          threadCount     ycsb thread count (a threadcount ycsb_property axis overrides ycsb_threadcount)
+          placement       placement dictionary
+          topology        topologies element
+          cacheMode       page cache treatment before each ycsb phase
+          ycsbProperties  list of (property, value) pairs from ycsb_property axes
+          axisValues      list of (name, value) pairs of named axes other than threadcount
+        '''
+        builtins = [
+            [(i + 1, i) for i in range(config['series_repeat'])],
+            [(w['name'], w) for w in self._expandWorkloads(config)],
+            [(j + 1, j) for j in range(len(config['mongo_parms']))],
+            [(config['ycsb_recordcount'][k], k) for k in range(len(config['ycsb_recordcount']))],
+            [(p['name'], p) for p in config['placements']],
+            [(t['name'], t) for t in config['topologies']],
+            [(m, m) for m in config['cache_mode']],
+        ]
+        named = [[(v, v) for v in axis['values']] for axis in config['axes']]
+        
+        cells = []
+        for combination in itertools.product(*(builtins + named)):
+            values = OrderedDict()
+            for name, (value, ignored) in zip(self.BUILTIN_AXES + [a['name'] for a in config['axes']], combination):
+                values[name] = value
+            if not self._filterCell(values, config):
+                continue
+            
+            repeat, workload, j, k, placement, topology, cacheMode = [item for ignored, item in combination[:len(builtins)]]
+            cell = {
+                'values': values,
+                'repeat': repeat,
+                'parmsIndex': j,
+                'workload': workload['name'],
+                'workloadBase': workload['base'],
+                'workloadProperties': workload['properties'],
+                'workloadSweep': workload['sweep'],
+                'mongoParms': config['mongo_parms'][j],
+                'recordCount': config['ycsb_recordcount'][k],
+                'operationCount': config['ycsb_operationcount'][k],
+                'threadCount': config['ycsb_threadcount'],
+                'placement': placement,
+                'topology': topology,
+                'cacheMode': cacheMode,
+                'ycsbProperties': [],
+                'axisValues': [],
+            }
+            for axis, (value, ignored) in zip(config['axes'], combination[len(builtins):]):
+                if axis.has_key('mongo_flag'):
+                    if value is True:
+                        cell['mongoParms'] += " " + axis['mongo_flag']
+                    elif value is not False:
+                        cell['mongoParms'] += " " + axis['mongo_flag'] + " " + str(value)
+                elif axis['ycsb_property'] == 'threadcount':
+                    cell['threadCount'] = value
+                    continue
+                else:
+                    cell['ycsbProperties'].append((axis['ycsb_property'], value))
+                cell['axisValues'].append((axis['name'], value))
+            
+            # Every client needs at least one thread.
+            if cell['threadCount'] < config['ycsb_clients']:
+                msg = "A thread count of " + str(cell['threadCount']) + " can't be shared by " \
+                      + str(config['ycsb_clients']) + " ycsb_clients in configuration file " + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+            cells.append(cell)
+            
+        if not cells:
+            msg = "The axis_include and axis_exclude filters leave no cells to run in configuration file " \
+                  + SERIES_CONFIG_FILE + "."
+            raise Exception(msg)
+        self.LOG.debug("Expanded " + str(len(cells)) + " cells.")
+        return cells
+            
+    # --------------------------------------------------------
+    # _expandWorkloads
+    # --------------------------------------------------------
+    def _expandWorkloads(self, config):
+        '''
+        Expand the ycsb_workloads array into a list of workloads, each a
+        dictionary with a name, a base that is None for workload files
+        and the sorted (property, value) pairs that a generated workload
+        sets and sweeps, with values formatted for a properties file.
+        Each combination of a definition's sweep values is a workload.
+        '''
+        workloads = []
+        for workload in config['ycsb_workloads']:
+            if isinstance(workload, basestring):
+                workloads.append({'name': workload, 'base': None, 'properties': [], 'sweep': []})
+                continue
+            properties = workload.get('properties') or {}
+            sweep = workload.get('sweep') or {}
+            swept = sorted(sweep.keys())
+            sweepValues = [self._getSweepValues(sweep[prop], prop) for prop in swept]
+            for combination in itertools.product(*sweepValues):
+                sweepPairs = [(prop, self._formatProperty(value)) for prop, value in zip(swept, combination)]
+                workloads.append({
+                    'name': workload['name'],
+                    'base': workload['base'],
+                    'properties': sorted([(p, self._formatProperty(v)) for p, v in properties.items()] + sweepPairs),
+                    'sweep': sweepPairs})
+        return workloads
+
+    # --------------------------------------------------------
+    # _formatProperty
+    # --------------------------------------------------------
+    def _formatProperty(self, value):
+        '''Format a workload property value the way ycsb properties files spell it.'''
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        return str(value)
+
+    # --------------------------------------------------------
+    # _scheduleCells
+    # --------------------------------------------------------
+    def _scheduleCells(self, cells, config):
+        '''
+        Order the expanded cells according to the schedule and insert
+        canary cells.  Every cell gets a 1-based sequence number giving
+        its execution position.  Canary cells are copies of the canary
+        baseline cell with a 1-based canary number.
+        '''
+        # Choose the canary baseline before reordering so that it
+        # doesn't depend on the seed.
+        baseline = None
+        if config['canary_interval']:
+            for cell in cells:
+                if cell['repeat'] == 0 and self._matchesFilter(cell['values'], config['canary_cell']):
+                    baseline = cell
+                    break
+            if not baseline:
+                msg = "The canary_cell filter matches no cell of the first repeat in configuration file " \
+                      + SERIES_CONFIG_FILE + "."
+                raise Exception(msg)
+        
+        # Order the cells.
+        if config['schedule'] == 'random':
+            cells = list(cells)
+            random.Random(config['schedule_seed']).shuffle(cells)
+        elif config['schedule'] == 'interleave':
+            # Deal the cells of each mongo_parms entry out in turn,
+            # keeping matrix order within each entry.
+            byParms = OrderedDict()
+            for cell in cells:
+                byParms.setdefault(cell['parmsIndex'], []).append(cell)
+            interleaved = []
+            for i in range(max(len(group) for group in byParms.values())):
+                for group in byParms.values():
+                    if i < len(group):
+                        interleaved.append(group[i])
+            cells = interleaved
+        
+        # Insert a canary before every canary_interval cells and after
+        # the last one.
+        if baseline:
+            scheduled = []
+            canaries = 0
+            for i in range(len(cells)):
+                if i % config['canary_interval'] == 0:
+                    canaries += 1
+                    scheduled.append(self._makeCanary(baseline, canaries))
+                scheduled.append(cells[i])
+            scheduled.append(self._makeCanary(baseline, canaries + 1))
+            cells = scheduled
+            
+        for i in range(len(cells)):
+            cells[i]['sequence'] = i + 1
+        return cells
+    
+    # --------------------------------------------------------
+    # _makeCanary
+    # --------------------------------------------------------
+    def _makeCanary(self, baseline, number):
+        '''Return a copy of the baseline cell marked as the given canary.'''
+        canary = dict(baseline)
+        canary['canary'] = number
+        return canary
+            
+    # --------------------------------------------------------
+    # _filterCell
+    # --------------------------------------------------------
+    def _filterCell(self, values, config):
+        '''
+        Return true if a cell with the given axis values passes the
+        axis_include and axis_exclude filters.
+        '''
+        if config['axis_include'] and not [f for f in config['axis_include'] if self._matchesFilter(values, f)]:
+            return False
+        if [f for f in config['axis_exclude'] if self._matchesFilter(values, f)]:
+            return False
+        return True
+        
+    # --------------------------------------------------------
+    # _matchesFilter
+    # --------------------------------------------------------
+    def _matchesFilter(self, values, axisFilter):
+        '''
+        Return true if every axis the filter names has the filter's
+        value or one of the values in the filter's array.  An empty
+        filter matches every cell.
+        '''
+        for name, wanted in axisFilter.items():
+            if isinstance(wanted, list):
+                if values[name] not in wanted:
+                    return False
+            elif values[name] != wanted:
+                return False
+        return True
         
 # -------------------------------------------------------- 
 # Main
@@ -0,0 +1,135 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to measure
+how the throughput of soak cells, whose run phase is bounded by wall
+time, degrades over the course of the run.
+'''
+from array import array
+from collections import OrderedDict
+from mystats import stddev
+
+class SoakAnalysis(object):
+    '''
+    Soak run phases are started with -s, so their logs carry a current
+    throughput sample every 10 seconds.  Each run's samples are reduced
+    to these metrics, where X is the configured drop percentage:
+
+      initial_ops_sec                mean throughput of the first tenth of the samples
+      slope_ops_sec_per_hour         slope of a least squares line through all samples
+      slope_pct_per_hour             the slope relative to the initial throughput
+      time_to_Xpct_drop_secs         elapsed time at which the throughput, averaged over
+                                     SMOOTHING_SAMPLES samples, first fell X% below the
+                                     initial throughput; left out when it never did
+      fit_time_to_Xpct_drop_secs     elapsed time at which the fitted line falls X% below
+                                     the initial throughput; left out for flat or rising fits
+      floor_ops_sec                  mean throughput of the last quarter of the samples, the
+                                     steady state the run settled into
+      floor_ratio                    the floor relative to the initial throughput
+
+    Metrics are folded into typed arrays per key as elements are added.
+    '''
+    __slots__ = ('dropPercent', 'metrics')
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # Runs with fewer samples are too short to analyse.
+    MIN_SAMPLES = 6
+
+    # Samples averaged before comparing throughput with the drop
+    # threshold, so that a single slow interval isn't taken as a drop.
+    SMOOTHING_SAMPLES = 6
+
+    # Metrics that are ratios rather than counts.
+    RATIO_METRICS = ('slope_pct_per_hour', 'floor_ratio')
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, dropPercent):
+        self.dropPercent = dropPercent
+
+        # key -> OrderedDict of metric name -> array of values.
+        self.metrics = {}
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, key, element):
+        '''Fold the soak metrics of a collated element's run phase into its key.'''
+        if not (element.cellMeta.get('soak_secs') and element.ycsbRun):
+            return
+        values = self.getMetrics(element.ycsbRun.sampleSecs, element.ycsbRun.sampleThroughputs)
+        if not values:
+            return
+        metrics = self.metrics.setdefault(key, OrderedDict())
+        for name, value in values.items():
+            metrics.setdefault(name, array('d')).append(value)
+
+    # --------------------------------------------------------
+    # getMetrics
+    # --------------------------------------------------------
+    def getMetrics(self, secs, throughputs):
+        '''
+        Return an OrderedDict of the soak metrics of one run's samples,
+        which is empty when there are too few samples to analyse.
+        '''
+        values = OrderedDict()
+        n = len(throughputs)
+        if n < self.MIN_SAMPLES:
+            return values
+        head = throughputs[:max(1, n // 10)]
+        initial = sum(head) / len(head)
+        values['initial_ops_sec'] = initial
+
+        # Least squares line through the samples, in ops/sec per hour.
+        hours = [s / 3600.0 for s in secs]
+        meanHours = sum(hours) / n
+        meanThroughput = sum(throughputs) / n
+        spread = sum((h - meanHours) ** 2 for h in hours)
+        slope = 0.0
+        if spread > 0:
+            slope = sum((h - meanHours) * (tp - meanThroughput) for h, tp in zip(hours, throughputs)) / spread
+        intercept = meanThroughput - slope * meanHours
+        values['slope_ops_sec_per_hour'] = slope
+        if initial > 0:
+            values['slope_pct_per_hour'] = 100.0 * slope / initial
+
+        # Time until the smoothed and the fitted throughput fall below
+        # the drop threshold.
+        drop = "%gpct" % self.dropPercent
+        target = initial * (1 - self.dropPercent / 100.0)
+        window = min(self.SMOOTHING_SAMPLES, n)
+        for i in range(window - 1, n):
+            if sum(throughputs[i - window + 1:i + 1]) / window < target:
+                values['time_to_' + drop + '_drop_secs'] = secs[i]
+                break
+        if slope < 0:
+            values['fit_time_to_' + drop + '_drop_secs'] = max((target - intercept) / slope * 3600.0, 0.0)
+
+        # The steady state floor the run settled into.
+        tail = throughputs[n - max(1, n // 4):]
+        values['floor_ops_sec'] = sum(tail) / len(tail)
+        if initial > 0:
+            values['floor_ratio'] = values['floor_ops_sec'] / initial
+        return values
+
+    # --------------------------------------------------------
+    # getStats
+    # --------------------------------------------------------
+    def getStats(self, key):
+        '''
+        Return a list of (metric, average, count, stdev) for a key,
+        with values formatted as strings: ratios to two decimals and
+        other metrics truncated to integers.
+        '''
+        stats = []
+        for name, values in self.metrics.get(key, {}).items():
+            avg = sum(values) / len(values)
+            stdev = stddev(values)
+            if name in self.RATIO_METRICS:
+                stats.append((name, "%.2f" % avg, len(values), "%.2f" % stdev))
+            else:
+                stats.append((name, str(int(avg)), len(values), str(int(stdev))))
+        return stats
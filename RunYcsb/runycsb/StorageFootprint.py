@@ -0,0 +1,104 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's CollateResults script to derive
+the storage footprint and write amplification of each key from the
+disk usage and device counters the fabfile records for every cell.
+'''
+from array import array
+from collections import OrderedDict
+from mystats import stddev
+
+class StorageFootprint(object):
+    '''
+    The fabfile records these cell metadata values after each phase,
+    where phase is load or run:
+
+      <phase>_dbpath_bytes         bytes under the dbpath of every data bearing mongod
+      <phase>_journal_bytes        bytes under their journal directories
+      <phase>_disk_read_bytes      bytes read from their devices during the phase
+      <phase>_disk_written_bytes   bytes written to their devices during the phase
+      record_bytes                 logical bytes of one ycsb record (fieldcount * fieldlength)
+
+    Device counters cover everything that used the devices during the
+    phase, and replicated topologies count every member, so write
+    amplification includes replication and any other device activity.
+    Metrics are folded into typed arrays per key as elements are added.
+    '''
+    __slots__ = ('metrics',)
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    PHASES = ('load', 'run')
+
+    # Metrics that are ratios rather than byte counts.
+    RATIO_METRICS = ('load_write_amplification',)
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self):
+        # key -> OrderedDict of metric name -> array of values.
+        self.metrics = {}
+
+    # --------------------------------------------------------
+    # add
+    # --------------------------------------------------------
+    def add(self, key, element):
+        '''Fold the storage metrics of a collated element into its key.'''
+        values = self.getMetrics(element)
+        if not values:
+            return
+        metrics = self.metrics.setdefault(key, OrderedDict())
+        for name, value in values.items():
+            metrics.setdefault(name, array('d')).append(value)
+
+    # --------------------------------------------------------
+    # getMetrics
+    # --------------------------------------------------------
+    def getMetrics(self, element):
+        '''
+        Return an OrderedDict of the storage metrics of one element.
+        Metrics whose inputs weren't recorded are left out.
+        '''
+        meta = element.cellMeta
+        values = OrderedDict()
+        recordCount = element.ycsbLoad.recordCount if element.ycsbLoad else 0
+        for phase, ycsb in zip(self.PHASES, (element.ycsbLoad, element.ycsbRun)):
+            if not ycsb:
+                continue
+            for name in ('dbpath_bytes', 'journal_bytes', 'disk_read_bytes', 'disk_written_bytes'):
+                if meta.get(phase + '_' + name):
+                    values[phase + '_' + name] = float(meta[phase + '_' + name])
+            if (phase + '_dbpath_bytes') in values and recordCount > 0:
+                values[phase + '_bytes_per_record'] = values[phase + '_dbpath_bytes'] / recordCount
+
+        # Write amplification compares the bytes the devices wrote while
+        # loading with the logical bytes inserted.  Run phases mix reads,
+        # updates and inserts, so they are reported per operation.
+        if 'load_disk_written_bytes' in values and meta.get('record_bytes') and recordCount > 0:
+            values['load_write_amplification'] = values['load_disk_written_bytes'] / \
+                                                  (recordCount * float(meta['record_bytes']))
+        if 'run_disk_written_bytes' in values and element.ycsbRun.totalOps > 0:
+            values['run_written_bytes_per_op'] = values['run_disk_written_bytes'] / element.ycsbRun.totalOps
+        return values
+
+    # --------------------------------------------------------
+    # getStats
+    # --------------------------------------------------------
+    def getStats(self, key):
+        '''
+        Return a list of (metric, average, count, stdev) for a key,
+        with values formatted as strings: ratios to two decimals and
+        byte counts truncated to integers.
+        '''
+        stats = []
+        for name, values in self.metrics.get(key, {}).items():
+            avg = sum(values) / len(values)
+            stdev = stddev(values)
+            if name in self.RATIO_METRICS:
+                stats.append((name, "%.2f" % avg, len(values), "%.2f" % stdev))
+            else:
+                stats.append((name, str(int(avg)), len(values), str(int(stdev))))
+        return stats
@@ -0,0 +1,185 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's fabfile script to search the mongod
+configurations of a series for the fastest ones by successive halving,
+which spends short runs on many candidate configurations and long runs
+on the few that do well, and to resume an interrupted search from the
+results it has already stored.
+'''
+import json, math, os
+from collections import OrderedDict
+from datetime import datetime
+from mystats import stddev
+
+class TuningSearch(object):
+    '''
+    Candidates are searched in rungs.  Every rung but the last runs
+    each remaining candidate with a run phase eta times shorter than
+    the next rung's, and keeps the 1/eta of them with the highest mean
+    run throughput, but never fewer than keep.  The last rung runs the
+    remaining candidates, at most keep of them, with the full operation
+    count and repeats them so that the best configurations are reported
+    with their variance.
+
+    Each completed run appends a JSON-lines record to the state file:
+
+      {"candidate": "--storageEngine wiredTiger --wiredTigerCacheSizeGB 4", "context": "workload=workloada|...",
+       "log": "ycsb-...", "operationcount": 100000, "repeat": 0, "rung": 1, "throughput": 41234, "time": "..."}
+
+    The throughput is null for runs that failed, which rank last.  Runs
+    found in the state file aren't run again, and since the same results
+    lead to the same selections, a resumed search picks up where it
+    stopped.
+    '''
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # The JSON-lines file in the series log directory that
+    # receives the result of every run of the search.
+    STATE_FILENAME = "RunYcsb-tuning.jsonl"
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, eta, keep, stateFile=None, append=None):
+        '''
+        Results are read from and appended to stateFile when it's given.
+        When append is given, as for a file on another host, results are
+        appended by calling it with the file name and the record's line,
+        and the caller reads the file's lines into the search with load.
+        '''
+        self.eta = eta
+        self.keep = keep
+        self.stateFile = stateFile
+        self.append = append
+
+        # (context, candidate, rung) -> OrderedDict of repeat -> throughput or None.
+        self.results = {}
+        if stateFile and (not append) and os.path.isfile(stateFile):
+            with open(stateFile, 'r') as f:
+                self.load(f)
+
+    # --------------------------------------------------------
+    # load
+    # --------------------------------------------------------
+    def load(self, lines):
+        '''Add the results of the lines of a state file.'''
+        for line in lines:
+            if line.strip():
+                record = json.loads(line)
+                self._add(record['context'], record['candidate'], record['rung'], record['repeat'],
+                          record['throughput'])
+
+    # --------------------------------------------------------
+    # getRungCount
+    # --------------------------------------------------------
+    def getRungCount(self, candidates):
+        '''Return the number of rungs that select candidates, before the last rung.'''
+        rungs = 0
+        while candidates > self.keep:
+            candidates = self._survivors(candidates)
+            rungs += 1
+        return rungs
+
+    # --------------------------------------------------------
+    # getOperationCount
+    # --------------------------------------------------------
+    def getOperationCount(self, rung, rungs, fullOps, minOps):
+        '''
+        Return the run phase operation count of a rung, which is the
+        full count at the last rung and eta times less at each rung
+        below it, but never less than minOps.
+        '''
+        return min(fullOps, max(fullOps // self.eta ** (rungs - rung), minOps))
+
+    # --------------------------------------------------------
+    # hasRun
+    # --------------------------------------------------------
+    def hasRun(self, context, candidate, rung, repeat):
+        return repeat in self.results.get((context, candidate, rung), {})
+
+    # --------------------------------------------------------
+    # record
+    # --------------------------------------------------------
+    def record(self, context, candidate, rung, repeat, operationCount, throughput, log):
+        '''Store the run throughput of a candidate, None if the run failed.'''
+        self._add(context, candidate, rung, repeat, throughput)
+        if self.stateFile:
+            record = OrderedDict([('context', context), ('candidate', candidate), ('rung', rung),
+                                  ('repeat', repeat), ('operationcount', operationCount),
+                                  ('throughput', throughput), ('log', log), ('time', datetime.now().isoformat())])
+            if self.append:
+                self.append(self.stateFile, json.dumps(record, sort_keys=True))
+            else:
+                with open(self.stateFile, 'a') as f:
+                    f.write(json.dumps(record, sort_keys=True) + "\n")
+
+    # --------------------------------------------------------
+    # select
+    # --------------------------------------------------------
+    def select(self, context, candidates, rung):
+        '''
+        Return the candidates that go on to the next rung, in their
+        original order.  Ties, as in a dry run, keep the earlier one.
+        '''
+        ranked = sorted(range(len(candidates)), key=lambda i: (-self._score(context, candidates[i], rung), i))
+        return [candidates[i] for i in sorted(ranked[:self._survivors(len(candidates))])]
+
+    # --------------------------------------------------------
+    # getStats
+    # --------------------------------------------------------
+    def getStats(self, context, candidate, rung):
+        '''
+        Return the (average, count, stdev) of a candidate's completed
+        runs in a rung, truncated to integers, or None without any.
+        '''
+        values = [t for t in self.results.get((context, candidate, rung), {}).values() if t is not None]
+        if not values:
+            return None
+        return int(sum(values) / len(values)), len(values), int(stddev(values))
+
+    # --------------------------------------------------------
+    # getReport
+    # --------------------------------------------------------
+    def getReport(self, context, finalists, rungs):
+        '''
+        Return the lines that rank the finalists of a context by their
+        last rung throughput, each followed by its lower rung results.
+        '''
+        lines = ['------ tuning ' + context]
+        ranked = sorted(finalists, key=lambda c: -self._score(context, c, rungs))
+        for place, candidate in enumerate(ranked):
+            stats = self.getStats(context, candidate, rungs)
+            line = str(place + 1) + ". " + candidate + ": "
+            if stats:
+                line += str(stats[0]) + " ops/s (stdev " + str(stats[2]) + ", " + str(stats[1]) + " runs)"
+            else:
+                line += "no completed runs"
+            lines.append(line)
+            for rung in range(rungs):
+                stats = self.getStats(context, candidate, rung)
+                if stats:
+                    lines.append("   rung " + str(rung) + ": " + str(stats[0]) + " ops/s (" + str(stats[1]) + " runs)")
+        return lines
+
+    # --------------------------------------------------------
+    # _add
+    # --------------------------------------------------------
+    def _add(self, context, candidate, rung, repeat, throughput):
+        self.results.setdefault((context, candidate, rung), OrderedDict())[repeat] = throughput
+
+    # --------------------------------------------------------
+    # _score
+    # --------------------------------------------------------
+    def _score(self, context, candidate, rung):
+        '''Return the mean throughput of a candidate in a rung, -1 without completed runs.'''
+        stats = self.getStats(context, candidate, rung)
+        return stats[0] if stats else -1
+
+    # --------------------------------------------------------
+    # _survivors
+    # --------------------------------------------------------
+    def _survivors(self, candidates):
+        return min(candidates, max(self.keep, int(math.ceil(float(candidates) / self.eta))))
@@ -0,0 +1,209 @@
+'''
+Created on Oct 19, 2026
+
+This class is used by the RunYcsb's fabfile script to follow the
+progress of a running ycsb phase.  It parses the status lines that
+ycsb writes every 10 seconds when started with -s, turns them into
+progress events and decides when a phase should be aborted.
+'''
+import json, logging, re
+from datetime import datetime
+
+class YcsbMonitor(object):
+    '''
+    One monitor follows one ycsb load or run phase.
+    '''
+    __slots__ = ('cell', 'phase', 'totalOps', 'minThroughput', 'abortAfterSecs', 'eventFile', 'append',
+                 'elapsedSecs', 'operations', 'throughput', 'belowSince', 'abortReason', 'statusTime')
+
+    # --------------------------------------------------------
+    # Constants
+    # --------------------------------------------------------
+    # The JSON-lines file in the series log directory that
+    # receives all progress events.
+    EVENT_FILENAME = "RunYcsb-progress.jsonl"
+
+    # Status lines look like one of the following depending on
+    # the ycsb version:
+    #
+    #  10 sec: 112170 operations; 11216.58 current ops/sec; [INSERT AverageLatency(us)=702.3]
+    #  2015-01-05 10:12:01:123 10 sec: 112170 operations; 11216.6 current ops/sec; est completion in 1 hour ...
+    #
+    STATUS_PATTERN = re.compile(r'(\d+) sec: (\d+) operations;(?: ([\d.]+) current ops/sec;)?')
+
+    # Seconds between ycsb status lines.  A phase only counts as silent
+    # once at least two status lines are overdue.
+    STATUS_INTERVAL_SECS = 10
+
+    # --------------------------------------------------------
+    # Class Variables
+    # --------------------------------------------------------
+    # Set the log level here.
+    LOG = logging.getLogger('YcsbMonitor')
+    LOG.setLevel(logging.INFO)
+    LOG.addHandler(logging.StreamHandler())
+
+    # --------------------------------------------------------
+    # Constructor
+    # --------------------------------------------------------
+    def __init__(self, cell, phase, totalOps, minThroughput=None, abortAfterSecs=None, eventFile=None,
+                 append=None):
+        '''
+        The cell names the matrix cell being run, phase is load or run
+        and totalOps is the number of operations the phase will execute.
+        The phase is aborted when the current throughput stays below
+        minThroughput for at least abortAfterSecs seconds, or when ycsb
+        writes no new status for that long, as when it hangs.  Events
+        are appended to eventFile when it's given, by calling append
+        with the file name and the event's line when that's given, as
+        for a file on another host, and on this host otherwise.
+        '''
+        self.cell = cell
+        self.phase = phase
+        self.totalOps = totalOps
+        self.minThroughput = minThroughput
+        self.abortAfterSecs = abortAfterSecs
+        self.eventFile = eventFile
+        self.append = append
+
+        # Latest status seen in the log.
+        self.elapsedSecs = 0
+        self.operations = 0
+        self.throughput = None
+
+        # The ycsb elapsed time at which throughput first dropped
+        # below the minimum, or None while throughput is acceptable.
+        self.belowSince = None
+        self.abortReason = None
+
+        # The wall clock time at which the phase started or the status
+        # last advanced.
+        self.statusTime = datetime.now()
+
+    # --------------------------------------------------------
+    # start
+    # --------------------------------------------------------
+    def start(self):
+        '''Announce the start of the phase.'''
+        self.statusTime = datetime.now()
+        self._emit({'event': 'phase_start', 'total_ops': self.totalOps})
+
+    # --------------------------------------------------------
+    # update
+    # --------------------------------------------------------
+    def update(self, texts):
+        '''
+        Update the monitor from the tail of the ycsb log, or from the
+        tails of all client logs when a phase runs several ycsb clients.
+        Only the last status line of each tail is used.  The clients'
+        operations and current rates are summed.  A progress event is
+        emitted and returned when the status has advanced, otherwise
+        None is returned.
+        '''
+        if isinstance(texts, basestring):
+            texts = [texts]
+        statuses = []
+        for text in texts:
+            matches = self.STATUS_PATTERN.findall(text)
+            if matches:
+                statuses.append(matches[-1])
+        elapsed = max(int(status[0]) for status in statuses) if statuses else 0
+        if (not statuses) or (elapsed <= self.elapsedSecs and self.throughput is not None):
+            self._checkSilence()
+            return None
+        self.statusTime = datetime.now()
+
+        # Older ycsb versions don't always print the current rate, so
+        # fall back to the rate since the previous status line.
+        operations = sum(int(status[1]) for status in statuses)
+        if all(status[2] for status in statuses):
+            throughput = sum(float(status[2]) for status in statuses)
+        elif elapsed > self.elapsedSecs:
+            throughput = float(operations - self.operations) / (elapsed - self.elapsedSecs)
+        else:
+            throughput = 0.0
+        self.elapsedSecs = elapsed
+        self.operations = operations
+        self.throughput = throughput
+
+        # Estimate completion from the average rate of the phase so far.
+        eta = None
+        if operations > 0 and self.totalOps > operations:
+            eta = int((self.totalOps - operations) * float(elapsed) / operations)
+
+        # Track how long throughput has been below the minimum.
+        if self.minThroughput is not None and self.abortAfterSecs is not None:
+            if throughput < self.minThroughput:
+                if self.belowSince is None:
+                    self.belowSince = elapsed
+                if elapsed - self.belowSince >= self.abortAfterSecs:
+                    self.abortReason = "throughput below " + str(self.minThroughput) + " ops/sec for " + \
+                                       str(elapsed - self.belowSince) + " sec"
+            else:
+                self.belowSince = None
+
+        return self._emit({'event': 'progress', 'elapsed_sec': elapsed, 'operations': operations,
+                           'throughput': round(throughput, 1), 'eta_sec': eta})
+
+    # --------------------------------------------------------
+    # shouldAbort
+    # --------------------------------------------------------
+    def shouldAbort(self):
+        '''Return true when the abort rule has been triggered.'''
+        return self.abortReason is not None
+
+    # --------------------------------------------------------
+    # finish
+    # --------------------------------------------------------
+    def finish(self):
+        '''Announce the end of the phase, whether it completed or was aborted.'''
+        if self.shouldAbort():
+            self._emit({'event': 'abort', 'elapsed_sec': self.elapsedSecs, 'reason': self.abortReason})
+        else:
+            self._emit({'event': 'phase_end', 'elapsed_sec': self.elapsedSecs, 'operations': self.operations})
+
+    # --------------------------------------------------------
+    # _checkSilence
+    # --------------------------------------------------------
+    def _checkSilence(self):
+        '''
+        Trigger the abort rule when ycsb has written no new status for
+        abortAfterSecs of wall clock time, which the throughput rule
+        can't see since it only runs on new status lines.
+        '''
+        if self.minThroughput is None or self.abortAfterSecs is None:
+            return
+        silentSecs = (datetime.now() - self.statusTime).total_seconds()
+        if silentSecs >= max(self.abortAfterSecs, 2 * self.STATUS_INTERVAL_SECS):
+            self.abortReason = "no new status for " + str(int(silentSecs)) + " sec"
+
+    # --------------------------------------------------------
+    # _emit
+    # --------------------------------------------------------
+    def _emit(self, event):
+        '''
+        Stamp an event with the cell and phase, write it to the
+        console and append it to the event file.
+        '''
+        event['time'] = datetime.now().isoformat()
+        event['cell'] = self.cell
+        event['phase'] = self.phase
+
+        # Console line.
+        msg = ">>>> " + self.phase + " " + self.cell + ": " + event['event']
+        if event['event'] == 'progress':
+            msg += " " + str(event['elapsed_sec']) + " sec, " + str(event['operations']) + " ops, " + \
+                   str(event['throughput']) + " ops/sec"
+            if event['eta_sec'] is not None:
+                msg += ", eta " + str(event['eta_sec']) + " sec"
+        elif event['event'] == 'abort':
+            msg += " (" + event['reason'] + ")"
+        self.LOG.info(msg)
+
+        # JSON-lines record.
+        if self.eventFile and self.append:
+            self.append(self.eventFile, json.dumps(event, sort_keys=True))
+        elif self.eventFile:
+            with open(self.eventFile, 'a') as f:
+                f.write(json.dumps(event, sort_keys=True) + "\n")
+        return event
@@ -10,10 +10,18 @@ reside in the same directory as this script.
 
 # Imports
 from SeriesEnv import SeriesEnv
-import sys, os
-from datetime import datetime
+from CollateElement import CollateElement
+from HostInventory import HostInventory
+from YcsbMonitor import YcsbMonitor
+from MongoTopology import MongoTopology
+from LatencyCurve import LatencyCurve
+from PhaseTimer import PhaseTimer
+from TuningSearch import TuningSearch
+import sys, os, re, pipes, json, random
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from time import sleep
-from fabric.api import run, settings, env
+from fabric.api import run, settings, env, hide
 from fabric.main import main
 
 # Sample commands.
@@ -29,6 +37,18 @@ from fabric.main import main
 # read from the configuration json file.
 seriesEnv = SeriesEnv()  
 
+# Times each phase of each cell, recording to the timing file in the
+# log directory on the target host except in a dry run.
+phaseTimer = PhaseTimer(None if seriesEnv.seriesConfig['dry_run'] else
+                        os.path.join(seriesEnv.logpath, PhaseTimer.TIMING_FILENAME),
+                        lambda fileName, line: _append_line(fileName, line))
+
+# Seconds an interrupted profiler is given to write its output.
+PROFILER_STOP_SECS = 60
+
+# Extension of the workload files generated for each cell.
+WORKLOAD_EXTENSION = ".properties"
+
 # -------------------------------------------------------- 
 # run_all
 # --------------------------------------------------------
@@ -49,51 +69,196 @@ def run_mongo():
     """
     starttime = datetime.now()
     print('>> Starting run_mongo [' + str(starttime) + ']') 
-    _mongo_stop()
-    _mongo_setup()
-    _mongo_clean()  
-    
-    # Run the command sequence for each record count, for each set of mongo parms,
-    # for each workload.  Repeat this whole suite series_repeat times.  The log files
-    # produced are named <storageEngine><repeat iteration>_<mongo parm index>.  For
-    # example wt1_2 indicates the first iteration of a wiredTiger execution using the 
-    # second mongo parameter set as they appear in the mongo_parms list. 
-    #
-    # We know the recordCount and operationCount arrays are the same non-zero length, 
-    # so the inner loop is sound.
-    for repeat in range(seriesEnv.seriesConfig['series_repeat']):
-        for workload in seriesEnv.seriesConfig['ycsb_workloads']:
-            for j in range(len(seriesEnv.seriesConfig['mongo_parms'])):
-                for k in range(len(seriesEnv.seriesConfig['ycsb_recordcount'])):
-                    # Get the corresponding counts from the two arrays.
-                    recordCount = seriesEnv.seriesConfig['ycsb_recordcount'][k]
-                    operationCount = seriesEnv.seriesConfig['ycsb_operationcount'][k]
-                
-                    # Determine the storage abbreviation for file naming.
-                    mongoParms = seriesEnv.seriesConfig['mongo_parms'][j]
-                    storageAbbrev = _getStorageAbbreviation(mongoParms, repeat, j)
-                
-                    # Start mongo, load and run ycsb, and clean up.
-                    _mongo_start(recordCount, mongoParms, workload, storageAbbrev)
-                    _ycsb('load', 'mongodb', recordCount, operationCount, workload, storageAbbrev)
-                    _ycsb('run', 'mongodb', recordCount, operationCount, workload, storageAbbrev)
-                    _mongo_stop()
-                    _mongo_clean()
+    _make_logpath()
+    print('>> Schedule ' + _schedule_description() + ', ' + str(len(seriesEnv.cells)) + ' cells')
+    with phaseTimer.phase('stop'):
+        _mongo_stop()
+    with phaseTimer.phase('setup'):
+        _mongo_setup()
+    with phaseTimer.phase('inventory'):
+        _capture_inventory()
+    with phaseTimer.phase('clean'):
+        _mongo_clean()  
+    
+    # Run the command sequence for each cell of the benchmark matrix.  SeriesEnv
+    # expands the matrix over each record count, for each set of mongo parms, for
+    # each workload and repeats this whole suite series_repeat times.  Placements,
+    # topologies and any named axes are expanded innermost.  The log files produced are named
+    # <storageEngine><repeat iteration>_<mongo parm index>.  For example wt1_2 
+    # indicates the first iteration of a wiredTiger execution using the second 
+    # mongo parameter set as they appear in the mongo_parms list.  Named placements,
+    # named topologies and named axis values are added to the end of the log file names.
+    for cell in seriesEnv.cells:
+        _run_cell(cell)
+    phaseTimer.setCell(None)
 
     endtime = datetime.now()
+    print('\n' + '\n'.join(phaseTimer.getReport()))
     print('\n>>>> Completing run_mongo [' + str(endtime) + ', duration = ' + str(endtime-starttime) + ']') 
     
+# -------------------------------------------------------- 
+# run_tuning
+# --------------------------------------------------------
+def run_tuning():
+    """
+    Search the mongod configurations of the series for the fastest
+    ones by successive halving instead of running every cell.  The 
+    candidates are the configurations that mongo_parms and the 
+    mongo_flag axes expand to, and each combination of the other axes
+    is searched separately.  Each rung of the search is a named axis,
+    rung, of the cells it runs, so collation keeps the rungs apart.
+    Runs recorded in the tuning state file by an earlier invocation 
+    are not run again.
+    """
+    starttime = datetime.now()
+    config = seriesEnv.seriesConfig
+    print('>> Starting run_tuning [' + str(starttime) + ']') 
+    _make_logpath()
+    print('>> Tuning eta ' + str(config['tuning_eta']) + ', keep ' + str(config['tuning_keep']) + 
+          ', seed ' + str(config['tuning_seed']))
+    search = TuningSearch(config['tuning_eta'], config['tuning_keep'], None if config['dry_run'] else
+                          os.path.join(seriesEnv.logpath, TuningSearch.STATE_FILENAME), _append_line)
+    if search.stateFile:
+        search.load(_read_lines(search.stateFile))
+    with phaseTimer.phase('stop'):
+        _mongo_stop()
+    with phaseTimer.phase('setup'):
+        _mongo_setup()
+    with phaseTimer.phase('inventory'):
+        _capture_inventory()
+    with phaseTimer.phase('clean'):
+        _mongo_clean()  
+    
+    # Sequence numbers are assigned to every planned run, whether it
+    # runs now or ran before, so that they are the same on resume.
+    sequence = 0
+    reports = []
+    for context, candidates in _tuning_contexts().items():
+        names = [c['mongoParms'] for c in candidates]
+        byName = dict(zip(names, candidates))
+        rungs = search.getRungCount(len(names))
+        print('\n>>>> Tuning ' + context + ': ' + str(len(names)) + ' candidates, ' + str(rungs + 1) + ' rungs')
+        for rung in range(rungs + 1):
+            repeats = config['tuning_final_repeats'] if rung == rungs else config['tuning_repeats']
+            for name in names:
+                for repeat in range(repeats):
+                    sequence += 1
+                    if search.hasRun(context, name, rung, repeat):
+                        continue
+                    cell = dict(byName[name])
+                    cell['repeat'] = repeat
+                    cell['sequence'] = sequence
+                    cell['operationCount'] = search.getOperationCount(rung, rungs, cell['operationCount'],
+                                                                      config['tuning_min_operationcount'])
+                    cell['axisValues'] = cell['axisValues'] + [(SeriesEnv.TUNING_RUNG_AXIS, rung)]
+                    throughput = None
+                    if _run_cell(cell, False):
+                        with phaseTimer.phase('probe'):
+                            results = _read_run_results(cell)
+                        if results and results[0]:
+                            throughput = results[0].throughput
+                    search.record(context, name, rung, repeat, cell['operationCount'], throughput, 
+                                  _make_log_filename('ycsb', cell))
+            if rung < rungs:
+                names = search.select(context, names, rung)
+        reports.append(search.getReport(context, names, rungs))
+    phaseTimer.setCell(None)
+    
+    endtime = datetime.now()
+    for report in reports:
+        print('\n' + '\n'.join(report))
+    print('\n' + '\n'.join(phaseTimer.getReport()))
+    print('\n>>>> Completing run_tuning [' + str(endtime) + ', duration = ' + str(endtime-starttime) + ']') 
+
+# -------------------------------------------------------- 
+# _tuning_contexts
+# --------------------------------------------------------
+def _tuning_contexts():
+    """
+    Group the cells of the first repeat by the values of their axes
+    other than parms and the mongo_flag axes, and by their workload 
+    sweep values, and return an OrderedDict that maps a name made of
+    those values, leaving out unnamed placements and topologies, to
+    the cells of the group,
+    which are the group's candidate configurations.  Groups with more
+    than tuning_candidates cells are sampled down to that many.
+    """
+    config = seriesEnv.seriesConfig
+    mongoAxes = ['repeat', 'parms'] + [a['name'] for a in config['axes'] if a.has_key('mongo_flag')]
+    contexts = OrderedDict()
+    for cell in seriesEnv.cells:
+        if cell['repeat'] == 0 and not cell.get('canary'):
+            context = "|".join([name + "=" + str(value) for name, value in cell['values'].items()
+                                if name not in mongoAxes and value is not None] + 
+                               [prop + "=" + value for prop, value in cell['workloadSweep']])
+            contexts.setdefault(context, []).append(cell)
+    sampler = random.Random(config['tuning_seed'])
+    for context, candidates in contexts.items():
+        if config['tuning_candidates'] and len(candidates) > config['tuning_candidates']:
+            chosen = sorted(sampler.sample(range(len(candidates)), config['tuning_candidates']))
+            contexts[context] = [candidates[i] for i in chosen]
+    return contexts
+
+# -------------------------------------------------------- 
+# _run_cell
+# --------------------------------------------------------
+def _run_cell(cell, ladder=True):
+    """
+    Run one cell: generate its workload file if its workload is
+    generated, start mongo, load and run ycsb, and clean up.  An
+    aborted load leaves nothing worth measuring, so the run is skipped.
+    A topology that doesn't come up is recorded as a failed cell.
+    Target rate ladders run on the same loaded data after the 
+    unthrottled run unless ladder is False.  The manifest records the 
+    cell's parameters for collation once it has run.  True is returned
+    when the run phase completed.
+    """
+    # Determine the storage abbreviation for file naming from the mongo_parms
+    # entry, so that every cell of an entry shares it whatever flags
+    # mongo_flag axes add.
+    # Canary cells are numbered by canary rather than by repeat.
+    mongoParms = seriesEnv.seriesConfig['mongo_parms'][cell['parmsIndex']]
+    if cell.get('canary'):
+        cell['storageAbbrev'] = _getStorageAbbreviation(mongoParms, cell['canary'] - 1, cell['parmsIndex'], True)
+    else:
+        cell['storageAbbrev'] = _getStorageAbbreviation(mongoParms, cell['repeat'], cell['parmsIndex'])
+    phaseTimer.setCell(_make_cell_name(cell), cell['sequence'])
+
+    # The ycsb phases are timed by _ycsb.
+    cell['mongoTopology'] = MongoTopology(cell['topology'], env.host, seriesEnv.dbpath)
+    cellStart = datetime.now()
+    completed = False
+    if cell['workloadBase']:
+        with phaseTimer.phase('workload'):
+            _write_workload(cell)
+    with phaseTimer.phase('start'):
+        started = _mongo_start(cell)
+    if started:
+        if _ycsb('load', 'mongodb', cell):
+            completed = _ycsb('run', 'mongodb', cell)
+            if completed and ladder:
+                _target_ladder(cell)
+    with phaseTimer.phase('manifest'):
+        _write_manifest(cell, cellStart, datetime.now())
+    with phaseTimer.phase('stop'):
+        _mongo_stop(cell)
+    with phaseTimer.phase('clean'):
+        _mongo_clean(cell)
+    return completed
+
 # -------------------------------------------------------- 
 # mongo_clean
 # --------------------------------------------------------
-def _mongo_clean():
+def _mongo_clean(cell=None):
     """
-    Remove all existing mongodb databases.
+    Remove all existing mongodb databases on the hosts of the
+    cell's topology, or of every topology when no cell is given.
     """
     starttime = datetime.now()
     print('\n>>>> Starting mongo_clean [' + str(starttime) + ']') 
-    with settings(warn_only=True):
-        _cond_run("rm -rf %s/*" % seriesEnv.dbpath)
+    for host in _topology_hosts(cell):
+        with settings(host_string=host, warn_only=True):
+            _cond_run("rm -rf %s/*" % seriesEnv.dbpath)
 
 # -------------------------------------------------------- 
 # mongo_setup
@@ -115,73 +280,766 @@ def _mongo_setup():
         if run("test -d %s" % seriesEnv.dbpath).failed:
             _cond_run("mkdir -p %s" % seriesEnv.dbpath)
   
+# -------------------------------------------------------- 
+# _make_logpath
+# --------------------------------------------------------
+def _make_logpath():
+    """
+    Create the log directory on the target host ahead of setup, 
+    since it receives the phase timing records from the first phase
+    on.  Nothing is written in a dry run.
+    """
+    if not seriesEnv.seriesConfig['dry_run']:
+        with settings(hide('running', 'stdout')):
+            run("mkdir -p " + seriesEnv.logpath)
+  
+# -------------------------------------------------------- 
+# _capture_inventory
+# --------------------------------------------------------
+def _capture_inventory():
+    """
+    Capture the cpu, memory, disk, kernel and mongod version of every
+    host of the configured topologies, and the ycsb version on this
+    host, into the inventory file in the log directory.  Collation 
+    uses it to normalise throughput by cores and memory and to flag
+    results from different hardware.  Nothing is captured in a dry run.
+    """
+    starttime = datetime.now()
+    print('\n>>>> Starting capture_inventory [' + str(starttime) + ']') 
+    inventory = HostInventory(controller=env.host, captured=starttime.isoformat())
+    hosts = _topology_hosts(None)
+    if env.host not in hosts:
+        hosts.append(env.host)
+    mongodPath = os.path.join(seriesEnv.seriesConfig['mongo_bin_path'], 'mongod')
+    for host in hosts:
+        ycsbHome = None
+        if host == env.host and seriesEnv.seriesConfig['load_generator'] != 'python':
+            ycsbHome = os.path.normpath(os.path.join(seriesEnv.seriesConfig['ycsb_bin_path'], '..'))
+        cmd = HostInventory.getScript(seriesEnv.dbpath, mongodPath, ycsbHome)
+        if seriesEnv.seriesConfig['dry_run']:
+            print(cmd)
+            continue
+        with settings(hide('running', 'stdout', 'warnings'), host_string=host, warn_only=True):
+            inventory.add(host, HostInventory.parse(run(cmd)))
+    if seriesEnv.seriesConfig['dry_run']:
+        return
+    inventoryFile = os.path.join(seriesEnv.logpath, HostInventory.INVENTORY_FILENAME)
+    _cond_run("echo " + pipes.quote(json.dumps(inventory.getDocument())) + " > " + inventoryFile)
+    
 # -------------------------------------------------------- 
 # mongo_start
 # --------------------------------------------------------
-def _mongo_start(recordCount, mongoParms, workload, storageAbbrev):
+def _mongo_start(cell):
     """
-    Start mongod in the background.
+    Start the cell's mongod processes, and its mongos if the cell
+    runs against a sharded cluster, in the background.  A standalone
+    mongod is given 10 seconds to start.  The processes of other 
+    topologies are polled until they answer, joined together and 
+    polled again until the topology is ready.  False is returned and
+    the cell is marked as failed when that takes longer than the 
+    topology_ready_timeout.
     """
     starttime = datetime.now()
     print('\n>>>> Starting run_mongo [' + str(starttime) + ']') 
-    
-    # Start command string.
-    mongoCmd = os.path.join(seriesEnv.seriesConfig['mongo_bin_path'], 'mongod')
-    mongoCmd += " --dbpath " + seriesEnv.dbpath 
-    
-    # Add log file.
-    # Determine storage engine abbreviation for log naming purposes.
-    mongoCmd += " --logpath " + os.path.join(seriesEnv.logpath, 
-                _make_log_filename('mongod', storageAbbrev, recordCount,
-                     seriesEnv.seriesConfig['ycsb_threadcount'], workload))
-    
-    # Add all other parms.
-    mongoCmd += " " + mongoParms
-    mongoCmd += " --fork" 
-    _cond_run(mongoCmd)
-    if (not seriesEnv.seriesConfig['dry_run']):
-        sleep(10)
+    topology = cell['mongoTopology']
+    for process in topology.getProcesses():
+        # Start command string.  The forked process inherits the cpu
+        # affinity and memory policy of the placement prefix.
+        mongoCmd = _placement_prefix(cell['placement'], 'mongo')
+        mongoCmd += os.path.join(seriesEnv.seriesConfig['mongo_bin_path'], process['program'])
+        if process['port']:
+            mongoCmd += " --port " + str(process['port'])
+        if process['dbpath']:
+            mongoCmd += " --dbpath " + process['dbpath'] 
+        if process['replSet']:
+            mongoCmd += " --replSet " + process['replSet']
+        if process['args']:
+            mongoCmd += " " + process['args']
+        
+        # Add log file.
+        # Determine storage engine abbreviation for log naming purposes.
+        mongoCmd += " --logpath " + os.path.join(seriesEnv.logpath, _make_process_log_filename(process, cell))
+        
+        # Add all other parms, including those of mongo_flag axes.
+        if process['role'] == 'data':
+            mongoCmd += " " + cell['mongoParms']
+        mongoCmd += " --fork" 
+        with settings(host_string=process['host']):
+            if process['dbpath'] and not topology.isStandalone():
+                _cond_run("mkdir -p " + process['dbpath'] + " " + seriesEnv.logpath)
+            _cond_run(mongoCmd)
+    if topology.isStandalone():
+        if (not seriesEnv.seriesConfig['dry_run']):
+            sleep(10)
+        return True
+        
+    # Wait for every process to answer, then join them together.
+    deadline = datetime.now() + timedelta(seconds=seriesEnv.seriesConfig['topology_ready_timeout'])
+    for process in topology.getProcesses():
+        if not _mongo_wait(process, 'db.adminCommand({ping: 1}).ok == 1', deadline):
+            return _mongo_failed(cell, process)
+    for process, script, readyScript in topology.getInitSteps():
+        _mongo_eval(process, script)
+        if not _mongo_wait(process, readyScript, deadline):
+            return _mongo_failed(cell, process)
+    return True
+
+# -------------------------------------------------------- 
+# _mongo_eval
+# --------------------------------------------------------
+def _mongo_eval(process, script):
+    """
+    Evaluate a mongo shell script against a topology process and
+    return its output.  Nothing is evaluated in a dry run.
+    """
+    cmd = os.path.join(seriesEnv.seriesConfig['mongo_bin_path'], 'mongo')
+    cmd += " --quiet --host " + process['host'] + " --port " + str(process['port'])
+    cmd += " --eval " + pipes.quote(script)
+    if seriesEnv.seriesConfig['dry_run']:
+        print(cmd)
+        return None
+    with settings(hide('running', 'stdout', 'warnings'), warn_only=True):
+        return run(cmd).strip()
+
+# -------------------------------------------------------- 
+# _mongo_wait
+# --------------------------------------------------------
+def _mongo_wait(process, readyScript, deadline):
+    """
+    Poll a topology process every second until the ready script
+    prints true, returning False if the deadline passes first.
+    """
+    output = _mongo_eval(process, readyScript)
+    while output is not None and (not output.endswith("true")):
+        if datetime.now() > deadline:
+            return False
+        sleep(1)
+        output = _mongo_eval(process, readyScript)
+    return True
+
+# -------------------------------------------------------- 
+# _mongo_failed
+# --------------------------------------------------------
+def _mongo_failed(cell, process):
+    """Mark a cell whose topology didn't come up as failed."""
+    reason = "topology " + cell['topology']['name'] + " not ready at " + process['name'] + " after " + \
+             str(seriesEnv.seriesConfig['topology_ready_timeout']) + " sec"
+    print('\n>>>> ' + reason)
+    logfile = os.path.join(seriesEnv.logpath, _make_log_filename('ycsb', cell))
+    _log_cell_meta(logfile, 'topology', cell['topology']['name'])
+    _log_cell_meta(logfile, 'failed', 'start: ' + reason)
+    return False
 
 # -------------------------------------------------------- 
 # mongo_stop
 # --------------------------------------------------------
-def _mongo_stop():
-    """Stop all mongod instances"""
+def _mongo_stop(cell=None):
+    """
+    Stop all mongod instances, and all mongos instances when a sharded
+    topology is configured, on the hosts of the cell's topology or of
+    every topology when no cell is given.
+    """
     starttime = datetime.now()
     print('\n>>>> Starting mongo_stop [' + str(starttime) + ']')
+    programs = 'mongod'
+    if [t for t in seriesEnv.seriesConfig['topologies'] if t['type'] == MongoTopology.TYPE_SHARDED]:
+        programs += ' mongos'
     # The -9 is key in avoiding timing issues by specifying
     # a more immediate shutdown of mongod. 
-    with settings(warn_only=True):
-        _cond_run('killall -9 mongod')
-        if (not seriesEnv.seriesConfig['dry_run']):
-            sleep(10)
+    for host in _topology_hosts(cell):
+        with settings(host_string=host, warn_only=True):
+            _cond_run('killall -9 ' + programs)
+    if (not seriesEnv.seriesConfig['dry_run']):
+        sleep(10)
+
+# -------------------------------------------------------- 
+# _topology_hosts
+# --------------------------------------------------------
+def _topology_hosts(cell):
+    """
+    Return the hosts that run the cell's topology, or that run any
+    of the configured topologies when no cell is given.
+    """
+    if cell:
+        return cell['mongoTopology'].getHosts()
+    hosts = []
+    for topology in seriesEnv.seriesConfig['topologies']:
+        for host in MongoTopology(topology, env.host, seriesEnv.dbpath).getHosts():
+            if host not in hosts:
+                hosts.append(host)
+    return hosts
 
 # -------------------------------------------------------- 
 # _ycsb
 # --------------------------------------------------------
-def _ycsb(action, product, recordCount, operationCount, workload, storageAbbrev):
-    """Execute ycsb load or run actions."""
+def _ycsb(action, product, cell, target=None):
+    """
+    Execute ycsb load or run actions.  A run with a target rate is a
+    step of a target rate ladder, which ycsb paces with -target.
+    """
     starttime = datetime.now()
     print('\n>>>> Starting _ycsb [' + str(starttime) + ']') 
     
     # Construct the logfile name.
-    logfile = os.path.join(seriesEnv.logpath, 
-                    _make_log_filename('ycsb', storageAbbrev, recordCount, seriesEnv.seriesConfig['ycsb_threadcount'], workload))
+    logfile = os.path.join(seriesEnv.logpath, _make_log_filename('ycsb', cell))
     
-    # Start command string.
-    ycsbCmd = os.path.join(seriesEnv.seriesConfig['ycsb_bin_path'], 'ycsb')
-    ycsbCmd += " " + action + " " + product 
-    ycsbCmd += " -p recordcount=" + str(recordCount)
-    ycsbCmd += " -p operationcount=" + str(operationCount) 
-    ycsbCmd += " -p threadcount=" + str(seriesEnv.seriesConfig['ycsb_threadcount']) 
-    ycsbCmd += " -p env.hosts=" + env.host
-    ycsbCmd += " -P " + os.path.normpath(os.path.join(seriesEnv.seriesConfig['ycsb_bin_path'], 
-                           "../workloads/"+workload)) 
-    ycsbCmd += " >> " + logfile + " 2>&1"
-    _cond_run(ycsbCmd)
+    # Record the cell's position in the schedule, the properties of a
+    # generated workload, its placement and its named axis values ahead
+    # of the ycsb output.  Workload properties and axis values are
+    # recorded in the order in which they appear in collation keys.
+    _log_cell_meta(logfile, 'sequence', cell['sequence'])
+    _log_cell_meta(logfile, 'schedule', _schedule_description())
+    if cell['workloadBase']:
+        _log_cell_meta(logfile, 'workload', cell['workload'])
+        _log_cell_meta(logfile, 'workload_base', cell['workloadBase'])
+        for prop, value in cell['workloadProperties']:
+            _log_cell_meta(logfile, CollateElement.WORKLOAD_META_PREFIX + prop, value)
+    if cell.get('canary'):
+        _log_cell_meta(logfile, 'canary', cell['canary'])
+    placement = cell['placement']
+    if placement['name']:
+        _log_cell_meta(logfile, 'placement', placement['name'])
+    mongoPlacement = _placement_prefix(placement, 'mongo').strip()
+    ycsbPlacement = _placement_prefix(placement, 'ycsb').strip()
+    if mongoPlacement or ycsbPlacement:
+        _log_cell_meta(logfile, 'mongo_placement', mongoPlacement)
+        _log_cell_meta(logfile, 'ycsb_placement', ycsbPlacement)
+    if cell['topology']['name']:
+        _log_cell_meta(logfile, 'topology', cell['topology']['name'])
+        _log_cell_meta(logfile, 'topology_endpoint', cell['mongoTopology'].getEndpoint())
+    for name, value in cell['axisValues']:
+        _log_cell_meta(logfile, CollateElement.AXIS_META_PREFIX + name, value)
+    if cell['cacheMode'] != 'none':
+        _log_cell_meta(logfile, 'cache_mode', cell['cacheMode'])
+    if seriesEnv.seriesConfig['load_generator'] != SeriesEnv.DEFAULT_LOAD_GENERATOR:
+        _log_cell_meta(logfile, 'load_generator', seriesEnv.seriesConfig['load_generator'])
+    clients = seriesEnv.seriesConfig['ycsb_clients']
+    if clients > 1:
+        _log_cell_meta(logfile, 'clients', clients)
+    soakSecs = seriesEnv.seriesConfig['soak_secs']
+    if soakSecs:
+        _log_cell_meta(logfile, 'soak_secs', soakSecs)
+    
+    # Put the page cache into the cell's configured state.
+    with phaseTimer.phase('cache'):
+        _prepare_cache(action, product, cell)
+    
+    # Start command string.  With several clients, each client logs to
+    # its own file and the clients run concurrently in one subshell that
+    # waits for all of them.  When progress is streamed, ycsb writes a 
+    # status line to its log every 10 seconds (-s) and runs in the 
+    # background so that the logs can be followed.  Soak run phases 
+    # stop after soak_secs, and their status lines are the throughput
+    # samples that collation analyses.  Target rate steps aren't soaked
+    # and share the target rate between the clients.  The configured
+    # profiler is attached to mongod for the measured run phase only.
+    # Each step is timed as a phase of its own: snapshots of the storage
+    # footprint, the profiler and the ycsb phase, which is timed as
+    # target for target rate steps.
+    interval = seriesEnv.seriesConfig['progress_interval']
+    soak = soakSecs and action == 'run' and target is None
+    operationCount = seriesEnv.seriesConfig['soak_operationcount'] if soak else cell['operationCount']
+    logfiles = [_make_client_log_filename(logfile, client) for client in range(clients)]
+    if target is not None:
+        for clientLog in logfiles:
+            _log_cell_meta(clientLog, CollateElement.TARGET_META, target)
+    clientCmds = []
+    for client in range(clients):
+        clientCmd = _ycsb_command(action, product, cell, operationCount, client, clients)
+        if soak:
+            clientCmd += " -p maxexecutiontime=" + str(soakSecs)
+        if target is not None:
+            clientCmd += " -target " + str(max(int(round(float(target) / clients)), 1))
+        if interval or soak:
+            clientCmd += " -s"
+        clientCmds.append(clientCmd + " >> " + logfiles[client] + " 2>&1")
+    if clients == 1:
+        ycsbCmd = clientCmds[0]
+    else:
+        ycsbCmd = "(" + " & ".join(clientCmds) + " & wait)"
+    storageStats = seriesEnv.seriesConfig['storage_stats'] and target is None
+    if storageStats:
+        with phaseTimer.phase('snapshot'):
+            diskBefore = _disk_counters(cell)
+    profiler = None
+    if seriesEnv.seriesConfig['profiler'] != 'none' and action == 'run' and target is None:
+        with phaseTimer.phase('profile'):
+            profiler = _profiler_start(cell)
+    completed = True
+    with phaseTimer.phase(action if target is None else 'target'):
+        if interval and (not seriesEnv.seriesConfig['dry_run']):
+            totalOps = cell['recordCount'] if action == 'load' else operationCount
+            completed = _follow_ycsb(ycsbCmd, logfiles, action, totalOps)
+        else:
+            _cond_run(ycsbCmd)
+    if profiler:
+        with phaseTimer.phase('profile'):
+            _profiler_stop(profiler)
+    if storageStats and completed:
+        with phaseTimer.phase('snapshot'):
+            _log_storage(logfile, action, cell, diskBefore)
     
     endtime = datetime.now()
     print('>>>> Completing _ycsb [' + str(endtime) + ', duration = ' + str(endtime-starttime) + ']') 
+    return completed
+
+# -------------------------------------------------------- 
+# _target_ladder
+# --------------------------------------------------------
+def _target_ladder(cell):
+    """
+    Run the cell's target rate ladder: the run phase again at each of
+    the target_rates and then, when target_search_steps is set, at the
+    rates a bisection search for the highest rate that meets the SLA 
+    picks.  The search starts between 0 and target_search_max_rate or,
+    by default, the throughput of the unthrottled run, and moves up 
+    after each sustained step and down after each other step.  Steps 
+    are assumed sustained in a dry run.
+    """
+    config = seriesEnv.seriesConfig
+    for rate in config['target_rates']:
+        _ycsb('run', 'mongodb', cell, rate)
+    if not config['target_search_steps']:
+        return
+    high = config['target_search_max_rate']
+    if not high:
+        with phaseTimer.phase('probe'):
+            results = _read_run_results(cell)
+        high = results[0].throughput if results else None
+    if not high:
+        print('\n>>>> No unthrottled run throughput to start the target search from')
+        return
+    curve = LatencyCurve(config['sla_percentile'], config['sla_latency_us'])
+    low = 0
+    for step in range(config['target_search_steps']):
+        rate = int((low + high) / 2)
+        if rate <= low:
+            break
+        sustained = False
+        if _ycsb('run', 'mongodb', cell, rate):
+            with phaseTimer.phase('probe'):
+                results = _read_run_results(cell, rate)
+            if results is None:
+                sustained = True
+            elif results[1]:
+                sustained = curve.isSustained(rate, results[1].throughput, 
+                                              curve.getHistogram(results[1]).getPercentile(curve.percentile))
+        print('\n>>>> Target search step ' + str(step + 1) + ': ' + str(rate) + ' ops/sec ' + 
+              ('sustained' if sustained else 'not sustained'))
+        if sustained:
+            low = rate
+        else:
+            high = rate
+    print('>>>> Target search: highest sustained rate ' + str(low) + ' ops/sec')
+
+# -------------------------------------------------------- 
+# _read_run_results
+# --------------------------------------------------------
+def _read_run_results(cell, target=None):
+    """
+    Read the cell's ycsb client logs and return the (unthrottled run, 
+    latest target rate step) results merged over the clients, either
+    of which is None when it didn't complete.  The latest step only
+    counts when it ran at target, and when every client completed it.
+    None is returned in a dry run.
+    """
+    if seriesEnv.seriesConfig['dry_run']:
+        return None
+    logfile = os.path.join(seriesEnv.logpath, _make_log_filename('ycsb', cell))
+    results = None
+    for client in range(seriesEnv.seriesConfig['ycsb_clients']):
+        clientLog = _make_client_log_filename(logfile, client)
+        with settings(hide('running', 'stdout', 'warnings'), warn_only=True):
+            lines = run("cat " + clientLog).splitlines()
+        load, ycsbRun, targetSteps = CollateElement(clientLog).readYcsbLines(lines, clientLog)
+        
+        # Every client log records every step, so the latest step is
+        # the same one in each of them.
+        latest = targetSteps.keys()[-1] if targetSteps else None
+        step = targetSteps[latest] if latest and target is not None and latest[1] == float(target) else None
+        if results is None:
+            results = [ycsbRun, step]
+        else:
+            for i, ycsb in enumerate((ycsbRun, step)):
+                if results[i] and ycsb:
+                    results[i].merge(ycsb)
+                else:
+                    results[i] = None
+    return results
+
+# -------------------------------------------------------- 
+# _ycsb_command
+# --------------------------------------------------------
+def _ycsb_command(action, product, cell, operationCount, client=0, clients=1):
+    """
+    Construct a ycsb command line without output redirection.  When
+    a phase runs several clients, each one gets a slice of the 
+    operation count and thread count and, when loading, inserts its
+    own slice of the records.
+    """
+    ycsbCmd = _placement_prefix(cell['placement'], 'ycsb')
+    if seriesEnv.seriesConfig['load_generator'] == 'python':
+        ycsbCmd += seriesEnv.seriesConfig['loadgen_python'] + " " + \
+                   os.path.join(seriesEnv.seriesConfig['loadgen_path'], 'LoadGenerator.py')
+    else:
+        ycsbCmd += os.path.join(seriesEnv.seriesConfig['ycsb_bin_path'], 'ycsb')
+    ycsbCmd += " " + action + " " + product 
+    ycsbCmd += " -p recordcount=" + str(cell['recordCount'])
+    ycsbCmd += " -p operationcount=" + str(_slice(operationCount, client, clients)[1]) 
+    ycsbCmd += " -p threadcount=" + str(_slice(cell['threadCount'], client, clients)[1]) 
+    if clients > 1 and action == 'load':
+        insertStart, insertCount = _slice(cell['recordCount'], client, clients)
+        ycsbCmd += " -p insertstart=" + str(insertStart) + " -p insertcount=" + str(insertCount)
+    for prop, value in cell['ycsbProperties']:
+        ycsbCmd += " -p " + pipes.quote(prop + "=" + str(value))
+    ycsbCmd += " -p env.hosts=" + cell['mongoTopology'].getEndpoint()
+    ycsbCmd += " -P " + _workload_path(cell)
+    return ycsbCmd
+
+# -------------------------------------------------------- 
+# _prepare_cache
+# --------------------------------------------------------
+def _prepare_cache(action, product, cell):
+    """
+    Apply the cell's cache mode before a ycsb phase.  Cold mode
+    flushes dirty pages and drops the OS page cache before both 
+    phases on every host running data bearing mongods, which requires
+    passwordless sudo on those hosts.  The warm modes only act before
+    the run phase since there is no data before the load: warm_read
+    reads every file under each data bearing mongod's dbpath on its 
+    host and warm_run runs ycsb with cache_warmup_ops operations, 
+    logging to a ycsbwarmup- file that collation ignores.
+    """
+    mode = cell['cacheMode']
+    if mode == 'cold':
+        for host in _data_paths(cell):
+            with settings(host_string=host):
+                _cond_run("sync && echo 3 | sudo tee /proc/sys/vm/drop_caches > /dev/null")
+    elif mode == 'warm_read' and action == 'run':
+        for host, dbpaths in _data_paths(cell).items():
+            with settings(host_string=host):
+                _cond_run("find " + " ".join(dbpaths) + " -type f -exec cat {} + > /dev/null")
+    elif mode == 'warm_run' and action == 'run':
+        warmupOps = seriesEnv.seriesConfig['cache_warmup_ops'] or cell['recordCount']
+        warmupLog = os.path.join(seriesEnv.logpath, _make_log_filename('ycsbwarmup', cell))
+        _cond_run(_ycsb_command(action, product, cell, warmupOps) + " >> " + warmupLog + " 2>&1")
+
+# -------------------------------------------------------- 
+# _data_paths
+# --------------------------------------------------------
+def _data_paths(cell):
+    """
+    Return an OrderedDict that maps each host running data bearing
+    mongods for the cell to the list of their dbpaths.
+    """
+    paths = OrderedDict()
+    for process in cell['mongoTopology'].getProcesses():
+        if process['role'] == 'data':
+            paths.setdefault(process['host'], []).append(process['dbpath'])
+    return paths
+
+# -------------------------------------------------------- 
+# _disk_counters
+# --------------------------------------------------------
+def _disk_counters(cell):
+    """
+    Return the (bytes read, bytes written) counters summed over the 
+    devices that hold the cell's dbpaths on every host, read from 
+    /proc/diskstats where sectors are always 512 bytes.  A device is
+    counted once however many dbpaths it holds.  None is returned in
+    a dry run.
+    """
+    readBytes = 0
+    writtenBytes = 0
+    for host, dbpaths in _data_paths(cell).items():
+        cmd = "for dev in $(for d in " + " ".join(dbpaths) + "; do " + \
+              "basename $(readlink -f $(df -P $d | tail -1 | cut -d' ' -f1)); done | sort -u); do " + \
+              "awk -v d=$dev '$3 == d {print $6, $10}' /proc/diskstats; done"
+        if seriesEnv.seriesConfig['dry_run']:
+            print(cmd)
+            continue
+        with settings(hide('running', 'stdout'), host_string=host):
+            for line in run(cmd).splitlines():
+                sectorsRead, sectorsWritten = line.split()
+                readBytes += int(sectorsRead) * 512
+                writtenBytes += int(sectorsWritten) * 512
+    if seriesEnv.seriesConfig['dry_run']:
+        return None
+    return readBytes, writtenBytes
+
+# -------------------------------------------------------- 
+# _log_storage
+# --------------------------------------------------------
+def _log_storage(logfile, action, cell, diskBefore):
+    """
+    Record the storage footprint of the cell after a ycsb phase: the
+    size of every data bearing mongod's dbpath and journal directory
+    and the device bytes read and written during the phase.  The load
+    phase also records the logical size of a ycsb record.  Nothing is
+    recorded in a dry run.
+    """
+    dbpathBytes = 0
+    journalBytes = 0
+    for host, dbpaths in _data_paths(cell).items():
+        dbpathCmd = "du -sbc " + " ".join(dbpaths) + " | tail -1 | cut -f1"
+        journalCmd = "du -sbc " + " ".join(os.path.join(d, 'journal') for d in dbpaths) + \
+                     " 2> /dev/null | tail -1 | cut -f1"
+        if seriesEnv.seriesConfig['dry_run']:
+            print(dbpathCmd)
+            print(journalCmd)
+            continue
+        with settings(hide('running', 'stdout', 'warnings'), host_string=host, warn_only=True):
+            dbpathBytes += int(run(dbpathCmd).strip() or 0)
+            journalBytes += int(run(journalCmd).strip() or 0)
+    diskAfter = _disk_counters(cell)
+    if seriesEnv.seriesConfig['dry_run']:
+        return
+    _log_cell_meta(logfile, action + '_dbpath_bytes', dbpathBytes)
+    _log_cell_meta(logfile, action + '_journal_bytes', journalBytes)
+    _log_cell_meta(logfile, action + '_disk_read_bytes', diskAfter[0] - diskBefore[0])
+    _log_cell_meta(logfile, action + '_disk_written_bytes', diskAfter[1] - diskBefore[1])
+    if action == 'load':
+        _log_cell_meta(logfile, 'record_bytes', _record_bytes(cell))
+
+# -------------------------------------------------------- 
+# _record_bytes
+# --------------------------------------------------------
+def _record_bytes(cell):
+    """
+    Return the logical bytes of one ycsb record, fieldcount times
+    fieldlength, taking each from the cell's ycsb properties, then 
+    from the workload file and then from the ycsb defaults of 10 
+    fields of 100 bytes.  Keys are not counted.
+    """
+    fields = {'fieldcount': 10, 'fieldlength': 100}
+    with settings(hide('running', 'stdout', 'warnings'), warn_only=True):
+        output = run("grep -E '^(fieldcount|fieldlength)=' " + _workload_path(cell))
+    for line in output.splitlines():
+        name, value = line.strip().split('=', 1)
+        fields[name] = int(value)
+    for prop, value in cell['ycsbProperties']:
+        if prop in fields:
+            fields[prop] = int(value)
+    return fields['fieldcount'] * fields['fieldlength']
+
+# -------------------------------------------------------- 
+# _workload_path
+# --------------------------------------------------------
+def _workload_path(cell):
+    """
+    Return the path of the cell's workload file on the target host:
+    the file generated in the log directory for a generated workload
+    and the file in ycsb's workloads directory otherwise.
+    """
+    if cell['workloadBase']:
+        return os.path.join(seriesEnv.logpath, _make_workload_filename(cell))
+    return os.path.normpath(os.path.join(seriesEnv.seriesConfig['ycsb_bin_path'], 
+                                         "../workloads/" + cell['workload']))
+
+# -------------------------------------------------------- 
+# _write_workload
+# --------------------------------------------------------
+def _write_workload(cell):
+    """
+    Generate the workload file of a cell with a generated workload on
+    the target host.  The file is the base workload file with the lines
+    of the properties the workload sets left out and those properties
+    appended, so that readers that keep the first or the last value of
+    a property agree.  It stays in the log directory next to the logs.
+    """
+    base = os.path.normpath(os.path.join(seriesEnv.seriesConfig['ycsb_bin_path'], 
+                                         "../workloads/" + cell['workloadBase']))
+    properties = cell['workloadProperties']
+    pattern = "|".join(prop.replace('.', '[.]') for prop, value in properties)
+    header = "# Generated by RunYcsb from " + cell['workloadBase'] + " for workload " + cell['workload']
+    cmd = "test -f " + base + " || { echo 'Base workload file " + base + " not found.' >&2; exit 1; }; "
+    cmd += "(echo " + pipes.quote(header) + "; "
+    if properties:
+        cmd += "grep -v -E '^[[:space:]]*(" + pattern + ")[[:space:]]*=' " + base + "; "
+        cmd += "printf '%s\\n' " + " ".join(pipes.quote(prop + "=" + value) for prop, value in properties)
+    else:
+        cmd += "cat " + base
+    cmd += ") > " + _workload_path(cell)
+    _cond_run(cmd)
+
+# -------------------------------------------------------- 
+# _follow_ycsb
+# --------------------------------------------------------
+def _follow_ycsb(ycsbCmd, logfiles, action, totalOps):
+    """
+    Run a ycsb command in the background and follow its client log
+    files until it exits, streaming progress events to the console and
+    to the progress file in the log directory.  The command is killed 
+    when the abort rule fires, in which case the cell is marked as
+    failed in the first client's log and False is returned.
+    """
+    logfile = logfiles[0]
+    cell = os.path.basename(logfile)[len('ycsb-'):-len('.log')]
+    monitor = YcsbMonitor(cell, action, totalOps, 
+                          seriesEnv.seriesConfig['abort_min_throughput'],
+                          seriesEnv.seriesConfig['abort_after_secs'],
+                          os.path.join(seriesEnv.logpath, YcsbMonitor.EVENT_FILENAME), _append_line)
+    monitor.start()
+    
+    # setsid makes ycsb the leader of a new process group so that the 
+    # java process it launches is killed along with it on abort.
+    with hide('running', 'stdout'):
+        pid = run("nohup setsid sh -c " + pipes.quote(ycsbCmd) + " < /dev/null > /dev/null 2>&1 & echo $!", 
+                  pty=False).strip()
+    while True:
+        sleep(seriesEnv.seriesConfig['progress_interval'])
+        with settings(hide('running', 'stdout', 'warnings'), warn_only=True):
+            monitor.update([run("tail -n 20 " + f) for f in logfiles])
+            if monitor.shouldAbort():
+                run("kill -9 -- -" + pid)
+                break
+            if run("kill -0 " + pid).failed:
+                break
+    monitor.finish()
+    
+    if monitor.shouldAbort():
+        _log_cell_meta(logfile, 'failed', action + ": " + monitor.abortReason)
+        return False
+    return True
+
+# -------------------------------------------------------- 
+# _profiler_start
+# --------------------------------------------------------
+def _profiler_start(cell):
+    """
+    Attach the configured profiler to the cell's data bearing mongod,
+    found by the log path on its command line, in the background on
+    that mongod's host.  Return the (host, pid) of the profiler, or
+    None in a dry run.
+    """
+    config = seriesEnv.seriesConfig
+    process = [p for p in cell['mongoTopology'].getProcesses() if p['role'] == 'data'][0]
+    mongoLog = os.path.join(seriesEnv.logpath, _make_process_log_filename(process, cell))
+    output = pipes.quote(os.path.join(seriesEnv.logpath, _make_profile_filename(cell)))
+    if config['profiler'] == 'perf':
+        profileCmd = "perf record -g -F " + str(config['profiler_frequency']) + " -p $pid -o " + output
+    elif config['profiler'] == 'pidstat':
+        profileCmd = "pidstat -h -u -r -d -w -p $pid 1 > " + output
+    else:
+        profileCmd = config['profiler_command'].replace('{pid}', '$pid').replace('{output}', output)
+    
+    # The pattern only matches command lines that start with mongod, 
+    # which leaves out this script's own shell, and the trailing space
+    # keeps the log path from matching a longer one.  Exec makes the
+    # profiler the background process itself so that it receives the
+    # interrupt that stops it.  Background processes start with SIGINT
+    # ignored, so the profiler must install its own handler, as perf
+    # and pidstat do.
+    pattern = "^[^ ]*mongod .*--logpath " + mongoLog + " "
+    script = "pid=$(pgrep -o -f -- " + pipes.quote(pattern) + ") && exec " + profileCmd
+    cmd = "nohup sh -c " + pipes.quote(script) + " < /dev/null > /dev/null 2>&1 & echo $!"
+    if config['dry_run']:
+        print(cmd)
+        return None
+    with settings(hide('running', 'stdout'), host_string=process['host']):
+        return process['host'], run(cmd, pty=False).strip()
+
+# -------------------------------------------------------- 
+# _profiler_stop
+# --------------------------------------------------------
+def _profiler_stop(profiler):
+    """
+    Interrupt a profiler started by _profiler_start, which makes it
+    flush its output, and wait up to PROFILER_STOP_SECS for it to
+    exit before killing it.
+    """
+    host, pid = profiler
+    with settings(hide('running', 'stdout', 'warnings'), warn_only=True, host_string=host):
+        run("kill -INT " + pid)
+        deadline = datetime.now() + timedelta(seconds=PROFILER_STOP_SECS)
+        while (not run("kill -0 " + pid).failed):
+            if datetime.now() > deadline:
+                run("kill -9 " + pid)
+                break
+            sleep(1)
+
+# -------------------------------------------------------- 
+# _write_manifest
+# --------------------------------------------------------
+def _write_manifest(cell, started, finished):
+    """
+    Write the cell's manifest, a JSON object with every parameter the
+    cell ran with, to the log directory.  Collation reads the mongod
+    options and the ycsb parameters of its key from the manifest 
+    instead of parsing them out of the mongod and ycsb logs.  The
+    mongod options are those mongod ran with, including any that
+    mongo_flag axes add.
+    """
+    mongoParms = cell['mongoParms']
+    engine = _getStorageEngine(mongoParms)
+    syncdelay = re.search(r'--syncdelay[= ]+([\d.]+)', mongoParms)
+    ycsbProperties = OrderedDict([('recordcount', cell['recordCount']), 
+                                  ('operationcount', cell['operationCount']),
+                                  ('threadcount', cell['threadCount'])])
+    ycsbProperties.update(cell['ycsbProperties'])
+    manifest = OrderedDict([
+        ('version', CollateElement.MANIFEST_VERSION),
+        ('mongod_log', _make_log_filename('mongod', cell)),
+        ('ycsb_log', _make_log_filename('ycsb', cell)),
+        ('host', env.host),
+        ('hosts', cell['mongoTopology'].getHosts()),
+        ('data_hosts', _data_paths(cell).keys()),
+        ('repeat', cell['repeat']),
+        ('sequence', cell['sequence']),
+        ('canary', cell.get('canary')),
+        ('mongo_parms_index', cell['parmsIndex']),
+        ('mongo_parms', mongoParms),
+        ('storage_engine', engine),
+        ('journal', '--nojournal' not in mongoParms.split()),
+        ('syncdelay', str(float(syncdelay.group(1))) if syncdelay else None),
+        ('workload', cell['workload']),
+        ('workload_base', cell['workloadBase']),
+        ('workload_properties', OrderedDict(cell['workloadProperties'])),
+        ('ycsb_properties', ycsbProperties),
+        ('load_generator', seriesEnv.seriesConfig['load_generator']),
+        ('clients', seriesEnv.seriesConfig['ycsb_clients']),
+        ('placement', cell['placement']['name']),
+        ('mongo_placement', _placement_prefix(cell['placement'], 'mongo').strip() or None),
+        ('ycsb_placement', _placement_prefix(cell['placement'], 'ycsb').strip() or None),
+        ('topology', cell['topology']['name']),
+        ('cache_mode', cell['cacheMode']),
+        ('soak_secs', seriesEnv.seriesConfig['soak_secs']),
+        ('profile', _make_profile_filename(cell) if seriesEnv.seriesConfig['profiler'] != 'none' else None),
+        ('axes', OrderedDict(cell['axisValues'])),
+        ('started', started.isoformat()),
+        ('finished', finished.isoformat())])
+    manifestFile = os.path.join(seriesEnv.logpath, _make_manifest_filename(cell))
+    _cond_run("echo " + pipes.quote(json.dumps(manifest)) + " > " + manifestFile)
+
+# -------------------------------------------------------- 
+# _schedule_description
+# --------------------------------------------------------
+def _schedule_description():
+    """Describe the cell order, with the seed of a random schedule."""
+    description = seriesEnv.seriesConfig['schedule']
+    if seriesEnv.seriesConfig['schedule_seed'] is not None:
+        description += " seed=" + str(seriesEnv.seriesConfig['schedule_seed'])
+    return description
+
+# -------------------------------------------------------- 
+# _append_line
+# --------------------------------------------------------
+def _append_line(fileName, line):
+    """
+    Append a line to a file on the target host, which is how the
+    timing records, progress events and tuning state join the other
+    artifacts of the series in its log directory.
+    """
+    with settings(hide('running', 'stdout')):
+        run("echo " + pipes.quote(line) + " >> " + fileName)
+
+# -------------------------------------------------------- 
+# _read_lines
+# --------------------------------------------------------
+def _read_lines(fileName):
+    """Return the lines of a file on the target host, none if it doesn't exist."""
+    with settings(hide('running', 'stdout', 'warnings'), warn_only=True):
+        return run("test -f " + fileName + " && cat " + fileName).splitlines()
 
 # -------------------------------------------------------- 
 # _cond_run
@@ -192,36 +1050,187 @@ def _cond_run(cmd):
     else:
         run(cmd)
 
+# -------------------------------------------------------- 
+# _placement_prefix
+# --------------------------------------------------------
+def _placement_prefix(placement, program):
+    """
+    Construct the numactl and taskset command prefix that applies
+    a placement's memory policy and cpu set to program, which is
+    either mongo or ycsb.  The prefix is empty when the placement
+    doesn't constrain the program.
+    """
+    prefix = ""
+    if placement[program + '_numactl']:
+        prefix += "numactl " + placement[program + '_numactl'] + " "
+    if placement[program + '_cpuset']:
+        prefix += "taskset -c " + placement[program + '_cpuset'] + " "
+    return prefix
+
+# -------------------------------------------------------- 
+# _log_cell_meta
+# --------------------------------------------------------
+def _log_cell_meta(logfile, name, value):
+    """
+    Append a metadata line for the current cell to a log file.
+    CollateElement picks these lines up when reading the ycsb log.
+    """
+    line = CollateElement.SEARCH_META + name + "=" + str(value)
+    _cond_run("echo " + pipes.quote(line) + " >> " + logfile)
+
 # -------------------------------------------------------- 
 # _make_log_filename
 # --------------------------------------------------------
-def _make_log_filename(program, storageAbbrev, records, threads, workload):
-    """Construct a log file name based on this run's parameters."""
-    fn = program + "-" + storageAbbrev
-    fn += "-" + workload
-    fn += "-" + str(records) + "recs"
-    fn += "-" + str(threads) + 'thrds.log'
+def _make_log_filename(program, cell):
+    """
+    Construct a log file name based on this cell's parameters.
+    Workload sweep values and named axis values are reduced to 
+    letters, digits, underscores and periods so that they can't be
+    confused with separators.
+    """
+    fn = program + "-" + cell['storageAbbrev']
+    fn += "-" + cell['workload']
+    for prop, value in cell['workloadSweep']:
+        fn += "-" + prop + re.sub(r'[^\w.]', '_', value)
+    fn += "-" + str(cell['recordCount']) + "recs"
+    fn += "-" + str(cell['threadCount']) + 'thrds'
+    if cell['placement']['name']:
+        fn += "-" + cell['placement']['name']
+    if cell['topology']['name']:
+        fn += "-" + cell['topology']['name']
+    for name, value in cell['axisValues']:
+        fn += "-" + name + re.sub(r'[^\w.]', '_', str(value))
+    if cell['cacheMode'] != 'none':
+        fn += "-" + cell['cacheMode']
+    fn += '.log'
     return fn
 
+# -------------------------------------------------------- 
+# _make_cell_name
+# --------------------------------------------------------
+def _make_cell_name(cell):
+    """
+    Construct the name that identifies a cell in progress events and
+    timing records, which is its ycsb log file name without the ycsb-
+    prefix and the .log extension.
+    """
+    return _make_log_filename('ycsb', cell)[len('ycsb-'):-len('.log')]
+
+# -------------------------------------------------------- 
+# _make_process_log_filename
+# --------------------------------------------------------
+def _make_process_log_filename(process, cell):
+    """
+    Construct the log file name of a topology process.  The first
+    data bearing mongod logs under the cell's mongod log name, which 
+    collation reads the mongod options from.  Other processes log 
+    under names that collation doesn't pick up, such as mongod.m1-
+    for the second replica set member and mongos- for the router.
+    """
+    data = [p for p in cell['mongoTopology'].getProcesses() if p['role'] == 'data']
+    if process['name'] == data[0]['name']:
+        return _make_log_filename('mongod', cell)
+    if process['program'] == 'mongos':
+        return _make_log_filename('mongos', cell)
+    return _make_log_filename('mongod.' + process['name'], cell)
+
+# -------------------------------------------------------- 
+# _make_manifest_filename
+# --------------------------------------------------------
+def _make_manifest_filename(cell):
+    """
+    Construct the cell's manifest file name, which is its mongod log 
+    file name with a manifest- prefix and a .json extension.
+    """
+    return _make_log_filename('manifest', cell)[:-len('.log')] + CollateElement.MANIFEST_EXTENSION
+
+# -------------------------------------------------------- 
+# _make_profile_filename
+# --------------------------------------------------------
+def _make_profile_filename(cell):
+    """
+    Construct the file name of the cell's profiler output, which is
+    its mongod log file name with a profile- prefix and the extension
+    of the configured profiler.
+    """
+    extension = CollateElement.PROFILE_EXTENSIONS[seriesEnv.seriesConfig['profiler']]
+    return _make_log_filename('profile', cell)[:-len('.log')] + extension
+
+# -------------------------------------------------------- 
+# _make_workload_filename
+# --------------------------------------------------------
+def _make_workload_filename(cell):
+    """
+    Construct the file name of the cell's generated workload, which is
+    its mongod log file name with a workload- prefix and a .properties
+    extension.
+    """
+    return _make_log_filename('workload', cell)[:-len('.log')] + WORKLOAD_EXTENSION
+
+# -------------------------------------------------------- 
+# _make_client_log_filename
+# --------------------------------------------------------
+def _make_client_log_filename(logfile, client):
+    """
+    Construct the log file name of a ycsb client from the cell's ycsb
+    log file name.  The first client uses the cell's log file itself
+    and client n > 1 adds .client<n> ahead of the .log extension.
+    """
+    if client == 0:
+        return logfile
+    return logfile[:-len('.log')] + CollateElement.CLIENT_LOG_INFIX + str(client + 1) + '.log'
+
+# -------------------------------------------------------- 
+# _slice
+# --------------------------------------------------------
+def _slice(total, index, count):
+    """
+    Split total into count nearly equal slices and return the 
+    (start, size) of slice index.  The remainder is spread over
+    the first slices.
+    """
+    size, remainder = divmod(total, count)
+    return index * size + min(index, remainder), size + (1 if index < remainder else 0)
+
 # -------------------------------------------------------- 
 # _getStorageAbbreviation
 # --------------------------------------------------------
-def _getStorageAbbreviation(mongoParms, repeat, index):
+def _getStorageAbbreviation(mongoParms, repeat, index, canary=False):
     """
     Get the storage engine abbreviation for log naming.
     The name is made of a storage engine moniker and
     an index number that distinguishes every execution
-    by its mongod parameter set.
+    by its mongod parameter set.  Canary cells add a c
+    to the moniker and pass their canary number as the
+    repeat, so wtc3_1 is the third canary.
     """
     
-    # The elif statement helps futureproof for when wt becomes the default.
-    abbrev = "mm"
-    if mongoParms.find("wiredTiger") >= 0:
-        abbrev = "wt"
-    elif mongoParms.find("mmapv1") >= 0:
-        abbrev = "mm"
+    abbrev = _getStorageEngine(mongoParms)
+    if canary:
+        abbrev += "c"
     return abbrev + str(repeat+1) + "_" +str(index+1)
 
+# -------------------------------------------------------- 
+# _getStorageEngine
+# --------------------------------------------------------
+def _getStorageEngine(mongoParms):
+    """
+    Get the storage engine moniker, wt or mm, of a mongod 
+    parameter string from the value of its --storageEngine
+    option, since other options such as --wiredTigerCacheSizeGB
+    may mention an engine too.  Mmapv1 is assumed when no
+    engine is selected.
+    """
+    
+    # The elif statement helps futureproof for when wt becomes the default.
+    engine = CollateElement.STORAGE_ENGINE_MMAPV1
+    selected = re.search(r'--storageEngine[= ]+(\w+)', mongoParms)
+    if selected and selected.group(1) == "wiredTiger":
+        engine = CollateElement.STORAGE_ENGINE_WIREDTIGER
+    elif selected and selected.group(1) == "mmapv1":
+        engine = CollateElement.STORAGE_ENGINE_MMAPV1
+    return engine
+
 # -------------------------------------------------------- 
 # Main
 # --------------------------------------------------------